@@ -1,51 +1,162 @@
+import json
 import os
 import shutil
-from flask import Flask
+from flask import Flask, Response, jsonify, request, url_for
 
-from scripts.main import run_every_2_hours_reports, run_every_4_hours_reports, run_once_a_day_reports, run_once_in_2_days_reports
+from scripts.helper import data_cache
+from scripts.helper.job_queue import get_job, list_jobs, submit_job
+from scripts.helper.leases import list_leases
+from scripts.helper.locations import get_location_names
+from scripts.helper.metrics import render_prometheus
+from scripts.helper.run_history import get_history
+from scripts.helper.scratch import clear_scratch, install_exit_cleanup
+from scripts.helper.work_units import enqueue_units, list_units, sharded_mode_enabled, start_workers
+from scripts.main import TIER_REPORTS, run_report_unit, run_tier_reports
 
 
 app = Flask(__name__)
-
-locations = ["kolkata", "surat"]
-
-
-
-# Create HTTP endpoints
+ARROW_STREAM_MIMETYPE = "application/vnd.apache.arrow.stream"
+install_exit_cleanup()
+
+# In sharded mode every instance claims location/report units from the shared work unit table
+if sharded_mode_enabled():
+    start_workers(run_report_unit)
+
+
+def enqueue_tier(tier):
+    locations = get_location_names()
+    if sharded_mode_enabled():
+        batch = enqueue_units(tier, locations, list(TIER_REPORTS[tier]))
+        return jsonify({
+            "batch_id": batch["batch_id"],
+            "tier": tier,
+            "queued": len(batch["queued"]),
+            "attached_to": batch["attached_to"],
+            "status_url": url_for("units", batch=batch["batch_id"]),
+        }), 202
+
+    job = submit_job(tier, locations, run_tier_reports)
+    return jsonify({
+        "job_id": job["id"],
+        "tier": tier,
+        "status": job["status"],
+        "coalesced": job.get("coalesced", False),
+        "attached_to": job.get("attached_to", {}),
+        "status_url": url_for("job_status", job_id=job["id"]),
+    }), 202
+
+
+# Create HTTP endpoints: each tier is queued and runs on the worker pool
 @app.route("/daily", methods=["GET","POST"])
 def daily():
-    for loc in locations:
-        run_once_a_day_reports(loc)
-    return "✅ Daily reports executed", 200
+    return enqueue_tier("daily")
 
 @app.route("/every2days", methods=["GET","POST"])
 def every2days():
-    for loc in locations:
-        run_once_in_2_days_reports(loc)
-    return "✅ Every 2 days reports executed", 200
+    return enqueue_tier("every2days")
 
 @app.route("/every4h", methods=["GET","POST"])
 def every4h():
-    for loc in locations:
-        run_every_4_hours_reports(loc)
-    return "✅ Every 4 hours reports executed", 200
+    return enqueue_tier("every4h")
 
 @app.route("/every2h", methods=["GET","POST"])
 def every2h():
-    for loc in locations:
-        run_every_2_hours_reports(loc)
-    return "✅ Every 2 hours reports executed", 200
+    return enqueue_tier("every2h")
+
+
+@app.route("/jobs", methods=["GET"])
+def jobs():
+    limit = request.args.get("limit", default=50, type=int)
+    return jsonify(list_jobs(limit)), 200
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+@app.route("/history", methods=["GET"])
+def history():
+    runs = get_history(
+        location=request.args.get("location"),
+        report=request.args.get("report"),
+        limit=request.args.get("limit", default=50, type=int),
+        regressions_only=request.args.get("regressions", "").lower() in ("1", "true", "yes"),
+    )
+    return jsonify(runs), 200
+
+@app.route("/units", methods=["GET"])
+def units():
+    return jsonify(list_units(
+        batch_id=request.args.get("batch"),
+        status=request.args.get("status"),
+        limit=request.args.get("limit", default=100, type=int),
+    )), 200
+
+@app.route("/leases", methods=["GET"])
+def leases():
+    return jsonify(list_leases()), 200
+
+@app.route("/data", methods=["GET"])
+def data_tables():
+    if not data_cache.cache_enabled():
+        return jsonify({"error": "DATA_CACHE_DIR is not set"}), 404
+    return jsonify(data_cache.list_cached()), 200
+
+# Latest cleaned table of a report from the local mirror, filtered by query parameters (see data_cache.query_table)
+@app.route("/data/<location>/<report>", methods=["GET"])
+def data_table(location, report):
+    if not data_cache.cache_enabled():
+        return jsonify({"error": "DATA_CACHE_DIR is not set"}), 404
+    try:
+        version = data_cache.table_version(location, report)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if version is None:
+        return jsonify({"error": f"No cached data for {location}/{report}"}), 404
+
+    fmt = request.args.get("format") or request.accept_mimetypes.best_match(["application/json", ARROW_STREAM_MIMETYPE])
+    fmt = "arrow" if fmt in ("arrow", ARROW_STREAM_MIMETYPE) else "json"
+    etag = data_cache.etag(version, [*request.args.items(multi=True), ("format", fmt)])
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    table, version = data_cache.load_table(location, report)
+    if table is None:
+        return jsonify({"error": f"No cached data for {location}/{report}"}), 404
+    try:
+        page, matched = data_cache.query_table(table, request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if fmt == "arrow":
+        response = Response(data_cache.to_arrow_ipc(page), mimetype=ARROW_STREAM_MIMETYPE)
+    else:
+        body = {"location": location.lower(), "report": report, "version": version, "matched": matched,
+                "returned": page.num_rows, "rows": data_cache.to_records(page)}
+        response = Response(json.dumps(body), mimetype="application/json")
+    response.headers["X-Matched-Rows"] = str(matched)
+    response.headers["Cache-Control"] = "no-cache"
+    response.set_etag(etag)
+    return response
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({"error": f"Job not found: {job_id}"}), 404
+    return jsonify(job), 200
 
 
 @app.route("/status", methods=["GET"])
 def health_check():
     return "✅ Service is healthy", 200
 
-# DELETE kolkata and surat folders if they exist
+# DELETE scratch directories left for resuming, and legacy per-location download folders
 @app.route("/cleanup", methods=["GET","POST"])
 def cleanup_folders():
-    deleted = []
-    for folder in ["kolkata", "surat"]:
+    deleted = clear_scratch()
+    for folder in get_location_names():
         if os.path.exists(folder):
             shutil.rmtree(folder)
             deleted.append(folder)
@@ -119,6 +230,8 @@ def index():
                 <a class="btn" href="/every2days">Run Every 2 Days</a>
                 <a class="btn" href="/every4h">Run Every 4 Hours</a>
                 <a class="btn" href="/every2h">Run Every 2 Hours</a>
+                <a class="btn" href="/jobs">Recent Jobs</a>
+                <a class="btn" href="/data">Cached Data</a>
                 <a class="btn" href="/cleanup">Cleanup Folders</a>
             </div>
         </div>
@@ -1,77 +1,55 @@
-import os
 import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
 
 from scripts.df_cleaners.cleaner import modify_account_payable_dataframe
-from scripts.helper.browser_manager import create_driver
-from scripts.helper.common_utils import ensure_download_path, load_credentials, load_dataframe, log, upload_to_bigquery, wait_for_download
-from scripts.helper.fronocloud_login import login
-
-
-def getAccountPayable(location):
-    folder = "Frono_Account_Payable_Report"
-    download_path = ensure_download_path(location, folder)
-    username, password = load_credentials(location)
-    driver = create_driver(download_path)
-    actions = ActionChains(driver)
-
-    try:
-        log("Opening FronoCloud login page and logging in...")
-        login(driver, username, password)
-
-        log("Navigating to 'Account Payable' report...")
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "pn_id_3_7_header"))).click()
-        time.sleep(1)
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.LINK_TEXT, "Account Payable / Vendor Wise"))).click()
-        time.sleep(1)
-        
-        actions.send_keys(Keys.TAB * 2).perform()
-        time.sleep(1)
-        actions.send_keys(Keys.SPACE).perform()
-        time.sleep(1)
-        actions.key_down(Keys.SHIFT).send_keys(Keys.TAB).key_up(Keys.SHIFT).perform()
-        time.sleep(1)
-        actions.send_keys(Keys.SPACE).perform()
-        time.sleep(1)
-        actions.send_keys(Keys.ESCAPE).perform()
-        time.sleep(1)
-        # actions.send_keys(Keys.TAB).perform()
-        # time.sleep(1)
-
-        # driver.execute_script("arguments[0].click();", driver.switch_to.active_element)
-        # WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//a[text()='This Financial Year']"))).click()
-
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//button[text()=' Search ']"))).click()
+from scripts.helper.common_utils import log
+from scripts.helper.metrics import stage
+from scripts.helper.report_engine import register_report, run_report
+
+
+def navigate_account_payable(driver, actions):
+    log("Navigating to 'Account Payable' report...")
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "pn_id_3_7_header"))).click()
+    time.sleep(1)
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.LINK_TEXT, "Account Payable / Vendor Wise"))).click()
+    time.sleep(1)
+
+    actions.send_keys(Keys.TAB * 2).perform()
+    time.sleep(1)
+    actions.send_keys(Keys.SPACE).perform()
+    time.sleep(1)
+    actions.key_down(Keys.SHIFT).send_keys(Keys.TAB).key_up(Keys.SHIFT).perform()
+    time.sleep(1)
+    actions.send_keys(Keys.SPACE).perform()
+    time.sleep(1)
+    actions.send_keys(Keys.ESCAPE).perform()
+    time.sleep(1)
+    # actions.send_keys(Keys.TAB).perform()
+    # time.sleep(1)
+
+    # driver.execute_script("arguments[0].click();", driver.switch_to.active_element)
+    # WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//a[text()='This Financial Year']"))).click()
+
+    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//button[text()=' Search ']"))).click()
+    with stage("report_generation"):
         time.sleep(25)
-        
-        log("Exporting to Excel...")
-        actions.send_keys(Keys.TAB * 6 + Keys.SPACE).perform()
-        time.sleep(2)
-
-        downloaded_file = wait_for_download(download_path)
-        log(f"✅ Downloaded file saved as: {downloaded_file}")
-
-        df = load_dataframe(downloaded_file)
 
-        df = modify_account_payable_dataframe(df)
+    log("Exporting to Excel...")
+    actions.send_keys(Keys.TAB * 6 + Keys.SPACE).perform()
+    time.sleep(2)
 
-        # Upload to BigQuery
-        upload_to_bigquery(df, table_name="account_payable", location=location)
 
-        # Delete file
-        os.remove(downloaded_file)
-        log(f"🗑️ Deleted local file: {downloaded_file}")
+ACCOUNT_PAYABLE_REPORT = register_report(
+    report="account_payable",
+    folder="Frono_Account_Payable_Report",
+    navigate=navigate_account_payable,
+    cleaner=modify_account_payable_dataframe,
+    table_name="account_payable",
+)
 
-        return f"Success"
 
-    except Exception as e:
-        log(f"❌ Error during scraping: {e}")
-        return f"Error: {e}"
-
-    finally:
-        log("Closing browser...")
-        driver.quit()
+def getAccountPayable(location):
+    return run_report(location, ACCOUNT_PAYABLE_REPORT)
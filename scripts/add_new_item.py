@@ -1,7 +1,9 @@
 import os
 import time
 import random
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -13,6 +15,11 @@ from functools import wraps
 from helper.browser_manager import create_driver
 from helper.common_utils import load_credentials, log
 from helper.fronocloud_login import login
+from helper.item_diff import designs_to_read, diff_items
+from helper.item_master import (
+    get_item_master, load_item_attributes, load_read_failures, remember_item_attributes, remember_items, remember_read_failures,
+)
+from helper.sheet_sync import mark_rows_done, sync_sheet_rows
 
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
@@ -52,6 +59,24 @@ DEFAULT_TIMEOUT = 10
 DEFAULT_DELAY = 1
 MAX_RETRIES = 3
 
+# Parallel item creation: browser sessions, and the minimum gap between item
+# submissions across all sessions to stay polite to FronoCloud
+ITEM_WORKERS = int(os.environ.get("ITEM_WORKERS", "1"))
+ITEM_MIN_INTERVAL_SECONDS = float(os.environ.get("ITEM_MIN_INTERVAL_SECONDS", "2"))
+
+# Read an existing design's colors, sizes and category from its edit form before updating it from
+# an unverified baseline. Off by default: the form selectors are only checked against the stand-in
+# (scripts/standin); off, the sheet values are taken as the baseline. At most ITEM_ATTRIBUTE_MAX_READS
+# forms are read per run, and a form that failed to read is retried after ITEM_ATTRIBUTE_RETRY_SECONDS
+ITEM_ATTRIBUTE_READBACK = os.environ.get("ITEM_ATTRIBUTE_READBACK", "0") == "1"
+ITEM_ATTRIBUTE_MAX_READS = int(os.environ.get("ITEM_ATTRIBUTE_MAX_READS", "20"))
+ITEM_ATTRIBUTE_RETRY_SECONDS = int(os.environ.get("ITEM_ATTRIBUTE_RETRY_SECONDS", str(7 * 24 * 3600)))
+
+# "full" reads the whole sheet every run; "incremental" only new/changed rows
+ITEM_SHEET_SYNC = os.environ.get("ITEM_SHEET_SYNC", "full")
+
+_sheets_service = None
+
 def get_google_credentials():
     """
     Get Google credentials from environment or service account file.
@@ -97,6 +122,31 @@ def generate_sample_items():
     ]
     return sample_items
 
+def get_sheets_service():
+    """Sheets API client, built once per process."""
+    global _sheets_service
+    if _sheets_service is None:
+        _sheets_service = build('sheets', 'v4', credentials=get_google_credentials(), cache_discovery=False)
+    return _sheets_service
+
+def get_spreadsheet_id():
+    spreadsheet_id = os.environ.get('ITEMS_SPREADSHEET_ID')
+    if not spreadsheet_id:
+        raise EnvironmentError("ITEMS_SPREADSHEET_ID environment variable not set")
+    return spreadsheet_id
+
+def row_to_item(row):
+    """Convert a sheet row (Design No., Colors, Sizes) to an item; None if a column is missing."""
+    if len(row) <= 2:  # Ensure we have all required columns
+        return None
+    return {
+        'Design No.': row[0],
+        'Unit': 'PCS',
+        'HSN Code': '123456',
+        'Colors': [color.strip() for color in row[1].split(',')],
+        'Sizes': [size.strip() for size in row[2].split(',')]
+    }
+
 def fetch_items_from_sheet():
     """
     Fetch items data from a Google Sheet.
@@ -104,14 +154,10 @@ def fetch_items_from_sheet():
     Colors and Sizes should be comma-separated values in their respective cells.
     """
     try:
-        # Get credentials and build service
-        credentials = get_google_credentials()
-        service = build('sheets', 'v4', credentials=credentials)
+        service = get_sheets_service()
 
         # The ID of the spreadsheet to retrieve data from
-        SPREADSHEET_ID = os.environ.get('ITEMS_SPREADSHEET_ID')
-        if not SPREADSHEET_ID:
-            raise EnvironmentError("ITEMS_SPREADSHEET_ID environment variable not set")
+        SPREADSHEET_ID = get_spreadsheet_id()
 
         # The range of the sheet to retrieve data from (e.g., 'Sheet1!A2:E')
         RANGE_NAME = 'Sheet1!A2:C'  # Assuming headers are in row 1
@@ -128,17 +174,7 @@ def fetch_items_from_sheet():
             return []
 
         # Process the data
-        items = []
-        for row in values:
-            if len(row) > 2:  # Ensure we have all required columns
-                item = {
-                    'Design No.': row[0],
-                    'Unit': 'PCS',
-                    'HSN Code': '123456',
-                    'Colors': [color.strip() for color in row[1].split(',')],
-                    'Sizes': [size.strip() for size in row[2].split(',')]
-                }
-                items.append(item)
+        items = [item for item in (row_to_item(row) for row in values) if item]
 
         log(f"Successfully fetched {len(items)} items from Google Sheet")
         return items
@@ -148,6 +184,27 @@ def fetch_items_from_sheet():
         log("Using sample data as fallback")
         return generate_sample_items()
 
+def fetch_items_incremental():
+    """
+    Fetch only sheet rows that are new, changed or still pending since the last
+    sync (see helper/sheet_sync.py). Each item carries its sheet 'Row' so it can
+    be marked done once handled. No sample fallback: a failed sync adds nothing.
+    """
+    try:
+        rows = sync_sheet_rows(get_sheets_service(), get_spreadsheet_id())
+    except Exception as e:
+        log(f"Error syncing items from Google Sheet: {e}")
+        return []
+
+    items = []
+    for row_number, row in rows:
+        item = row_to_item(row)
+        if item:
+            item['Row'] = row_number
+            items.append(item)
+    log(f"Successfully fetched {len(items)} new or changed items from Google Sheet")
+    return items
+
 def merge_items(raw_items):
     merged = defaultdict(lambda: {
         'Unit': 'PCS',
@@ -231,172 +288,479 @@ def wait_and_send_keys(driver, xpath, keys, timeout=10):
     return element
 
 
-def addNewItem(location):
-    username, password = load_credentials(location)
-    driver = create_driver()
-    actions = ActionChains(driver)
-    failed_items = []
-    success_count = 0
+# Reads the table of the open dialog once: {"names": {LABEL: row}, "cells": [checkbox cell per row]}
+READ_OPTION_TABLE_JS = """
+const dialogs = Array.from(document.querySelectorAll('.p-dialog, [role="dialog"]')).filter(d => d.offsetParent !== null);
+const scope = dialogs.length ? dialogs[dialogs.length - 1] : document;
+const names = {};
+const cells = [];
+scope.querySelectorAll('table tbody tr').forEach(tr => {
+    const tds = tr.querySelectorAll('td');
+    if (tds.length < 2) { return; }
+    const row = cells.length;
+    cells.push(tds[0]);
+    for (let i = 1; i < tds.length; i++) {
+        const label = (tds[i].innerText || tds[i].textContent || '').trim().toUpperCase();
+        if (label && !(label in names)) { names[label] = row; }
+    }
+});
+return {names: names, cells: cells};
+"""
+
+
+def read_option_index(driver, expected=(), timeout=DEFAULT_TIMEOUT):
+    """
+    Index the open dialog's option table (colors or size sets) by label with one JS call,
+    polling until it has rows and every expected label, or the timeout passes.
+    """
+    expected = {str(label).upper() for label in expected}
+    end_time = time.time() + timeout
+    while True:
+        index = driver.execute_script(READ_OPTION_TABLE_JS)
+        if index['cells'] and expected <= set(index['names']):
+            return index
+        if time.time() >= end_time:
+            return index
+        time.sleep(0.25)
+
+
+def select_by_index(index, labels, kind):
+    """Tick the checkbox cell of each label's row; returns the labels that are not in the table."""
+    missing = []
+    for label in labels:
+        row = index['names'].get(str(label).upper())
+        if row is None:
+            missing.append(label)
+            continue
+        index['cells'][row].click()
+    if missing:
+        log(f"Warning: Could not select {kind} {', '.join(map(str, missing))}: not in the table")
+    return missing
+
+
+def create_color(driver, actions, color):
+    """Add a color that is not in the color table yet, from the color form in the dialog."""
+    color_input = WebDriverWait(driver, 5).until(
+        EC.presence_of_element_located((By.ID, 'colorname'))
+    )
+    color_input.clear()
+    color_input.send_keys(color)
+
+    code_input = WebDriverWait(driver, 5).until(
+        EC.presence_of_element_located((By.ID, 'colorcode'))
+    )
+    code_input.clear()
+    code_input.send_keys(color)
+
+    # Move focus and trigger click
+    actions.send_keys(Keys.TAB).perform()
+
+    # Try clicking directly
+    elem = driver.switch_to.active_element
+    elem.click()
+
+
+def select_colors(driver, actions, colors):
+    """
+    Tick colors in the open Select Color table. The table is indexed once; colors
+    missing from it are all created first, then the table is re-indexed once and
+    every color is selected by its row.
+    """
+    index = read_option_index(driver)
+    missing = [color for color in colors if color.upper() not in index['names']]
+    if missing:
+        log(f"Creating {len(missing)} new colors: {', '.join(missing)}")
+        for color in missing:
+            try:
+                create_color(driver, actions, color)
+            except Exception as e:
+                log(f"Manual entry failed for color {color}: {e}")
+        index = read_option_index(driver, expected=missing)
+    select_by_index(index, colors, "color")
+
+
+def add_size_sets(driver, actions, size_sets, targets):
+    """Add size sets to the item and tick the size checkboxes in targets (others are left as they are)."""
+    # Handle Sizes
+    wait_and_click(driver, "//select[@id='sizeGrp']/option[2]")
+    wait_and_click(driver, "//button/span[contains(text(), 'Size Set')]")
+
+    # Select each size set from the item's sizes list by its row in the size set table
+    missing = select_by_index(read_option_index(driver, expected=size_sets), size_sets, "size")
+    if missing:
+        raise ValueError(f"Size sets not found: {', '.join(missing)}")
+
+    # Add selected sizes
+    wait_and_click(driver, "//button[contains(text(), 'Add')]")
+
+    # Handle checkboxes
+    actions.send_keys(Keys.TAB * 2)
+
+    for i, size in enumerate(ALL_SIZES):
+        if size in targets:
+            actions.send_keys(Keys.SPACE)
+        if i < len(ALL_SIZES) - 1:
+            actions.send_keys(Keys.TAB)
+
+    actions.perform()
+    time.sleep(DEFAULT_DELAY * 1)
+
+
+def create_item(driver, actions, item):
+    """
+    Fill and save the Add Item form (already open in driver) for one design.
+    Returns True when FronoCloud confirms the item was added.
+    """
+    time.sleep(DEFAULT_DELAY)
+
+    # Fill in product details using retry mechanism
+    wait_and_send_keys(driver, '//input[@id="productname"]', item['Design No.'])
+    wait_and_send_keys(driver, '//input[@id="productcode"]', item['Design No.'])
+
+    # Select dropdowns using configuration
+    for field, value in DROPDOWN_OPTIONS.items():
+        try:
+            wait_and_click(driver, f"//select[@id='{field}']/option[text()='{value}']")
+        except Exception as e:
+            log(f"Warning: Could not select {field}: {e}")
+            raise
+
+    # Handle Colors
+    wait_and_click(driver, "//button[contains(text(), 'Select Color')]")
+    wait_and_click(driver, "//label[contains(text(), ' All Colors ')]")
+
+    select_colors(driver, actions, item['Colors'])
+
+    # Confirm selection
+    wait_and_click(driver, "//button[contains(text(), 'OK')]")
 
+    # Handle Sizes
+    targets = set(s for r in item['Sizes'] for s in SIZE_SETS[r])
+    add_size_sets(driver, actions, item['Sizes'], targets)
+
+    # Save the item
+    wait_and_click(driver, "//button[contains(text(), ' Add')]")
+
+    # Wait for success message or error
     try:
-        # Fetch items to add
-        items_to_add = merge_items(fetch_items_from_sheet())
+        WebDriverWait(driver, 5).until(
+            EC.presence_of_element_located((By.XPATH, "//div[@role='alert' and @aria-label='Successfully added']"))
+        )
+        return True
+    except:
+        return False
 
-        if not items_to_add:
-            log("No new items to add")
-            return "No items to add"
 
-        log(f"Starting to process {len(items_to_add)} items...")
-        login(driver, username, password)
-
-        log("Navigating to Items page...")
-        time.sleep(DEFAULT_DELAY)
-        driver.get(driver.current_url.replace("/dashboard", "/item/view"))
-
-        # Filter out items that already exist
-        unique_items = []
-        for item in items_to_add:
-            design_no = item['Design No.']
-            if design_exists(driver, design_no):
-                log(f"🟡 Skipping existing design: {design_no}")
-            else:
-                unique_items.append(item)
+def open_item_for_edit(driver, items_url, design_no):
+    """Search the Items page for a design and open its edit form."""
+    driver.get(items_url)
+    search_input = WebDriverWait(driver, DEFAULT_TIMEOUT).until(
+        EC.presence_of_element_located((By.XPATH, '//input[@id="globalSearch"]'))
+    )
+    search_input.clear()
+    search_input.send_keys(design_no)
+    search_input.send_keys(Keys.ENTER)
+    wait_and_click(driver, f"//*[@id='pn_id_3-table']/tbody/tr[td/div[normalize-space(text())='{design_no}']]//button[contains(@class, 'edit') or .//*[contains(@class, 'pi-pencil')]]")
+
+
+# Reads the open edit form once: ticked colors, ticked sizes and the selected category
+READ_ITEM_FORM_JS = """
+const text = el => (el.innerText || el.textContent || '').trim();
+const category = document.getElementById('category');
+return {
+    colors: Array.from(document.querySelectorAll('#colorTable input[type="checkbox"]:checked'))
+        .map(cb => text(cb.closest('tr').cells[1]).toUpperCase()),
+    sizes: Array.from(document.querySelectorAll('input.size-cb:checked')).map(cb => parseInt(cb.value, 10)),
+    category: category && category.selectedIndex > 0 ? text(category.options[category.selectedIndex]) : null,
+};
+"""
+
+
+def read_item_attributes(driver, items_url, designs):
+    """
+    Read the current colors, size sets and category of existing designs from their edit forms,
+    then return to items_url. Returns ({design_no: {"Colors", "Sizes", "Category", "Verified": True}},
+    [designs whose form could not be read or shows no colors or size sets]).
+    """
+    attributes, failed = {}, []
+    for design in designs:
+        try:
+            open_item_for_edit(driver, items_url, design)
+            WebDriverWait(driver, DEFAULT_TIMEOUT).until(EC.presence_of_element_located((By.ID, 'category')))
+            form = driver.execute_script(READ_ITEM_FORM_JS)
+        except Exception as e:
+            log(f"⚠️ Could not read the edit form of {design}: {e}")
+            failed.append(design)
+            continue
+        ticked = set(form['sizes'])
+        sizes = [name for name, set_sizes in SIZE_SETS.items() if set(set_sizes) <= ticked]
+        if not form['colors'] or not sizes:
+            log(f"⚠️ Edit form of {design} shows no colors or size sets, keeping its sheet values")
+            failed.append(design)
+            continue
+        attributes[design] = {'Colors': form['colors'], 'Sizes': sizes, 'Category': form['category'], 'Verified': True}
+    driver.get(items_url)
+    return attributes, failed
+
+
+def update_item(driver, actions, items_url, op):
+    """
+    Apply one update op from diff_items: only the category, added colors and added
+    size sets are touched. Returns True when FronoCloud confirms the update.
+    """
+    open_item_for_edit(driver, items_url, op['design'])
+    time.sleep(DEFAULT_DELAY)
 
-        if not unique_items:
-            log("✅ All items already exist. Nothing to add.")
-            return "All items already exist."
-        
-# ========================= Fix: Also modify the existing items if there is a change in any value ========================= #
+    if op['category']:
+        wait_and_click(driver, f"//select[@id='category']/option[text()='{op['category']}']")
+
+    if op['add_colors']:
+        wait_and_click(driver, "//button[contains(text(), 'Select Color')]")
+        wait_and_click(driver, "//label[contains(text(), ' All Colors ')]")
+        select_colors(driver, actions, op['add_colors'])
+        wait_and_click(driver, "//button[contains(text(), 'OK')]")
+
+    if op['add_sizes']:
+        # Existing sizes are already ticked; ticking them again would clear them
+        existing = set(s for r in op['known_sizes'] for s in SIZE_SETS.get(r, []))
+        targets = set(s for r in op['add_sizes'] for s in SIZE_SETS[r]) - existing
+        add_size_sets(driver, actions, op['add_sizes'], targets)
+
+    wait_and_click(driver, "//button[contains(text(), ' Update') or contains(text(), ' Save')]")
+
+    try:
+        WebDriverWait(driver, 5).until(
+            EC.presence_of_element_located((By.XPATH, "//div[@role='alert' and contains(@aria-label, 'Successfully')]"))
+        )
+        return True
+    except:
+        return False
+
+
+class RateLimiter:
+    """Spaces out item submissions across all workers by at least min_interval seconds."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self.next_at = 0.0
+        self.lock = threading.Lock()
 
-        # Update items_to_add to only include unique items
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            start_at = max(now, self.next_at)
+            self.next_at = start_at + self.min_interval
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
+def partition_items(items, workers):
+    """Split items round-robin into at most `workers` non-empty chunks."""
+    return [chunk for chunk in (items[i::workers] for i in range(workers)) if chunk]
+
+
+def process_items(driver, ops, rate_limiter, worker_name="main"):
+    """
+    Apply create and update ops (see helper/item_diff.py) one after another in one
+    logged-in session on the Items page. Returns (added, updated, failed) design lists.
+    """
+    actions = ActionChains(driver)
+    items_url = driver.current_url
+    added, updated, failed = [], [], []
+    creates = [op['item'] for op in ops if op['op'] == 'create']
+    updates = [op for op in ops if op['op'] == 'update']
+
+    if creates:
         wait_and_click(driver, "//button[contains(text(), ' Add New Item ')]")
 
-        # Process each item
-        for item in unique_items:
-            try:
-                log(f"Processing item: {item['Design No.']}")
-                
-                if not item.get('Sizes'):
-                    log(f"⚠️ No size sets provided for item {item['Design No.']}, skipping...")
-                    failed_items.append(item['Design No.'])
-                    continue
-                
-                time.sleep(DEFAULT_DELAY)
-                
-                # Fill in product details using retry mechanism
-                wait_and_send_keys(driver, '//input[@id="productname"]', item['Design No.'])
-                wait_and_send_keys(driver, '//input[@id="productcode"]', item['Design No.'])
-                
-                # Select dropdowns using configuration
-                for field, value in DROPDOWN_OPTIONS.items():
-                    try:
-                        wait_and_click(driver, f"//select[@id='{field}']/option[text()='{value}']")
-                    except Exception as e:
-                        log(f"Warning: Could not select {field}: {e}")
-                        raise
+    for item in creates:
+        try:
+            log(f"[{worker_name}] Processing item: {item['Design No.']}")
 
-                # Handle Colors
-                wait_and_click(driver, "//button[contains(text(), 'Select Color')]")
-                wait_and_click(driver, "//label[contains(text(), ' All Colors ')]")
+            if not item.get('Sizes'):
+                log(f"⚠️ No size sets provided for item {item['Design No.']}, skipping...")
+                failed.append(item['Design No.'])
+                continue
 
-                # Select each color from the item's colors list
-                for color in item['Colors']:
-                    print(f"Processing color: {color}")
-                    try:
-                        # Try clicking the color from the table
-                        color_label = WebDriverWait(driver, 10).until(
-                            EC.element_to_be_clickable((By.XPATH, f"//td[contains(text(), '{color.upper()}')]"))
-                        )
-                        color_label.find_element(By.XPATH, "./preceding-sibling::td").click()
-                   
-                    except Exception as e:
-                        log(f"Warning: Could not select color {color}: {e.__class__.__name__} - {str(e)}")
-
-                        try:
-                            # Step 1: Fill in the color manually
-                            color_input = WebDriverWait(driver, 5).until(
-                                EC.presence_of_element_located((By.ID, 'colorname'))
-                            )
-                            color_input.clear()
-                            color_input.send_keys(color)
-
-                            code_input = WebDriverWait(driver, 5).until(
-                                EC.presence_of_element_located((By.ID, 'colorcode'))
-                            )
-                            code_input.clear()
-                            code_input.send_keys(color)
-
-                            # Step 2: Move focus and trigger click
-                            actions.send_keys(Keys.TAB).perform()
-
-                            # Try clicking directly
-                            elem = driver.switch_to.active_element
-                            elem.click()
-
-                            # Step 3: Wait for the new color to appear in the list and select it
-                            color_label = WebDriverWait(driver, 10).until(
-                                EC.element_to_be_clickable((By.XPATH, f"//td[normalize-space(text())='{color.upper()}']"))
-                            )
-                            color_label.find_element(By.XPATH, "./preceding-sibling::td").click()
-
-                        except Exception as inner_e:
-                            log(f"Manual entry + select failed for color {color}: {inner_e}")
-
-                # Confirm selection
-                wait_and_click(driver, "//button[contains(text(), 'OK')]")
-                
-                # Handle Sizes
-                wait_and_click(driver, "//select[@id='sizeGrp']/option[2]")
-                wait_and_click(driver, "//button/span[contains(text(), 'Size Set')]")
-
-                # Select each size from the item's sizes list
-                for size in item['Sizes']:
-                    try:
-                        size_set_label = wait_and_click(driver, f"//td[contains(text(), '{size}')]")
-                        size_set_label.find_element(By.XPATH, "./preceding-sibling::td").click()
-                    except Exception as e:
-                        log(f"Warning: Could not select size {size}: {e}")
-                        raise
+            rate_limiter.wait()
+            if create_item(driver, actions, item):
+                log(f"✅ Successfully added item: {item['Design No.']}")
+                added.append(item['Design No.'])
+            else:
+                log(f"⚠️ Item {item['Design No.']} may not have been added successfully / already present")
+                failed.append(item['Design No.'])
+
+        except Exception as e:
+            log(f"❌ Error processing item {item['Design No.']}: {e}")
+            failed.append(item['Design No.'])
+            continue
+
+        driver.refresh()
+
+    for op in updates:
+        changes = [f"category -> {op['category'].strip()}"] if op['category'] else []
+        changes += [f"+{color}" for color in op['add_colors']] + [f"+{size}" for size in op['add_sizes']]
+        try:
+            log(f"[{worker_name}] Updating item {op['design']}: {', '.join(changes)}")
+            rate_limiter.wait()
+            if update_item(driver, actions, items_url, op):
+                log(f"✅ Successfully updated item: {op['design']}")
+                updated.append(op['design'])
+            else:
+                log(f"⚠️ Item {op['design']} may not have been updated successfully")
+                failed.append(op['design'])
+        except Exception as e:
+            log(f"❌ Error updating item {op['design']}: {e}")
+            failed.append(op['design'])
 
-                # Add selected sizes
-                wait_and_click(driver, "//button[contains(text(), 'Add')]")
-                
-                # Handle checkboxes
-                targets = set(s for r in item['Sizes'] for s in SIZE_SETS[r])
-                actions.send_keys(Keys.TAB * 2)
+    return added, updated, failed
 
-                for i, size in enumerate(ALL_SIZES):
-                    if size in targets:
-                        actions.send_keys(Keys.SPACE)
-                    if i < len(ALL_SIZES) - 1:
-                        actions.send_keys(Keys.TAB)
 
-                actions.perform()
-                time.sleep(DEFAULT_DELAY * 1)
+def _open_items_page(driver, username, password):
+    login(driver, username, password)
 
-                # Save the item
-                wait_and_click(driver, "//button[contains(text(), ' Add')]")
+    log("Navigating to Items page...")
+    time.sleep(DEFAULT_DELAY)
+    driver.get(driver.current_url.replace("/dashboard", "/item/view"))
 
-                # Wait for success message or error
-                try:
-                    WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.XPATH, "//div[@role='alert' and @aria-label='Successfully added']"))
-                    )
-                    log(f"✅ Successfully added item: {item['Design No.']}")
-                    success_count += 1
-                except:
-                    log(f"⚠️ Item {item['Design No.']} may not have been added successfully / already present")
-                    failed_items.append(item['Design No.'])
 
+def _process_main_chunk(driver, ops, rate_limiter):
+    """process_items for the main session; if it fails outright, every op of its chunk counts as failed."""
+    try:
+        return process_items(driver, ops, rate_limiter)
+    except Exception as e:
+        log(f"❌ main failed: {e}")
+        return [], [], [op['design'] for op in ops]
 
-            except Exception as e:
-                log(f"❌ Error processing item {item['Design No.']}: {e}")
-                failed_items.append(item['Design No.'])
+
+def _item_worker(location, ops, rate_limiter, worker_name):
+    """Run one extra session: its own browser and login, then process its share of the ops."""
+    username, password = load_credentials(location)
+    driver = create_driver()
+    try:
+        _open_items_page(driver, username, password)
+        return process_items(driver, ops, rate_limiter, worker_name)
+    finally:
+        driver.quit()
+
+
+def addNewItem(location, workers=None):
+    """
+    Create the sheet's designs that are missing from FronoCloud, and add new
+    colors, size sets or a category change to existing ones (see helper/item_diff.py).
+    With workers > 1 (ITEM_WORKERS), the missing designs are split across that
+    many logged-in browser sessions; ITEM_MIN_INTERVAL_SECONDS spaces out
+    submissions across all of them.
+    With ITEM_SHEET_SYNC=incremental only new/changed sheet rows are processed;
+    rows whose designs failed stay pending for the next run.
+    """
+    workers = max(1, workers or ITEM_WORKERS)
+    incremental = ITEM_SHEET_SYNC.lower() == "incremental"
+    rows_by_design = defaultdict(list)
+    handled_designs = set()
+    username, password = load_credentials(location)
+    driver = create_driver()
+    failed_items = []
+    success_count = 0
+    added_items = {}
+    applied_attributes = {}
+
+    try:
+        # Fetch items to add
+        raw_items = fetch_items_incremental() if incremental else fetch_items_from_sheet()
+        for item in raw_items:
+            if 'Row' in item:
+                rows_by_design[item['Design No.']].append(item['Row'])
+        items_to_add = merge_items(raw_items)
+
+        if not items_to_add:
+            log("No new items to add")
+            return "No items to add"
+
+        log(f"Starting to process {len(items_to_add)} items...")
+        _open_items_page(driver, username, password)
+
+        # Diff against one export of the item master instead of a globalSearch per design;
+        # if the export fails, fall back to searching and only create missing designs
+        try:
+            item_master = get_item_master(driver, location)
+            attributes = load_item_attributes(location)
+            if ITEM_ATTRIBUTE_READBACK:
+                # Designs about to be updated from an unverified baseline are read from their edit
+                # form first; results and failures are stored so neither is read again every run
+                unread = designs_to_read(items_to_add, item_master, attributes, DROPDOWN_OPTIONS['category'],
+                                         load_read_failures(location), ITEM_ATTRIBUTE_RETRY_SECONDS)
+                if unread:
+                    log(f"Reading colors, sizes and category of {min(len(unread), ITEM_ATTRIBUTE_MAX_READS)} "
+                        f"of {len(unread)} designs to update...")
+                    read, failed = read_item_attributes(driver, driver.current_url, unread[:ITEM_ATTRIBUTE_MAX_READS])
+                    remember_item_attributes(location, read)
+                    remember_read_failures(location, failed)
+                    attributes = load_item_attributes(location)
+            ops = diff_items(items_to_add, item_master, attributes, DROPDOWN_OPTIONS['category'])
+        except Exception as e:
+            log(f"⚠️ Could not export item master, searching designs one by one: {e}")
+            ops = [
+                {"op": "unchanged" if design_exists(driver, item['Design No.']) else "create",
+                 "design": item['Design No.'], "item": item, "baseline": False}
+                for item in items_to_add
+            ]
+
+        for op in ops:
+            if op['op'] != 'unchanged':
                 continue
-            
-            driver.refresh()
+            log(f"🟡 Skipping existing design: {op['design']}")
+            # Nothing more to do for these sheet rows
+            handled_designs.add(op['design'])
+            if op['baseline']:
+                applied_attributes[op['design']] = {'Colors': op['item']['Colors'], 'Sizes': op['item']['Sizes']}
+
+        pending_ops = [op for op in ops if op['op'] in ('create', 'update')]
+        if not pending_ops:
+            log("✅ All items already exist. Nothing to add.")
+            return "All items already exist."
 
-        summary = f"Processed {len(items_to_add)} items: {success_count} successful, {len(failed_items)} failed"
+        rate_limiter = RateLimiter(ITEM_MIN_INTERVAL_SECONDS)
+        chunks = partition_items(pending_ops, workers)
+        results = {}
+        if len(chunks) == 1:
+            results["main"] = _process_main_chunk(driver, chunks[0], rate_limiter)
+        else:
+            log(f"Processing {len(pending_ops)} items across {len(chunks)} browser sessions...")
+            # The session used for the existence check takes the first chunk
+            with ThreadPoolExecutor(max_workers=len(chunks) - 1, thread_name_prefix="item-worker") as executor:
+                futures = {
+                    f"worker {i}": executor.submit(_item_worker, location, chunk, rate_limiter, f"worker {i}")
+                    for i, chunk in enumerate(chunks[1:], start=1)
+                }
+                # Never leaves the block early: the workers' results must be recorded whatever happens here
+                results["main"] = _process_main_chunk(driver, chunks[0], rate_limiter)
+                for worker_name, future in futures.items():
+                    try:
+                        results[worker_name] = future.result()
+                    except Exception as e:
+                        log(f"❌ {worker_name} failed: {e}")
+                        chunk = chunks[int(worker_name.split()[-1])]
+                        results[worker_name] = ([], [], [op['design'] for op in chunk])
+
+        ops_by_design = {op['design']: op for op in pending_ops}
+        updated_items = []
+        for worker_name, (added, updated, failed) in results.items():
+            if len(results) > 1:
+                log(f"[{worker_name}] {len(added)} added, {len(updated)} updated, {len(failed)} failed")
+            success_count += len(added) + len(updated)
+            failed_items.extend(failed)
+            updated_items.extend(updated)
+            handled_designs.update(added + updated)
+            added_items.update({design: {'Design No.': design} for design in added})
+            for design in added + updated:
+                op = ops_by_design[design]
+                item = op['item']
+                # Created designs, and updates applied on top of a verified record, match FronoCloud
+                applied_attributes[design] = {'Colors': item['Colors'], 'Sizes': item['Sizes'], 'Category': DROPDOWN_OPTIONS['category'].strip(),
+                                              'Verified': not op.get('baseline')}
+
+        summary = f"Processed {len(items_to_add)} items: {success_count} successful ({len(updated_items)} updated), {len(failed_items)} failed"
         if failed_items:
             summary += f"\nFailed items: {', '.join(failed_items)}"
         print(summary)
@@ -406,7 +770,11 @@ def addNewItem(location):
         return f"Error: {e}"
 
     finally:
+        remember_items(location, added_items)
+        remember_item_attributes(location, applied_attributes)
+        if incremental and rows_by_design:
+            mark_rows_done(get_spreadsheet_id(), [row for design in handled_designs for row in rows_by_design[design]])
         log("Closing browser...")
         driver.quit()
 
-addNewItem("kolkata")
\ No newline at end of file
+addNewItem("kolkata")
@@ -0,0 +1,267 @@
+"""
+Check that the Polars cleaners match the pandas ones, and time both.
+
+Usage: python -m scripts.cleaner_benchmark [--rows 5000] [--repeat 3] [--cleaner modify_gr_report]
+       [--archive] [--output FILE]
+
+Every cleaner runs on a synthetic export written to Excel and read back with
+load_dataframe, so the column types match real downloads; the stand-in exports
+(scripts/standin) are used where one exists. --archive also runs each cleaner on
+the newest archived export of its reports (RAW_ARCHIVE_DIR). Outputs must have the
+same columns, rows and cell values (compared as text, with missing values equal);
+exits non-zero on any mismatch. Needs `pip install polars`.
+"""
+import argparse
+import io
+import json
+import random
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+from scripts.df_cleaners import cleaner as pandas_cleaner
+from scripts.helper.common_utils import load_dataframe
+from scripts.standin.exports import BROKERS, COLORS, CUSTOMERS, VENDORS, build_export, design_codes
+
+
+STANDIN_FIXTURES = {
+    "modify_sales_invoice_dataframe": "sales_invoice",
+    "modify_purchase_invoice_dataframe": "purchase_invoice",
+    "modify_stock_dataframe": "stock",
+    "modify_pending_po": "pending_purchase_order",
+    "modify_sales_report_dataframe": "item_wise_customer",
+}
+
+
+def _date(rng):
+    return f"{rng.randrange(1, 29):02d}/{rng.randrange(1, 13):02d}/2025"
+
+
+def _pending_orders(rows, rng):
+    return pd.DataFrame([{
+        "Customer Name": rng.choice(CUSTOMERS),
+        "Item Code": code,
+        "Item Name": f"KURTI {code}",
+        "Color Name/Code": rng.choice(COLORS),
+        "Total": rng.randrange(1, 100),
+        "SO No": f"SO/{40000 + i}" if i % 50 else "",
+        "SO Date": _date(rng),
+        "Broker": rng.choice(BROKERS),
+    } for i, code in enumerate(design_codes(rows))])
+
+
+def _valuation(rows, rng):
+    data = [{"Item": code, "Color": rng.choice(COLORS), "Qty": rng.randrange(0, 300), "Rate": round(rng.uniform(100, 900), 2)}
+            for code in design_codes(rows)]
+    data.append({"Item": "Total", "Qty": sum(row["Qty"] for row in data)})
+    return pd.DataFrame(data)
+
+
+def _sales_orders(rows, rng):
+    data = [{
+        "#": i + 1,
+        "SO No": f"SO/{40000 + i}",
+        "SO Date": _date(rng),
+        "Expected Date": _date(rng),
+        "Customer Name": rng.choice(CUSTOMERS),
+        "Qty [Pcs]": rng.randrange(1, 100),
+    } for i in range(rows)]
+    data.append({"SO No": "Total", "Qty [Pcs]": sum(row["Qty [Pcs]"] for row in data)})
+    return pd.DataFrame(data)
+
+
+def _brokers(rows, rng):
+    data = [{"Broker Name": rng.choice(BROKERS), "Mobile No.": str(9800000000 + i), "Empty": None} for i in range(rows)]
+    data.insert(rows // 2, {})
+    return pd.DataFrame(data, columns=["Broker Name", "Mobile No.", "Empty"])
+
+
+def _customers(rows, rng):
+    return pd.DataFrame([{
+        "Company Name": f"{rng.choice(CUSTOMERS)} {i}",
+        "Cust/Ved Type": "Customer",
+        "Area": rng.choice(["BURRABAZAR", "HOWRAH", None]),
+        "City": rng.choice(["KOLKATA", "SURAT"]),
+        "State": "WEST BENGAL",
+        "Outstanding": f"{rng.uniform(0, 90000):.2f} {rng.choice(['Cr', 'Dr'])}",
+        "Broker": rng.choice(BROKERS),
+        "Contact Name": rng.choice(["NA NA", "RAMESH JI", None]),
+        "Number": 9800000000 + i if i % 7 else None,
+        "Created Date": _date(rng),
+    } for i in range(rows)])
+
+
+def _goods_returns(rows, rng):
+    data = []
+    for i in range(rows):
+        data.append({
+            "CN Number": f" cn/{2025 + i % 3}-26/{500 + i} ",
+            "CN Date": _date(rng),
+            "Customer Name": f"{rng.choice(CUSTOMERS).lower()}, kolkata",
+            "Qty": rng.randrange(1, 50),
+            "Amount": f"{rng.uniform(100, 9000):.2f}" if i % 9 else "n/a",
+            "Reason.": rng.choice(["damaged", "", None, "late delivery"]),
+        })
+        if i % 25 == 24:
+            data.append({"CN Number": "Total", "Qty": 0})
+    return pd.DataFrame(data)
+
+
+def _payables(rows, rng):
+    data = [{
+        "#": i + 1,
+        "Vendor Name": rng.choice(VENDORS) if i % 11 else " ",
+        "Bill No": f"PI/{8000 + i}",
+        "Amount": round(rng.uniform(1000, 90000), 2),
+        "--Select--Udyam": None,
+    } for i in range(rows)]
+    return pd.DataFrame(data)
+
+
+def _receivables(rows, rng):
+    data = []
+    for i in range(rows):
+        if i % 10 == 0:
+            data.append({"Customer": rng.choice(CUSTOMERS)})
+        data.append({
+            "Customer": f"SI/{25000 + i}",
+            "Bill Date": _date(rng),
+            "Total Amt": round(rng.uniform(1000, 90000), 2),
+            "Broker": rng.choice(BROKERS),
+            "Last Collection Date": _date(rng) if i % 4 else None,
+        })
+        if i % 10 == 9:
+            data.append({"Customer": "Total", "Total Amt": 0, "Broker": "Total"})
+    return pd.DataFrame(data)
+
+
+SYNTHETIC_FIXTURES = {
+    "modify_order_dataframe": _pending_orders,
+    "modify_valuation_dataframe": _valuation,
+    "modify_sales_order_dataframe": _sales_orders,
+    "modify_broker_dataframe": _brokers,
+    "modify_customer_dataframe": _customers,
+    "modify_gr_report": _goods_returns,
+    "modify_account_payable_dataframe": _payables,
+    "modify_account_receivable_dataframe": _receivables,
+}
+
+
+def build_fixture(name, rows, seed=0):
+    """Raw export bytes for one cleaner, as (file name, bytes)."""
+    if name in STANDIN_FIXTURES:
+        return build_export(STANDIN_FIXTURES[name], rows, seed)
+    buffer = io.BytesIO()
+    SYNTHETIC_FIXTURES[name](rows, random.Random(seed + len(name))).to_excel(buffer, index=False)
+    return f"{name}.xlsx", buffer.getvalue()
+
+
+def archived_fixtures():
+    """Newest archived export per location/report, as {cleaner name: [(label, file name, bytes)]}."""
+    from scripts.helper.raw_archive import list_archived, read_archived
+    from scripts.replay_archive import _load_registry
+
+    registry = _load_registry()
+    newest = {}
+    for entry in list_archived():
+        newest[(entry["location"], entry["report"])] = entry
+    fixtures = {}
+    for (location, report), entry in sorted(newest.items()):
+        spec = registry.get(report)
+        if spec is None:
+            continue
+        fixtures.setdefault(spec["cleaner"].__name__, []).append(
+            (f"{location}/{report}", entry["original_name"], read_archived(entry["path"]))
+        )
+    return fixtures
+
+
+def _cells(df):
+    """Cell values as text, with every kind of missing value as None."""
+    return [[None if pd.isna(value) else str(value) for value in row] for row in df.itertuples(index=False, name=None)]
+
+
+def compare(expected, actual):
+    """First difference between two cleaned frames, or None when they match."""
+    if expected is None or actual is None:
+        return None if expected is None and actual is None else "only one cleaner returned None"
+    if list(expected.columns) != list(actual.columns):
+        return f"columns differ: {list(expected.columns)} != {list(actual.columns)}"
+    if len(expected) != len(actual):
+        return f"row counts differ: {len(expected)} != {len(actual)}"
+    for index, (left, right) in enumerate(zip(_cells(expected), _cells(actual))):
+        if left != right:
+            column = next(i for i, (a, b) in enumerate(zip(left, right)) if a != b)
+            return f"row {index}, column {expected.columns[column]!r}: {left[column]!r} != {right[column]!r}"
+    return None
+
+
+def _time(func, df, repeat):
+    timings = []
+    for _ in range(repeat):
+        # The pandas cleaners modify their input, so every run gets a fresh copy
+        frame = df.copy()
+        started = time.perf_counter()
+        result = func(frame)
+        timings.append(time.perf_counter() - started)
+    return result, statistics.median(timings)
+
+
+def check(label, name, file_name, data, repeat):
+    from scripts.df_cleaners import polars_cleaner
+
+    df = load_dataframe(file_name, data=data)
+    expected, pandas_s = _time(getattr(pandas_cleaner, name), df, repeat)
+    # The bare Polars function: the pandas fallback would hide a failing Polars cleaner
+    actual, polars_s = _time(getattr(polars_cleaner, name).__wrapped__, df, repeat)
+    return {
+        "cleaner": name,
+        "fixture": label,
+        "rows_in": int(len(df)),
+        "rows_out": None if expected is None else int(len(expected)),
+        "pandas_s": round(pandas_s, 4),
+        "polars_s": round(polars_s, 4),
+        "mismatch": compare(expected, actual),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000, help="Rows per synthetic export")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cleaner", action="append", help="Only these cleaners (repeatable)")
+    parser.add_argument("--archive", action="store_true", help="Also check the newest archived exports")
+    parser.add_argument("--output", help="Write the results as JSON")
+    args = parser.parse_args()
+
+    names = args.cleaner or [*STANDIN_FIXTURES, *SYNTHETIC_FIXTURES]
+    cases = [(f"synthetic {args.rows}", name, *build_fixture(name, args.rows)) for name in names]
+    if args.archive:
+        for name, fixtures in archived_fixtures().items():
+            if name in names:
+                cases.extend((label, name, file_name, data) for label, file_name, data in fixtures)
+
+    results = []
+    for label, name, file_name, data in cases:
+        result = check(label, name, file_name, data, args.repeat)
+        results.append(result)
+        outcome = "✅" if result["mismatch"] is None else f"❌ {result['mismatch']}"
+        print(f"📊 {name} [{label}]: pandas {result['pandas_s'] * 1000:.1f} ms, "
+              f"polars {result['polars_s'] * 1000:.1f} ms {outcome}")
+
+    failed = [result for result in results if result["mismatch"] is not None]
+    pandas_total = sum(result["pandas_s"] for result in results)
+    polars_total = sum(result["polars_s"] for result in results)
+    print(f"⏱️ Total: pandas {pandas_total:.3f}s, polars {polars_total:.3f}s, {len(failed)} of {len(results)} mismatched")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"rows": args.rows, "repeat": args.repeat, "results": results}, f, indent=2)
+        print(f"💾 Saved {args.output}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Check that BROWSER_MODE=contexts keeps report drivers apart, against the local FronoCloud stand-in.
+
+Usage: python -m scripts.context_isolation_check [--port 5056] [--base-url URL]
+
+Opens drivers in one shared Chrome, each in its own browser context, and checks that
+a login in one context leaves the others logged out (cookies are per context), that an
+export downloaded in each context lands only in that context's download directory,
+and that quitting a driver disposes only its context: the others keep working and the
+next driver reuses the same Chrome and chromedriver. Exits non-zero on any failure.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from scripts.e2e_benchmark import start_standin
+from scripts.standin.server import SESSION_COOKIE
+
+
+def _cookie(driver):
+    cookie = driver.get_cookie(SESSION_COOKIE)
+    return cookie["value"] if cookie else None
+
+
+def _downloads(path):
+    return sorted(name for name in os.listdir(path) if not name.endswith(".crdownload"))
+
+
+def run_checks(base_url, work_dir):
+    """Run every check against the stand-in at base_url; returns [(check, passed, detail)]."""
+    os.environ["BROWSER_MODE"] = "contexts"
+    os.environ["FRONO_BASE_URL"] = base_url
+    from scripts.helper import browser_manager
+    from scripts.helper.common_utils import wait_for_download
+    from scripts.helper.fronocloud_login import login
+
+    browser_manager.BROWSER_MODE = "contexts"
+    results = []
+
+    def check(name, passed, detail=""):
+        results.append((name, bool(passed), detail))
+        print(f"{'✅' if passed else '❌'} {name}" + (f": {detail}" if detail else ""))
+
+    dir_a, dir_b = os.path.join(work_dir, "a"), os.path.join(work_dir, "b")
+    driver_a = browser_manager.create_driver(dir_a)
+    driver_b = browser_manager.create_driver(dir_b)
+    driver_c = None
+    try:
+        shared = browser_manager._shared_browser
+        check("one shared Chrome for both drivers", shared is not None and driver_a.browser_context_id != driver_b.browser_context_id,
+              f"contexts {driver_a.browser_context_id} / {driver_b.browser_context_id}")
+
+        login(driver_a, "alice", "standin")
+        driver_b.get(f"{base_url}/dashboard")
+        check("login in A leaves B logged out", _cookie(driver_a) == "alice" and _cookie(driver_b) is None
+              and "/login" in driver_b.current_url, f"A={_cookie(driver_a)!r}, B={_cookie(driver_b)!r} at {driver_b.current_url}")
+
+        login(driver_b, "bob", "standin")
+        check("each context keeps its own session cookie", (_cookie(driver_a), _cookie(driver_b)) == ("alice", "bob"),
+              f"A={_cookie(driver_a)!r}, B={_cookie(driver_b)!r}")
+
+        driver_a.get(f"{base_url}/export/stock?range=context-a")
+        downloaded = wait_for_download(dir_a)
+        check("A's export lands in A's directory only", downloaded and not _downloads(dir_b),
+              f"A={_downloads(dir_a)}, B={_downloads(dir_b)}")
+
+        driver_b.get(f"{base_url}/export/stock?range=context-b")
+        downloaded = wait_for_download(dir_b)
+        check("B's export lands in B's directory only", downloaded and len(_downloads(dir_a)) == 1,
+              f"A={_downloads(dir_a)}, B={_downloads(dir_b)}")
+
+        driver_a.quit()
+        driver_a = None
+        driver_b.get(f"{base_url}/dashboard")
+        check("quitting A leaves B working", "/dashboard" in driver_b.current_url and _cookie(driver_b) == "bob",
+              driver_b.current_url)
+
+        driver_c = browser_manager.create_driver(os.path.join(work_dir, "c"))
+        driver_c.get(f"{base_url}/dashboard")
+        check("a new driver reuses the shared Chrome in a fresh context",
+              browser_manager._shared_browser is shared and _cookie(driver_c) is None)
+    finally:
+        for driver in (driver_a, driver_b, driver_c):
+            if driver is not None:
+                driver.quit()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=5056)
+    parser.add_argument("--base-url", help="Use an already running stand-in instead of starting one")
+    args = parser.parse_args()
+
+    standin = None
+    if args.base_url:
+        base_url = args.base_url
+    else:
+        standin, base_url = start_standin(args.port, rows=20, latency_ms=0, report_seconds=0)
+    print(f"🧪 Checking browser context isolation against {base_url}")
+    try:
+        results = run_checks(base_url, tempfile.mkdtemp(prefix="context_isolation_"))
+    finally:
+        if standin is not None:
+            standin.terminate()
+            standin.wait()
+
+    failed = [name for name, passed, _ in results if not passed]
+    print(f"{'❌' if failed else '✅'} {len(results) - len(failed)} of {len(results)} checks passed")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
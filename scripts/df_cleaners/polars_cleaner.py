@@ -0,0 +1,346 @@
+"""
+Polars versions of the report cleaners in cleaner.py.
+
+Each function has the same name, input (the pandas frame from load_dataframe) and output
+(a pandas frame) as its pandas counterpart, but runs as one multi-threaded Polars lazy query.
+Mixed-type object columns are read as text, so cells that pandas leaves as ints in an
+otherwise text column come back as their string form. If a Polars cleaner fails (e.g.
+duplicate column names, which Polars does not allow), the pandas cleaner runs instead.
+Select them per report with POLARS_CLEANERS (see report_engine.get_cleaner).
+"""
+import re
+from functools import wraps
+
+import pandas as pd
+import polars as pl
+
+from scripts.df_cleaners import cleaner as pandas_cleaner
+from scripts.helper.common_utils import log
+
+
+# How this pandas version renders missing values in astype(str): "nan"/"None" before pandas 3, still missing from 3 on
+_NAN_TEXT = pd.Series([float("nan")], dtype=object).astype(str).iloc[0]
+_NAN_TEXT = None if pd.isna(_NAN_TEXT) else _NAN_TEXT
+_NONE_TEXT = pd.Series([None], dtype=object).astype(str).iloc[0]
+_NONE_TEXT = None if pd.isna(_NONE_TEXT) else _NONE_TEXT
+
+ROW = "__row"
+
+
+def _polars_cleaner(func):
+    """
+    Run the Polars cleaner, falling back to the pandas cleaner of the same name if it fails.
+    report only names the report in the fallback log; the bare Polars function is __wrapped__.
+    """
+    pandas_func = getattr(pandas_cleaner, func.__name__)
+
+    @wraps(func)
+    def wrapper(df, report=None):
+        try:
+            return func(df)
+        except Exception as e:
+            log(f"⚠️ Polars {func.__name__} failed for {report or 'an unnamed report'} "
+                f"({e.__class__.__name__}: {e}), falling back to pandas")
+            return pandas_func(df)
+
+    return wrapper
+
+
+def _to_polars(df):
+    """Eager Polars copy of a pandas frame; object columns (mixed types) become text, missing stays null."""
+    if df.columns.duplicated().any() or not all(isinstance(name, str) for name in df.columns):
+        raise ValueError("Polars cleaners need unique text column names")
+    columns = []
+    for name in df.columns:
+        series = df[name]
+        if series.dtype == object:
+            series = series.astype(str).where(series.notna())
+        columns.append(pl.from_pandas(series).alias(name))
+    return pl.DataFrame(columns)
+
+
+def _to_pandas(frame):
+    return frame.to_pandas()
+
+
+def _standard_name(name):
+    """standardize_column_names for one column name."""
+    name = name.replace(" ", "_").replace("/", "_").replace("-", "_")
+    return re.sub(r"\.$", "", name)
+
+
+def _rename(lf, rename):
+    names = lf.collect_schema().names()
+    return lf.rename({name: rename(name) for name in names if rename(name) != name})
+
+
+def _as_str(name, dtype):
+    """Expression for pandas astype(str) of one column."""
+    column = pl.col(name)
+    if dtype == pl.String:
+        expr = column
+    elif dtype == pl.Null:
+        expr = column.cast(pl.String)
+    elif dtype == pl.Boolean:
+        expr = pl.when(column.is_null()).then(None).when(column).then(pl.lit("True")).otherwise(pl.lit("False"))
+    elif dtype == pl.Datetime:
+        # pandas drops the time when every value is at midnight
+        midnight = (column.dt.truncate("1d") == column).all()
+        expr = pl.when(midnight).then(column.dt.strftime("%Y-%m-%d")).otherwise(column.dt.strftime("%Y-%m-%d %H:%M:%S"))
+    else:
+        expr = column.cast(pl.String)
+    if _NAN_TEXT is not None:
+        expr = expr.fill_null(pl.lit(_NAN_TEXT))
+    return expr.alias(name)
+
+
+def _all_str(lf):
+    return lf.select([_as_str(name, dtype) for name, dtype in lf.collect_schema().items()])
+
+
+def _standardize_date(lf, name):
+    """standardize_date_column: text, stripped, with "/" replaced by "-"."""
+    dtype = lf.collect_schema()[name]
+    return lf.with_columns(_as_str(name, dtype).str.strip_chars().str.replace_all("/", "-", literal=True))
+
+
+def _drop_last_row(lf):
+    return lf.with_row_index(ROW).filter(pl.col(ROW) < pl.len() - 1).drop(ROW)
+
+
+def _drop_empty_columns(frame):
+    """dropna(axis=1, how="all") on an eager frame."""
+    return frame.select([name for name in frame.columns if frame[name].null_count() < frame.height])
+
+
+@_polars_cleaner
+def modify_sales_report_dataframe(df):
+    print("🛠 Modifying Sales Report (Polars)...")
+    frame = _drop_empty_columns(_to_polars(df))
+    lf = frame.lazy().select([name for name in frame.columns if not name.startswith("Unnamed")])
+    lf = lf.filter(pl.col("Date").ne_missing("Total"))
+
+    # Item code and color come from the item title rows (first column set) and are carried down
+    names = lf.collect_schema().names()
+    lf = lf.with_columns(pl.when(pl.col(names[0]).is_not_null()).then(pl.col(names[1])).forward_fill().alias("Item Code"))
+    names = lf.collect_schema().names()
+    lf = lf.with_columns(pl.when(pl.col(names[0]).is_not_null()).then(pl.col(names[2])).forward_fill().alias("Item Color"))
+
+    lf = lf.filter(pl.col("Item Code").is_not_null())
+    lf = lf.filter(pl.col("Date").ne_missing("Size") & pl.col("Total").is_not_null())
+    if "Size Group" in names:
+        lf = lf.drop("Size Group")
+    lf = lf.filter(pl.col("Date").ne_missing("Total") & pl.col("Order No").is_not_null())
+    lf = lf.drop(lf.collect_schema().names()[0])
+
+    lf = _rename(lf, _standard_name)
+    lf = _standardize_date(lf, "Date")
+    return _to_pandas(lf.collect())
+
+
+@_polars_cleaner
+def modify_order_dataframe(df):
+    print("🛠 Modifying Sales Pending Order Dataframe (Polars)...")
+    lf = _rename(_to_polars(df).lazy(), _standard_name)
+    lf = _standardize_date(lf, "SO_Date")
+
+    required_columns = [
+        "Customer_Name", "Item_Code", "Item_Name", "Color_Name_Code",
+        "Total", "SO_No", "SO_Date", "Broker"
+    ]
+    schema = lf.collect_schema()
+    missing_cols = [col for col in required_columns if col not in schema]
+    if missing_cols:
+        print(f"⚠️ Missing Columns: {missing_cols}")
+        print(f"⚠️ All Columns: {schema.names()}")
+        return None
+
+    lf = lf.select(required_columns)
+    so_no = _as_str("SO_No", schema["SO_No"])
+    lf = lf.filter(pl.col("SO_No").is_not_null() & (so_no.str.strip_chars() != ""))
+    return _to_pandas(_all_str(lf).collect())
+
+
+@_polars_cleaner
+def modify_stock_dataframe(df):
+    print("🛠 Modifying Inventory Stock Report (Polars)...")
+    lf = _rename(_to_polars(df).lazy(), _standard_name)
+    if "Item" in lf.collect_schema():
+        item = _as_str("Item", lf.collect_schema()["Item"])
+        lf = lf.filter(~item.str.contains("(?i)grand total").fill_null(False))
+    return _to_pandas(_all_str(lf).collect())
+
+
+@_polars_cleaner
+def modify_sales_invoice_dataframe(df):
+    print("🛠 Modifying Sales Invoice Data (Polars)...")
+    lf = _to_polars(df).lazy().drop("Unnamed: 0")
+    lf = _rename(lf, _standard_name)
+    lf = lf.select([name for name in lf.collect_schema().names() if name.strip() != ""])
+    lf = _drop_last_row(lf)
+    lf = _standardize_date(lf, "Date")
+    lf = _standardize_date(lf, "Created_Date")
+    return _to_pandas(_all_str(lf).collect())
+
+
+@_polars_cleaner
+def modify_pending_po(df):
+    print("🛠 Modifying Pending Purchase Order Report (Polars)...")
+    # Vendor title rows hold a name in the first column, their lines a serial number:
+    # the type checks match the pandas loop exactly, the fill runs in Polars
+    first = df.columns[0]
+    values = df[first].astype("object")
+    is_str = values.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    is_int = values.map(lambda value: isinstance(value, int)).to_numpy(dtype=bool)
+
+    frame = _to_polars(df).rename({first: "Vendor Name"})
+    frame = frame.with_columns(pl.Series("__is_str", is_str), pl.Series("__is_int", is_int))
+    vendor = pl.col("Vendor Name").cast(pl.String)
+    last_vendor = pl.when(pl.col("__is_str")).then(vendor).forward_fill()
+    if _NONE_TEXT is not None:
+        last_vendor = last_vendor.fill_null(pl.lit(_NONE_TEXT))
+    lf = frame.lazy().with_columns(pl.when(pl.col("__is_int")).then(last_vendor).otherwise(vendor).alias("Vendor Name"))
+    lf = lf.drop("__is_str", "__is_int")
+
+    item_name = "Item Name" if "Item Name" in frame.columns else "Item_Name"
+    lf = lf.filter(pl.col(item_name).is_not_null())
+    lf = _rename(lf, _standard_name)
+    lf = _standardize_date(lf, "PO_Date")
+    lf = _standardize_date(lf, "Last_Delivery_Date")
+    return _to_pandas(_all_str(lf).collect())
+
+
+@_polars_cleaner
+def modify_valuation_dataframe(df):
+    print("🛠 Modifying Stock Valuation Report (Polars)...")
+    lf = _rename(_to_polars(df).lazy(), _standard_name)
+    lf = _drop_last_row(lf)
+    return _to_pandas(_all_str(lf).collect())
+
+
+@_polars_cleaner
+def modify_sales_order_dataframe(df):
+    print("🛠 Modifying Sales Order Report (Polars)...")
+
+    def rename(name):
+        return name.replace(" ", "_").replace("/", "_").replace("#", "column_n").replace("[", "").replace("]", "")
+
+    lf = _rename(_to_polars(df).lazy(), rename)
+    lf = _standardize_date(lf, "SO_Date")
+    lf = _standardize_date(lf, "Expected_Date")
+    lf = _drop_last_row(lf)
+    return _to_pandas(_all_str(lf).collect())
+
+
+@_polars_cleaner
+def modify_broker_dataframe(df):
+    print("🛠 Modifying Broker Data (Polars)...")
+    # The pandas cleaner standardizes the names twice, which strips up to two trailing dots
+    frame = _to_polars(df)
+    frame = frame.rename({name: _standard_name(_standard_name(name)) for name in frame.columns})
+    frame = _drop_empty_columns(frame)
+    lf = frame.lazy().filter(~pl.all_horizontal([pl.col(name).is_null() for name in frame.columns]))
+    return _to_pandas(_all_str(lf).collect())
+
+
+@_polars_cleaner
+def modify_customer_dataframe(df):
+    print("🛠 Modifying Customer Data (Polars)...")
+    lf = _to_polars(df).lazy().select([
+        "Company Name", "Cust/Ved Type", "Area", "City", "State", "Outstanding", "Broker", "Contact Name", "Number", "Created Date"
+    ])
+    lf = _rename(lf, lambda name: name.replace("/", "_").replace(" ", "_"))
+
+    number = _as_str("Number", lf.collect_schema()["Number"])
+    lf = lf.with_columns(
+        pl.col("Outstanding").str.extract(r"(Cr|Dr)$", 1).replace_strict({"Cr": "Credit", "Dr": "Debit"}, default=None).alias("Type"),
+        pl.col("Outstanding").str.replace_all(r"[^\d.]", "").cast(pl.Float64),
+        number.str.replace(r"\.0$", ""),
+    )
+    lf = lf.select([
+        "Company_Name", "Cust_Ved_Type", "Area", "City", "State", "Outstanding", "Type", "Broker", "Contact_Name", "Number", "Created_Date"
+    ])
+    return _to_pandas(lf.collect())
+
+
+@_polars_cleaner
+def modify_gr_report(df):
+    print("🛠 Modifying GR Report (Polars)...")
+    frame = _to_polars(df)
+    lf = frame.lazy().with_columns(
+        pl.col(name).str.strip_chars().str.to_uppercase() for name, dtype in frame.schema.items() if dtype == pl.String
+    )
+    lf = lf.filter(~pl.all_horizontal([pl.col(name).is_null() for name in frame.columns]))
+    for name in ("CN Number", "Customer Name"):
+        text = _as_str(name, frame.schema[name])
+        lf = lf.filter(~text.str.contains("TOTAL", literal=True).fill_null(False))
+
+    # pd.to_numeric: text that is all integers becomes int64, anything else float64 (unparseable -> missing)
+    numeric, int_flags = [], []
+    for name in ("Qty", "Amount"):
+        if frame.schema[name] == pl.String:
+            numeric.append(pl.col(name).cast(pl.Float64, strict=False))
+            int_flags.append((pl.col(name).str.contains(r"^[+-]?\d+$").all() & (pl.col(name).null_count() == 0)).alias(f"__{name}_int"))
+    lf = lf.with_columns(int_flags).with_columns(numeric)
+
+    customer = _as_str("Customer Name", frame.schema["Customer Name"])
+    lf = lf.with_columns(
+        customer.str.split(",").list.first(),
+        pl.col("CN Number").str.extract(r"CN/([\d-]+/\d+)", 1).fill_null(pl.col("CN Number")).alias("Invoice No"),
+    )
+
+    lf = _rename(lf, lambda name: name if name.startswith("__") else re.sub(r"[ .]", "_", re.sub(r"\.$", "", name)).lower())
+    lf = lf.with_columns(pl.when(pl.col("reason") == "").then(pl.lit("NOT MENTIONED")).otherwise(pl.col("reason")).fill_null("NOT MENTIONED").alias("reason"))
+    lf = _rename(lf, lambda name: name if name.startswith("__") else _standard_name(name))
+    lf = _standardize_date(lf, "cn_date")
+
+    result = lf.collect()
+    for name in ("Qty", "Amount"):
+        flag = f"__{name}_int"
+        if flag in result.columns:
+            if result.height and result[flag][0]:
+                result = result.with_columns(pl.col(name.lower()).cast(pl.Int64))
+            result = result.drop(flag)
+    return _to_pandas(result)
+
+
+@_polars_cleaner
+def modify_purchase_invoice_dataframe(df):
+    print("🛠 Modifying Purchase Invoice Report (Polars)...")
+    lf = _rename(_to_polars(df).lazy(), lambda name: name.replace(" ", "_").replace("/", "_"))
+    lf = lf.select([name for name in lf.collect_schema().names() if "Unnamed:_0" not in name and name.strip() != ""])
+    lf = _standardize_date(lf, "Date")
+    lf = _standardize_date(lf, "Inv_Date")
+    lf = _standardize_date(lf, "Created_Date")
+    return _to_pandas(_all_str(lf).collect())
+
+
+@_polars_cleaner
+def modify_account_payable_dataframe(df):
+    print("🛠 Modifying Account Payable Report (Polars)...")
+    lf = _rename(_to_polars(df).lazy(), _standard_name)
+    names = [name for name in lf.collect_schema().names() if name.strip() != "" and "__Select__Udyam" not in name]
+    lf = lf.select(names[1:])
+
+    schema = lf.collect_schema()
+    if "Vendor_Name" not in schema:
+        raise ValueError("The 'Vendor Name' column does not exist in the provided file.")
+    vendor = _as_str("Vendor_Name", schema["Vendor_Name"])
+    lf = lf.filter(pl.col("Vendor_Name").is_not_null() & (vendor.str.strip_chars() != ""))
+    return _to_pandas(_all_str(lf).collect())
+
+
+@_polars_cleaner
+def modify_account_receivable_dataframe(df):
+    print("🛠 Modifying Account Receivable Report (Polars)...")
+    lf = _rename(_to_polars(df).lazy(), _standard_name)
+    lf = _standardize_date(lf, "Last_Collection_Date")
+
+    names = lf.collect_schema().names()
+    # Drop customer title rows (only the first column set) and totals
+    lf = lf.filter(~pl.all_horizontal([pl.col(name).is_null() for name in names[1:]]))
+    lf = lf.filter(pl.col(names[0]).ne_missing("Total"))
+    lf = lf.drop([name for name in ("Unnamed:_0", "Unnamed:_1") if name in names])
+    if "Broker" in names:
+        lf = lf.filter(pl.col("Broker").ne_missing("Total"))
+    return _to_pandas(lf.collect())
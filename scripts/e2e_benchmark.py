@@ -0,0 +1,289 @@
+"""
+End-to-end tier benchmark: run a full tier against the local FronoCloud stand-in and a local sink.
+
+Usage: python -m scripts.e2e_benchmark --tier every2h [--runs 3] [--location kolkata]
+       [--sink parquet] [--rows 200] [--latency-ms 0] [--browser-mode contexts] [--output FILE] [--compare FILE]
+
+Each run is a fresh interpreter calling run_tier_reports. Per run it records wall clock,
+per-report and per-stage seconds, peak RSS of the whole process tree (Python, chromedriver
+and Chrome), the peak number of Chrome processes and user/system CPU time. Results are
+saved as JSON (default benchmarks/e2e_<tier>_<commit>.json); --compare prints the change
+of every median against an earlier file. Exits non-zero if any report failed.
+"""
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+
+from scripts.helper.locations import get_location
+
+
+# Runs in a fresh interpreter so every run pays the same imports and browser start
+PROBE = """
+import json, sys, time
+from scripts.main import run_tier_reports
+started = time.perf_counter()
+results = run_tier_reports(sys.argv[1], sys.argv[2])
+print("E2E_RESULT " + json.dumps({"wall_s": time.perf_counter() - started, "reports": results}, default=str))
+"""
+RESULT_MARKER = "E2E_RESULT "
+SAMPLE_INTERVAL_SECONDS = 0.2
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def _read_processes():
+    """{pid: (comm, ppid, rss_bytes)} for every process in /proc."""
+    processes = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue  # exited while we were listing
+        # comm may contain spaces and parentheses; fields after it are space separated
+        comm = stat[stat.index("(") + 1:stat.rindex(")")]
+        fields = stat[stat.rindex(")") + 2:].split()
+        processes[int(entry)] = (comm, int(fields[1]), int(fields[21]) * PAGE_SIZE)
+    return processes
+
+
+def _tree(root_pid, processes):
+    children = defaultdict(list)
+    for pid, (_, ppid, _) in processes.items():
+        children[ppid].append(pid)
+    pids, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        if pid in processes:
+            pids.append(pid)
+            stack.extend(children[pid])
+    return pids
+
+
+def _is_chrome(comm):
+    comm = comm.lower()
+    return ("chrom" in comm or "headless_shell" in comm) and "chromedriver" not in comm
+
+
+def _sample_tree(root_pid, stop, peaks):
+    while not stop.wait(SAMPLE_INTERVAL_SECONDS):
+        processes = _read_processes()
+        pids = _tree(root_pid, processes)
+        rss = sum(processes[pid][2] for pid in pids)
+        chrome = [pid for pid in pids if _is_chrome(processes[pid][0])]
+        peaks["tree_rss_bytes"] = max(peaks["tree_rss_bytes"], rss)
+        peaks["chrome_processes"] = max(peaks["chrome_processes"], len(chrome))
+        peaks["chrome_rss_bytes"] = max(peaks["chrome_rss_bytes"], sum(processes[pid][2] for pid in chrome))
+
+
+def run_once(tier, location, env):
+    """Run one tier in a child interpreter and measure it; returns the run record."""
+    output_path = os.path.join(env["SCRATCH_ROOT"], "probe_output.log")
+    os.makedirs(env["SCRATCH_ROOT"], exist_ok=True)
+    peaks = {"tree_rss_bytes": 0, "chrome_processes": 0, "chrome_rss_bytes": 0}
+    stop = threading.Event()
+    started = time.perf_counter()
+    with open(output_path, "w") as output:
+        child = subprocess.Popen([sys.executable, "-c", PROBE, tier, location], env=env, stdout=output, stderr=subprocess.STDOUT)
+        sampler = threading.Thread(target=_sample_tree, args=(child.pid, stop, peaks), daemon=True)
+        sampler.start()
+        # wait4 reports CPU of the child and every descendant it reaped (chromedriver, Chrome)
+        _, status, usage = os.wait4(child.pid, 0)
+        child.returncode = os.waitstatus_to_exitcode(status)
+        stop.set()
+        sampler.join()
+    wall_s = time.perf_counter() - started
+
+    with open(output_path) as f:
+        lines = [line for line in f if line.startswith(RESULT_MARKER)]
+    result = json.loads(lines[-1][len(RESULT_MARKER):]) if lines else {"wall_s": None, "reports": {}}
+
+    reports, stages = {}, defaultdict(float)
+    for report, entry in result["reports"].items():
+        report_stages = (entry.get("metrics") or {}).get("stages") or {}
+        reports[report] = {
+            "status": entry.get("status"),
+            "result": entry.get("result"),
+            "duration_s": entry.get("duration_s"),
+            "rows": (entry.get("metrics") or {}).get("rows"),
+            "stages": report_stages,
+        }
+        for stage_name, seconds in report_stages.items():
+            stages[stage_name] += seconds
+
+    return {
+        "exit_code": child.returncode,
+        "wall_s": round(wall_s, 3),
+        "tier_s": round(result["wall_s"], 3) if result["wall_s"] is not None else None,
+        "cpu_user_s": round(usage.ru_utime, 3),
+        "cpu_system_s": round(usage.ru_stime, 3),
+        # ru_maxrss is in KB on Linux and covers the largest single process
+        "max_process_rss_mb": round(usage.ru_maxrss / 1024, 1),
+        "peak_tree_rss_mb": round(peaks["tree_rss_bytes"] / 1024 / 1024, 1),
+        "peak_chrome_rss_mb": round(peaks["chrome_rss_bytes"] / 1024 / 1024, 1),
+        "peak_chrome_processes": peaks["chrome_processes"],
+        "stages": {name: round(seconds, 3) for name, seconds in sorted(stages.items())},
+        "reports": reports,
+        "log": output_path,
+    }
+
+
+def start_standin(port, rows, latency_ms, report_seconds):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "scripts.standin.server", "--port", str(port), "--rows", str(rows),
+         "--latency-ms", str(latency_ms), "--report-seconds", str(report_seconds)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{base_url}/status", timeout=1):
+                return process, base_url
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"FronoCloud stand-in did not start on port {port}")
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _median_summary(runs):
+    """Median, min and max of every numeric run metric, and the median of each stage and report."""
+    summary = {}
+    for key in ("wall_s", "tier_s", "cpu_user_s", "cpu_system_s", "max_process_rss_mb", "peak_tree_rss_mb",
+                "peak_chrome_rss_mb", "peak_chrome_processes"):
+        values = [run[key] for run in runs if run[key] is not None]
+        if values:
+            summary[key] = {"median": round(statistics.median(values), 3), "min": min(values), "max": max(values)}
+    stage_names = sorted({name for run in runs for name in run["stages"]})
+    summary["stages"] = {name: round(statistics.median(run["stages"].get(name, 0.0) for run in runs), 3) for name in stage_names}
+    report_names = sorted({name for run in runs for name in run["reports"]})
+    summary["reports"] = {
+        name: round(statistics.median(run["reports"][name]["duration_s"] or 0.0 for run in runs if name in run["reports"]), 3)
+        for name in report_names
+    }
+    return summary
+
+
+def _print_comparison(summary, baseline):
+    print(f"\n📊 Compared with {baseline.get('commit', '?')} ({baseline.get('created_at', '?')}):")
+    rows = [(key, value["median"], (baseline["summary"].get(key) or {}).get("median")) for key, value in summary.items() if isinstance(value, dict) and "median" in value]
+    rows += [(f"stage {name}", seconds, baseline["summary"].get("stages", {}).get(name)) for name, seconds in summary["stages"].items()]
+    rows += [(f"report {name}", seconds, baseline["summary"].get("reports", {}).get(name)) for name, seconds in summary["reports"].items()]
+    for name, current, previous in rows:
+        if previous:
+            print(f"   {name:40} {previous:>10} -> {current:>10} ({(current - previous) / previous * 100:+.1f}%)")
+        else:
+            print(f"   {name:40} {'-':>10} -> {current:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tier", required=True, choices=["daily", "every2days", "every4h", "every2h"])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--location", default="kolkata")
+    parser.add_argument("--sink", default="parquet", help="OUTPUT_SINKS for the runs (default parquet)")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--base-url", help="Use an already running stand-in instead of starting one")
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    parser.add_argument("--report-seconds", type=float, default=2)
+    parser.add_argument("--browser-mode", choices=["process", "contexts"], default=os.environ.get("BROWSER_MODE", "process"),
+                        help="BROWSER_MODE for the runs: a Chrome per report, or one shared Chrome with a context per report")
+    parser.add_argument("--output")
+    parser.add_argument("--compare", help="Earlier result file to compare the medians against")
+    args = parser.parse_args()
+
+    commit = _git_commit()
+    suffix = "" if args.browser_mode == "process" else f"_{args.browser_mode}"
+    output = args.output or os.path.join("benchmarks", f"e2e_{args.tier}_{commit}{suffix}.json")
+    work_dir = tempfile.mkdtemp(prefix="e2e_benchmark_")
+    location = get_location(args.location)
+
+    standin = None
+    if args.base_url:
+        base_url = args.base_url
+    else:
+        standin, base_url = start_standin(args.port, args.rows, args.latency_ms, args.report_seconds)
+    print(f"🧪 Benchmarking tier '{args.tier}' for {args.location.upper()} against {base_url}, {args.runs} runs (work dir {work_dir})")
+
+    runs = []
+    try:
+        for index in range(args.runs):
+            run_dir = os.path.join(work_dir, f"run-{index + 1}")
+            # Own scratch and state per run so a failed run's checkpoints never resume the next one
+            env = dict(
+                os.environ,
+                FRONO_BASE_URL=base_url,
+                OUTPUT_SINKS=args.sink,
+                LOCAL_STORE_DIR=os.path.join(work_dir, "local_store"),
+                SCRATCH_ROOT=os.path.join(run_dir, "scratch"),
+                RUN_HISTORY_DB_PATH=os.path.join(run_dir, "state", "run_history.sqlite"),
+                FRESHNESS_DB_PATH=os.path.join(run_dir, "state", "freshness.sqlite"),
+                ADAPTIVE_SCHEDULING="0",
+                BROWSER_MODE=args.browser_mode,
+            )
+            env.setdefault(location["username_env"], "benchmark")
+            env.setdefault(location["password_env"], "benchmark")
+            run = run_once(args.tier, args.location, env)
+            runs.append(run)
+            failed = [name for name, report in run["reports"].items() if report["status"] != "success"]
+            print(f"⏱️ run {index + 1}: {run['wall_s']:.1f}s wall, {run['cpu_user_s'] + run['cpu_system_s']:.1f}s CPU, "
+                  f"{run['peak_tree_rss_mb']} MB peak RSS, {run['peak_chrome_processes']} Chrome processes"
+                  + (f", failed: {', '.join(failed)}" if failed else ""))
+    finally:
+        if standin is not None:
+            standin.terminate()
+            standin.wait()
+
+    summary = _median_summary(runs)
+    result = {
+        "tier": args.tier,
+        "location": args.location,
+        "commit": commit,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "settings": {"runs": args.runs, "sink": args.sink, "rows": args.rows, "latency_ms": args.latency_ms,
+                     "report_seconds": args.report_seconds, "base_url": base_url, "browser_mode": args.browser_mode},
+        "summary": summary,
+        "runs": runs,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+
+    print(f"⏱️ median wall clock: {summary['wall_s']['median']}s, CPU user/system: "
+          f"{summary['cpu_user_s']['median']}s/{summary['cpu_system_s']['median']}s")
+    for name, seconds in summary["stages"].items():
+        print(f"   stage {name:30} {seconds:>8}s")
+    print(f"💾 Saved {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            _print_comparison(summary, json.load(f))
+
+    if any(report["status"] != "success" for run in runs for report in run["reports"].values()) or any(run["exit_code"] for run in runs):
+        print("❌ Some reports failed; see the per-run logs")
+        sys.exit(1)
+    print("✅ All reports succeeded")
+
+
+if __name__ == "__main__":
+    main()
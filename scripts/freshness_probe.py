@@ -0,0 +1,56 @@
+import time
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from scripts.helper.browser_manager import create_driver
+from scripts.helper.common_utils import load_credentials, log
+from scripts.helper.fronocloud_login import login
+
+
+# List pages whose newest row and record count reveal whether the data behind a report changed
+PROBE_PAGES = {
+    "sales_invoice": 'a[title="Invoice"][href*="/invoice/view"]',
+    "purchase_invoice": 'a[title="Invoice"][href*="/purchase/view"]',
+    "customer": 'a[title="Customer"][href*="/contact/customer/view"]',
+    "broker": 'a[title="Broker"][href*="/broker/view"]',
+}
+
+# Reads the first data row and the paginator summary ("Showing 1 to 10 of 523 entries")
+READ_SIGNATURE_JS = """
+const row = document.querySelector('table tbody tr');
+const total = document.querySelector('.p-paginator-current');
+return [row ? row.innerText : '', total ? total.innerText : ''].join(' | ');
+"""
+
+
+def probeSources(location, sources):
+    """
+    Log in once and read a cheap signature from each requested list page.
+    Returns {source: signature}; sources that could not be read are left out.
+    """
+    username, password = load_credentials(location)
+    driver = create_driver()
+    signatures = {}
+
+    try:
+        log(f"🔎 Probing freshness for {location.upper()}: {', '.join(sources)}")
+        login(driver, username, password)
+        time.sleep(2)
+        dashboard_url = driver.current_url
+
+        for source in sources:
+            try:
+                driver.get(dashboard_url)
+                element = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, PROBE_PAGES[source])))
+                driver.execute_script("arguments[0].click();", element)
+                WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, "table tbody tr")))
+                signatures[source] = driver.execute_script(READ_SIGNATURE_JS).strip()
+                log(f"🔎 {source}: {signatures[source][:80]}")
+            except Exception as e:
+                log(f"⚠️ Could not probe {source}: {e}")
+
+        return signatures
+
+    finally:
+        driver.quit()
@@ -1,69 +1,47 @@
-import os
 import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
 
 from scripts.df_cleaners.cleaner import modify_gr_report
-from scripts.helper.browser_manager import create_driver
-from scripts.helper.common_utils import ensure_download_path, load_credentials, load_dataframe, log, upload_to_bigquery, wait_for_download
-from scripts.helper.fronocloud_login import login
+from scripts.helper.common_utils import log
+from scripts.helper.metrics import stage
+from scripts.helper.report_engine import register_report, run_report
 
 
-def getGoodsReturn(location):
-    folder = "Frono_Goods_Return_Report"
-    download_path = ensure_download_path(location, folder)
-    username, password = load_credentials(location)
-    driver = create_driver(download_path)
-    actions = ActionChains(driver)
-
-    try:
-        log("Opening FronoCloud login page and logging in...")
-        login(driver, username, password)
+def navigate_goods_return(driver, actions):
+    log("Navigating to 'Goods Return' report...")
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "pn_id_3_7_header"))).click()
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.LINK_TEXT, "GR Customer and Item Wise"))).click()
+    time.sleep(2)
 
-        log("Navigating to 'Goods Return' report...")
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "pn_id_3_7_header"))).click()
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.LINK_TEXT, "GR Customer and Item Wise"))).click()
-        time.sleep(2)
+    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, "09"))).click()
+    time.sleep(1)
+    actions.key_down(Keys.ALT).send_keys('a').key_up(Keys.ALT).perform()
+    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//button[text()='Apply']"))).click()
 
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, "09"))).click()
-        time.sleep(1)
-        actions.key_down(Keys.ALT).send_keys('a').key_up(Keys.ALT).perform()
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//button[text()='Apply']"))).click()
+    time.sleep(1)
+    actions.send_keys(Keys.TAB * 4).perform()
+    driver.execute_script("arguments[0].click();", driver.switch_to.active_element)
+    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//a[text()='This Financial Year']"))).click()
 
-        time.sleep(1)
-        actions.send_keys(Keys.TAB * 4).perform()
-        driver.execute_script("arguments[0].click();", driver.switch_to.active_element)
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//a[text()='This Financial Year']"))).click()
-
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//button[text()=' Search ']"))).click()
+    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//button[text()=' Search ']"))).click()
+    with stage("report_generation"):
         time.sleep(10)
 
-        log("Exporting to Excel...")
-        actions.send_keys(Keys.TAB * 6 + Keys.SPACE).perform()
-
-        downloaded_file = wait_for_download(download_path)
-        log(f"✅ Downloaded file saved as: {downloaded_file}")
+    log("Exporting to Excel...")
+    actions.send_keys(Keys.TAB * 6 + Keys.SPACE).perform()
 
-        df = load_dataframe(downloaded_file)
 
-        df = modify_gr_report(df)
+GOODS_RETURN_REPORT = register_report(
+    report="goods_return",
+    folder="Frono_Goods_Return_Report",
+    navigate=navigate_goods_return,
+    cleaner=modify_gr_report,
+    table_name="goods_return",
+)
 
-        # Upload to BigQuery
-        upload_to_bigquery(df, table_name="goods_return", location=location)
 
-        # Delete file
-        os.remove(downloaded_file)
-        log(f"🗑️ Deleted local file: {downloaded_file}")
-
-        return f"Success"
-
-    except Exception as e:
-        log(f"❌ Error during scraping: {e}")
-        return f"Error: {e}"
-
-    finally:
-        log("Closing browser...")
-        driver.quit()
\ No newline at end of file
+def getGoodsReturn(location):
+    return run_report(location, GOODS_RETURN_REPORT)
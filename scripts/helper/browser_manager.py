@@ -1,26 +1,255 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.support.abstract_event_listener import AbstractEventListener
+from selenium.webdriver.support.event_firing_webdriver import EventFiringWebDriver
+import atexit
+import json
 import os
+import threading
+import urllib.request
 
-def create_driver(download_path=None):
+# Relative import: add_new_item.py loads this module as helper.browser_manager
+from .common_utils import log
+from .tracing import end_span, start_span, tracing_enabled
+
+
+# "process" (default) starts a Chrome for every driver. "contexts" shares one Chrome per process and gives
+# every driver its own browser context (separate cookies, storage and download directory) and page
+BROWSER_MODE = os.environ.get("BROWSER_MODE", "process").lower()
+WINDOW_WIDTH, WINDOW_HEIGHT = 1920, 1080
+
+_shared_browser = None
+_shared_cdp = None
+_shared_lock = threading.Lock()
+
+
+class TracingListener(AbstractEventListener):
+    """Record each selenium step (navigation, find, click, typing, script) as a leaf span."""
+
+    def __init__(self):
+        self._open = []
+
+    def _start(self, name, **attributes):
+        self._open.append(start_span(f"selenium {name}", activate=False, **attributes))
+
+    def _end(self, error=None):
+        if self._open:
+            end_span(self._open.pop(), error=error)
+
+    def before_navigate_to(self, url, driver):
+        self._start("navigate", url=url)
+
+    def after_navigate_to(self, url, driver):
+        self._end()
+
+    def before_find(self, by, value, driver):
+        self._start("find", by=by, selector=value)
+
+    def after_find(self, by, value, driver):
+        self._end()
+
+    def before_click(self, element, driver):
+        self._start("click", tag=element.tag_name)
+
+    def after_click(self, element, driver):
+        self._end()
+
+    def before_change_value_of(self, element, driver):
+        self._start("change_value")
+
+    def after_change_value_of(self, element, driver):
+        self._end()
+
+    def before_execute_script(self, script, driver):
+        self._start("execute_script", script=script[:80])
+
+    def after_execute_script(self, script, driver):
+        self._end()
+
+    def on_exception(self, exception, driver):
+        self._end(error=exception)
+
+
+def _chrome_options():
     options = Options()
     options.add_argument("--headless=new")
-    options.add_argument("--window-size=1920,1080")
+    options.add_argument(f"--window-size={WINDOW_WIDTH},{WINDOW_HEIGHT}")
     options.add_argument("--disable-gpu")
     options.add_argument("--disable-software-rasterizer")
     options.add_argument("--disable-features=VizDisplayCompositor")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
+    return options
+
+
+class BrowserCDP:
+    """
+    One browser-level DevTools connection to the shared Chrome (the webSocketDebuggerUrl of
+    /json/version). Context and download commands go through it instead of a page session;
+    commands are sent one at a time.
+    """
 
-    # Set up download directory
+    def __init__(self, debugger_address):
+        # websocket-client is installed with selenium
+        import websocket
+
+        with urllib.request.urlopen(f"http://{debugger_address}/json/version", timeout=10) as response:
+            url = json.load(response)["webSocketDebuggerUrl"]
+        # No Origin header: Chrome rejects DevTools websockets from origins it was not started to allow
+        self._socket = websocket.create_connection(url, timeout=30, suppress_origin=True)
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def send(self, method, params=None):
+        with self._lock:
+            self._next_id += 1
+            message_id = self._next_id
+            self._socket.send(json.dumps({"id": message_id, "method": method, "params": params or {}}))
+            while True:
+                message = json.loads(self._socket.recv())
+                # Events carry no id; only the reply to this command does
+                if message.get("id") == message_id:
+                    break
+        if "error" in message:
+            raise RuntimeError(f"CDP {method} failed: {message['error'].get('message')}")
+        return message.get("result", {})
+
+    def close(self):
+        try:
+            self._socket.close()
+        except Exception:
+            pass
+
+
+def _quit_shared_browser():
+    global _shared_browser, _shared_cdp
+    with _shared_lock:
+        if _shared_cdp is not None:
+            _shared_cdp.close()
+            _shared_cdp = None
+        if _shared_browser is not None:
+            try:
+                _shared_browser.quit()
+            except Exception:
+                pass
+            _shared_browser = None
+
+
+def _get_shared_browser():
+    """
+    The process-wide Chrome used in contexts mode and its browser-level DevTools connection;
+    (re)started when missing or unresponsive. Call with _shared_lock held.
+    """
+    global _shared_browser, _shared_cdp
+    if _shared_browser is not None:
+        try:
+            _shared_cdp.send("Browser.getVersion")
+            return _shared_browser, _shared_cdp
+        except Exception as e:
+            log(f"⚠️ Shared Chrome stopped responding ({e.__class__.__name__}), restarting it")
+            _shared_cdp.close()
+            try:
+                _shared_browser.quit()
+            except Exception:
+                pass
+            _shared_browser = _shared_cdp = None
+    browser = webdriver.Chrome(options=_chrome_options())
+    try:
+        cdp = BrowserCDP(browser.capabilities["goog:chromeOptions"]["debuggerAddress"])
+    except Exception:
+        browser.quit()
+        raise
+    _shared_browser, _shared_cdp = browser, cdp
+    log(f"🌐 Started shared Chrome at {browser.capabilities['goog:chromeOptions']['debuggerAddress']}")
+    return _shared_browser, _shared_cdp
+
+
+def _dispose_context(context_id):
+    with _shared_lock:
+        if _shared_cdp is None:
+            return
+        try:
+            _shared_cdp.send("Target.disposeBrowserContext", {"browserContextId": context_id})
+        except Exception as e:
+            log(f"⚠️ Could not dispose browser context {context_id}: {e}")
+
+
+class ContextDriver(webdriver.Remote):
+    """
+    A session on the shared Chrome's chromedriver, attached to the shared Chrome, that drives
+    one page of its own browser context. No chromedriver or Chrome process is started per
+    driver. quit() ends the session and disposes the context (closing its page), but leaves
+    the shared Chrome and its chromedriver running for the next driver.
+    """
+
+    def __init__(self, service_url, debugger_address, context_id, target_id):
+        options = Options()
+        options.debugger_address = debugger_address
+        executor = ChromiumRemoteConnection(remote_server_addr=service_url, vendor_prefix="goog", browser_name="chrome")
+        super().__init__(command_executor=executor, options=options)
+        self.browser_context_id = context_id
+        self.switch_to.window(target_id)
+
+    def quit(self):
+        try:
+            super().quit()
+        finally:
+            _dispose_context(self.browser_context_id)
+
+
+def _create_context_driver(download_path=None):
+    with _shared_lock:
+        browser, cdp = _get_shared_browser()
+        address = browser.capabilities["goog:chromeOptions"]["debuggerAddress"]
+        service_url = browser.service.service_url
+        context_id = cdp.send("Target.createBrowserContext", {"disposeOnDetach": False})["browserContextId"]
+        try:
+            target_id = cdp.send("Target.createTarget", {
+                "url": "about:blank",
+                "browserContextId": context_id,
+                "width": WINDOW_WIDTH,
+                "height": WINDOW_HEIGHT,
+            })["targetId"]
+            if download_path:
+                cdp.send("Browser.setDownloadBehavior", {
+                    "behavior": "allow",
+                    "downloadPath": os.path.abspath(download_path),
+                    "browserContextId": context_id,
+                })
+        except Exception:
+            cdp.send("Target.disposeBrowserContext", {"browserContextId": context_id})
+            raise
+
+    try:
+        return ContextDriver(service_url, address, context_id, target_id)
+    except Exception:
+        _dispose_context(context_id)
+        raise
+
+
+def create_driver(download_path=None):
     if download_path:
         os.makedirs(download_path, exist_ok=True)
-        prefs = {
-            "download.default_directory": os.path.abspath(download_path),
-            "download.prompt_for_download": False,
-            "download.directory_upgrade": True,
-            "safebrowsing.enabled": True
-        }
-        options.add_experimental_option("prefs", prefs)
-
-    return webdriver.Chrome(options=options)
+
+    if BROWSER_MODE == "contexts":
+        driver = _create_context_driver(download_path)
+    else:
+        options = _chrome_options()
+        # Set up download directory
+        if download_path:
+            prefs = {
+                "download.default_directory": os.path.abspath(download_path),
+                "download.prompt_for_download": False,
+                "download.directory_upgrade": True,
+                "safebrowsing.enabled": True
+            }
+            options.add_experimental_option("prefs", prefs)
+        driver = webdriver.Chrome(options=options)
+
+    if tracing_enabled():
+        return EventFiringWebDriver(driver, TracingListener())
+    return driver
+
+
+atexit.register(_quit_shared_browser)
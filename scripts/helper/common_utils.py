@@ -1,8 +1,10 @@
 import os
 import time
+import uuid
 import datetime 
-import pandas as pd
-from google.cloud import bigquery
+
+# pandas and google-cloud-bigquery are imported inside the functions that use
+# them so the Flask app and health checks start without loading them.
 
 
 
@@ -32,25 +34,28 @@ def wait_for_download(directory, extension=".xlsx", timeout=30):
         time.sleep(1)
     raise Exception("Download timeout")
 
-def ensure_download_path(location, folder_name):
-    path = os.path.join(os.getcwd(), location, folder_name)
-    os.makedirs(path, exist_ok=True)
-    return path
-
 def load_credentials(location="kolkata"):
-    username = os.environ.get(f"FRONO_{location.upper()}_USERNAME")
-    password = os.environ.get(f"FRONO_{location.upper()}_PASSWORD")
+    from .locations import get_location
+
+    config = get_location(location)
+    username = os.environ.get(config["username_env"])
+    password = os.environ.get(config["password_env"])
     if not username or not password:
         raise EnvironmentError(f"Missing credentials for {location}")
     return username, password
 
-def load_dataframe(file_path):
+def load_dataframe(file_path, data=None):
+    """Parse a .csv/.xlsx export; pass data (the file's bytes) to parse from memory instead of re-reading file_path."""
+    import io
+    import pandas as pd
+
     print(f"📂 Loading file: {file_path}")
 
+    source = io.BytesIO(data) if data is not None else file_path
     if file_path.endswith(".csv"):
-        df = pd.read_csv(file_path)
+        df = pd.read_csv(source)
     elif file_path.endswith(".xlsx"):
-        df = pd.read_excel(file_path, engine="openpyxl")
+        df = pd.read_excel(source, engine="openpyxl")
     else:
         raise ValueError("Unsupported file type. Only .csv and .xlsx are supported.")
 
@@ -59,8 +64,45 @@ def load_dataframe(file_path):
 
 
 
-def infer_bigquery_schema(df, custom_schema_map=None):
+# Resolved schemas keyed by (location, dataset, table) -> (column signature, schema)
+_SCHEMA_CACHE = {}
+
+
+def _is_date_column(series, inferred):
+    """
+    True when any value is a date, like the original per-value check. infer_dtype scans the
+    whole column in C, so only mixed columns ("mixed", "mixed-integer", ...) are checked value by value.
+    """
+    import pandas as pd
+
+    if inferred in ("date", "datetime"):
+        return True
+    if inferred.startswith("mixed"):
+        return bool(series.map(lambda x: isinstance(x, (pd.Timestamp, datetime.date))).any())
+    return False
+
+
+def infer_bigquery_schema(df, custom_schema_map=None, cache_key=None):
     """Generate a BigQuery schema from a DataFrame with optional overrides."""
+    import pandas as pd
+    from google.cloud import bigquery
+
+    # Object columns are keyed by the kind of values they hold, so a column that was all
+    # missing (STRING) is re-inferred once dates arrive
+    inferred = {
+        col: pd.api.types.infer_dtype(df[col], skipna=True)
+        for col, dtype in df.dtypes.items()
+        if pd.api.types.is_object_dtype(dtype) and not (custom_schema_map and col in custom_schema_map)
+    }
+    signature = (
+        tuple((col, str(dtype), inferred.get(col)) for col, dtype in df.dtypes.items()),
+        tuple(sorted(custom_schema_map.items())) if custom_schema_map else (),
+    )
+    if cache_key is not None:
+        cached = _SCHEMA_CACHE.get(cache_key)
+        if cached and cached[0] == signature:
+            return cached[1]
+
     schema = []
     for col in df.columns:
         if custom_schema_map and col in custom_schema_map:
@@ -75,11 +117,14 @@ def infer_bigquery_schema(df, custom_schema_map=None):
                 bq_type = "FLOAT64"
             elif pd.api.types.is_bool_dtype(dtype):
                 bq_type = "BOOL"
-            elif pd.api.types.is_object_dtype(dtype) and df[col].apply(lambda x: isinstance(x, (pd.Timestamp, datetime.date))).any():
+            elif col in inferred and _is_date_column(df[col], inferred[col]):
                 bq_type = "DATE"
             else:
                 bq_type = "STRING"
         schema.append(bigquery.SchemaField(col, bq_type))
+
+    if cache_key is not None:
+        _SCHEMA_CACHE[cache_key] = (signature, schema)
     return schema
 
 
@@ -155,8 +200,132 @@ def infer_bigquery_schema(df, custom_schema_map=None):
 #     job.result()
 #     log(f"✅ Upload complete: {table_id}")
 
-def upload_to_bigquery(df, table_name, dataset_id="frono_2025", location="kolkata", custom_schema_map=None):
-    log(f"Creating BigQuery client...")
+def convert_custom_date_columns(df, custom_schema_map=None):
+    """Convert columns marked as DATE in custom_schema_map to dates; already converted columns are left alone."""
+    if not custom_schema_map:
+        return df
+    import pandas as pd
+
+    for col, col_type in custom_schema_map.items():
+        if col_type == "DATE" and col in df.columns:
+            if pd.api.types.infer_dtype(df[col], skipna=True) == "date":
+                continue
+            try:
+                df[col] = pd.to_datetime(df[col], format="%d-%m-%Y",errors='coerce').dt.date
+                log(f"🗓️ Converted column '{col}' to date (via custom_schema_map)")
+            except Exception as e:
+                log(f"⚠️ Could not convert {col} to date: {str(e)}")
+    return df
+
+
+# "load" uses load jobs, "storage_write" streams Arrow batches through the Storage Write API.
+# When set, it overrides every report's own upload_mode (e.g. BIGQUERY_UPLOAD_MODE=load to roll back);
+# unset, reports use their upload_mode and everything else load jobs
+BIGQUERY_UPLOAD_MODE = os.environ.get("BIGQUERY_UPLOAD_MODE")
+STORAGE_WRITE_BATCH_ROWS = int(os.environ.get("STORAGE_WRITE_BATCH_ROWS", "20000"))
+
+# Standard SQL names and their legacy aliases; other types (NUMERIC, JSON, ...) upload with a load job
+BQ_TO_ARROW_TYPES = {
+    "STRING": ("string",),
+    "INT64": ("int64",),
+    "INTEGER": ("int64",),
+    "FLOAT64": ("float64",),
+    "FLOAT": ("float64",),
+    "BOOL": ("bool_",),
+    "BOOLEAN": ("bool_",),
+    "DATE": ("date32",),
+    "TIMESTAMP": ("timestamp", "us", "UTC"),
+    "DATETIME": ("timestamp", "us"),
+}
+
+
+def unsupported_storage_write_types(schema):
+    """BigQuery types in schema that dataframe_to_arrow cannot map."""
+    return sorted({field.field_type for field in schema if field.field_type.upper() not in BQ_TO_ARROW_TYPES})
+
+
+def dataframe_to_arrow(df, schema):
+    """Convert a DataFrame to an Arrow table matching the given BigQuery schema."""
+    import pyarrow as pa
+
+    fields = []
+    for field in schema:
+        name, *args = BQ_TO_ARROW_TYPES[field.field_type.upper()]
+        fields.append(pa.field(field.name, getattr(pa, name)(*args)))
+    return pa.Table.from_pandas(df, schema=pa.schema(fields), preserve_index=False)
+
+
+def write_with_storage_api(client, df, table_id, schema):
+    """
+    Replace a table through the Storage Write API.
+    Rows are appended to a PENDING stream on a staging table and committed in one
+    batch commit, then the staging table is copied over the target with
+    WRITE_TRUNCATE so readers never see a partially written table.
+    """
+    from google.cloud import bigquery, bigquery_storage_v1
+    from google.cloud.bigquery_storage_v1 import types, writer
+
+    project_id, dataset_id, table_name = table_id.split(".")
+    staging_name = f"{table_name}__staging_{uuid.uuid4().hex[:8]}"
+    staging_id = f"{project_id}.{dataset_id}.{staging_name}"
+
+    # Staging tables expire on their own if the process dies before cleanup
+    staging_table = bigquery.Table(staging_id, schema=schema)
+    staging_table.expires = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+    client.create_table(staging_table)
+
+    try:
+        write_client = bigquery_storage_v1.BigQueryWriteClient()
+        parent = write_client.table_path(project_id, dataset_id, staging_name)
+        write_stream = write_client.create_write_stream(
+            parent=parent,
+            write_stream=types.WriteStream(type_=types.WriteStream.Type.PENDING),
+        )
+
+        arrow_table = dataframe_to_arrow(df, schema)
+
+        request_template = types.AppendRowsRequest()
+        request_template.write_stream = write_stream.name
+        arrow_data = types.AppendRowsRequest.ArrowData()
+        arrow_data.writer_schema = types.ArrowSchema(serialized_schema=arrow_table.schema.serialize().to_pybytes())
+        request_template.arrow_rows = arrow_data
+        append_rows_stream = writer.AppendRowsStream(write_client, request_template)
+
+        futures = []
+        offset = 0
+        for batch in arrow_table.to_batches(max_chunksize=STORAGE_WRITE_BATCH_ROWS):
+            request = types.AppendRowsRequest()
+            request.offset = offset
+            arrow_data = types.AppendRowsRequest.ArrowData()
+            arrow_data.rows = types.ArrowRecordBatch(serialized_record_batch=batch.serialize().to_pybytes())
+            request.arrow_rows = arrow_data
+            futures.append(append_rows_stream.send(request))
+            offset += batch.num_rows
+
+        for future in futures:
+            future.result()
+        append_rows_stream.close()
+
+        write_client.finalize_write_stream(name=write_stream.name)
+        commit_request = types.BatchCommitWriteStreamsRequest(parent=parent, write_streams=[write_stream.name])
+        commit_response = write_client.batch_commit_write_streams(commit_request)
+        if commit_response.stream_errors:
+            raise RuntimeError(f"Storage Write commit failed: {commit_response.stream_errors}")
+        log(f"📨 Committed {offset} rows to staging table: {staging_id}")
+
+        # Atomic swap of the committed rows into the target table
+        copy_config = bigquery.CopyJobConfig(write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE)
+        client.copy_table(staging_id, table_id, job_config=copy_config).result()
+
+    finally:
+        client.delete_table(staging_id, not_found_ok=True)
+
+
+def upload_to_bigquery(df, table_name, dataset_id="frono_2025", location="kolkata", custom_schema_map=None, upload_mode=None):
+    from google.cloud import bigquery
+
+    upload_mode = BIGQUERY_UPLOAD_MODE or upload_mode or "load"
+    log("Creating BigQuery client...")
     client = bigquery.Client()
     project_id = client.project
 
@@ -164,18 +333,10 @@ def upload_to_bigquery(df, table_name, dataset_id="frono_2025", location="kolkat
     table_id = f"{project_id}.{dataset_id}.{prefixed_table_name}"
 
     # ✅ Convert columns marked as DATE in custom_schema_map only
-    if custom_schema_map:
-        for col, col_type in custom_schema_map.items():
-            if col_type == "DATE" and col in df.columns:
-                try:
-                    df[col] = pd.to_datetime(df[col], format="%d-%m-%Y",errors='coerce').dt.date
-                    log(f"🗓️ Converted column '{col}' to date (via custom_schema_map)")
-                except Exception as e:
-                    log(f"⚠️ Could not convert {col} to date: {str(e)}")
-
+    convert_custom_date_columns(df, custom_schema_map)
 
     # ✅ Get schema from helper
-    schema = infer_bigquery_schema(df, custom_schema_map)
+    schema = infer_bigquery_schema(df, custom_schema_map, cache_key=(location.lower(), dataset_id, table_name))
 
     # ✅ Ensure dataset exists
     dataset_ref = bigquery.Dataset(f"{project_id}.{dataset_id}")
@@ -189,6 +350,15 @@ def upload_to_bigquery(df, table_name, dataset_id="frono_2025", location="kolkat
         client.create_dataset(dataset)
         log(f"✅ Created dataset: {dataset_id}")
 
+    unsupported = unsupported_storage_write_types(schema) if upload_mode == "storage_write" else []
+    if unsupported:
+        log(f"⚠️ Storage Write cannot map {', '.join(unsupported)} for {table_id}, using a load job")
+    elif upload_mode == "storage_write":
+        log(f"📤 Streaming {df.shape[0]} rows to table: {table_id}")
+        write_with_storage_api(client, df, table_id, schema)
+        log(f"✅ Upload complete: {table_id}")
+        return
+
     # Upload with custom schema
     job_config = bigquery.LoadJobConfig(
         write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
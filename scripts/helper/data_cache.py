@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import re
+import threading
+
+from scripts.helper.common_utils import log
+
+
+# Set DATA_CACHE_DIR to keep the latest cleaned table of every report as Parquet: <dir>/<location>/<report>.parquet
+# The /data endpoints serve them from memory, reloading a table only when its file changes
+DATA_API_MAX_ROWS = int(os.environ.get("DATA_API_MAX_ROWS", "50000"))
+
+# Filter suffixes for /data query parameters, e.g. ?Item=D1001&Closing__gt=0
+FILTER_OPERATORS = ("eq", "ne", "gt", "gte", "lt", "lte", "contains")
+RESERVED_PARAMS = ("columns", "limit", "offset", "format")
+
+_NAME = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# {path: (version, pyarrow.Table)}
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def get_cache_dir():
+    return os.environ.get("DATA_CACHE_DIR")
+
+
+def cache_enabled():
+    return bool(get_cache_dir())
+
+
+def _table_path(location, report):
+    if not _NAME.match(location) or not _NAME.match(report):
+        raise ValueError(f"Invalid location or report name: {location}/{report}")
+    return os.path.join(get_cache_dir(), location.lower(), f"{report}.parquet")
+
+
+def update_cache(location, report, df):
+    """
+    Replace the cached table of one report with a freshly cleaned frame.
+    Returns the path, or None when the cache is disabled or the write fails: the cache
+    never fails a report run.
+    """
+    if not cache_enabled():
+        return None
+    try:
+        path = _table_path(location, report)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write next to the target and swap so readers never see a half-written file
+        tmp_path = f"{path}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        log(f"🗃️ Cached {df.shape[0]} rows of {report} for /data/{location.lower()}/{report}")
+        return path
+    except Exception as e:
+        log(f"⚠️ Could not cache {report} for the data API: {e}")
+        return None
+
+
+def table_version(location, report):
+    """Version string of a cached table (changes whenever it is rewritten), or None if it is not cached."""
+    try:
+        stat = os.stat(_table_path(location, report))
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def load_table(location, report):
+    """The cached table as a pyarrow Table with its version, or (None, None) if it is not cached."""
+    import pyarrow.parquet as pq
+
+    path = _table_path(location, report)
+    version = table_version(location, report)
+    if version is None:
+        return None, None
+    with _tables_lock:
+        cached = _tables.get(path)
+    if cached and cached[0] == version:
+        return cached[1], version
+    table = pq.read_table(path)
+    with _tables_lock:
+        _tables[path] = (version, table)
+    return table, version
+
+
+def list_cached():
+    """Cached tables as {location, report, version, updated_at}."""
+    root = get_cache_dir()
+    if not root or not os.path.isdir(root):
+        return []
+    tables = []
+    for location in sorted(os.listdir(root)):
+        folder = os.path.join(root, location)
+        if not os.path.isdir(folder):
+            continue
+        for name in sorted(os.listdir(folder)):
+            if not name.endswith(".parquet"):
+                continue
+            report = name[:-len(".parquet")]
+            tables.append({
+                "location": location,
+                "report": report,
+                "version": table_version(location, report),
+                "updated_at": os.path.getmtime(os.path.join(folder, name)),
+            })
+    return tables
+
+
+def etag(version, query):
+    """Strong ETag for one table version and request; query is a list of (key, value) pairs."""
+    digest = hashlib.sha1(version.encode())
+    for key, value in sorted(query):
+        digest.update(f"\0{key}\0{value}".encode())
+    return digest.hexdigest()[:32]
+
+
+def _parse_filter(key):
+    name, _, operator = key.rpartition("__")
+    if name and operator in FILTER_OPERATORS:
+        return name, operator
+    return key, "eq"
+
+
+def _values(values, column_type):
+    """Query parameter values cast to a column's type."""
+    import pyarrow as pa
+
+    return pa.array(values, pa.string()).cast(column_type)
+
+
+def query_table(table, args):
+    """
+    Filter, project and page a cached table by /data query parameters (a werkzeug MultiDict).
+    Repeated equality filters match any of the values. Range filters (gt, gte, lt, lte) compare
+    dates and timestamps in their own type and everything else as numbers.
+    Returns (page, number of matching rows). Raises ValueError for unknown columns, operators,
+    values that do not fit the column type, or range filters on columns that are not numeric.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    mask = None
+    for key in args:
+        if key in RESERVED_PARAMS:
+            continue
+        name, operator = _parse_filter(key)
+        if name not in table.column_names:
+            raise ValueError(f"Unknown column: {name}")
+        column = table[name]
+        values = args.getlist(key)
+        try:
+            if operator == "eq":
+                condition = pc.is_in(column, value_set=_values(values, column.type))
+            elif operator == "ne":
+                condition = pc.invert(pc.is_in(column, value_set=_values(values, column.type)))
+            elif operator == "contains":
+                condition = pc.match_substring(column.cast(pa.string()), values[0], ignore_case=True)
+            else:
+                compare = {"gt": pc.greater, "gte": pc.greater_equal, "lt": pc.less, "lte": pc.less_equal}[operator]
+                if pa.types.is_temporal(column.type):
+                    condition = compare(column, _values(values[:1], column.type)[0])
+                else:
+                    # Numbers, also when cleaned as text: comparing strings would put "9" after "10"
+                    condition = compare(pc.cast(column, pa.float64()), pa.scalar(float(values[0]), pa.float64()))
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, ValueError) as e:
+            raise ValueError(f"Invalid filter {key}={values}: {e}") from e
+        condition = pc.fill_null(condition, False)
+        mask = condition if mask is None else pc.and_(mask, condition)
+
+    if mask is not None:
+        table = table.filter(mask)
+    if args.get("columns"):
+        columns = [name.strip() for name in args["columns"].split(",") if name.strip()]
+        unknown = [name for name in columns if name not in table.column_names]
+        if unknown:
+            raise ValueError(f"Unknown column(s): {', '.join(unknown)}")
+        table = table.select(columns)
+
+    try:
+        offset = max(0, int(args.get("offset", 0)))
+        limit = min(DATA_API_MAX_ROWS, int(args.get("limit", DATA_API_MAX_ROWS)))
+    except ValueError as e:
+        raise ValueError(f"limit and offset must be integers: {e}") from e
+    return table.slice(offset, max(0, limit)), table.num_rows
+
+
+def to_records(table):
+    """Rows of a table as JSON-ready dicts (dates as ISO strings, missing values as None)."""
+    return json.loads(table.to_pandas().to_json(orient="records", date_format="iso"))
+
+
+def to_arrow_ipc(table):
+    """A table as Arrow IPC stream bytes."""
+    import pyarrow as pa
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
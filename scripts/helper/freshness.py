@@ -0,0 +1,79 @@
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+
+FRESHNESS_DB_PATH = os.environ.get("FRESHNESS_DB_PATH", os.path.join(os.getcwd(), "state", "freshness.sqlite"))
+
+# Upper bound on how long a report may be skipped because its probes did not change
+MAX_STALENESS_SECONDS = {
+    "daily": 2 * 24 * 3600,
+    "every2days": 4 * 24 * 3600,
+    "every4h": 12 * 3600,
+    "every2h": 6 * 3600,
+}
+DEFAULT_MAX_STALENESS_SECONDS = 24 * 3600
+
+
+def adaptive_scheduling_enabled():
+    return os.environ.get("ADAPTIVE_SCHEDULING", "").lower() in ("1", "true", "yes")
+
+
+def get_max_staleness(tier):
+    override = os.environ.get("FRESHNESS_MAX_STALENESS_SECONDS")
+    if override:
+        return int(override)
+    return MAX_STALENESS_SECONDS.get(tier, DEFAULT_MAX_STALENESS_SECONDS)
+
+
+def _connect():
+    os.makedirs(os.path.dirname(FRESHNESS_DB_PATH), exist_ok=True)
+    con = sqlite3.connect(FRESHNESS_DB_PATH, timeout=30)
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS freshness ("
+        " location TEXT NOT NULL,"
+        " report TEXT NOT NULL,"
+        " signature TEXT NOT NULL,"
+        " last_run_at REAL NOT NULL,"
+        " PRIMARY KEY (location, report))"
+    )
+    return con
+
+
+def build_signature(sources, probe_results):
+    """Combine the probe values a report depends on; None if any of them is missing."""
+    if not sources or any(source not in probe_results for source in sources):
+        return None
+    return " || ".join(f"{source}={probe_results[source]}" for source in sorted(sources))
+
+
+def should_run(location, report, signature, max_staleness):
+    """Returns (run, reason) by comparing the probe signature with the one seen at the last successful run."""
+    if signature is None:
+        return True, "no probe"
+    with closing(_connect()) as con:
+        row = con.execute(
+            "SELECT signature, last_run_at FROM freshness WHERE location = ? AND report = ?",
+            (location.lower(), report),
+        ).fetchone()
+    if row is None:
+        return True, "never run"
+    last_signature, last_run_at = row
+    if last_signature != signature:
+        return True, "data changed"
+    age = time.time() - last_run_at
+    if age >= max_staleness:
+        return True, f"stale ({age / 3600:.1f}h old)"
+    return False, f"unchanged since last run {age / 60:.0f} min ago"
+
+
+def record_success(location, report, signature):
+    if signature is None:
+        return
+    with closing(_connect()) as con:
+        con.execute(
+            "INSERT OR REPLACE INTO freshness (location, report, signature, last_run_at) VALUES (?, ?, ?, ?)",
+            (location.lower(), report, signature, time.time()),
+        )
+        con.commit()
@@ -1,9 +1,17 @@
+import os
+
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+
+def get_base_url():
+    """FronoCloud root URL; point FRONO_BASE_URL at the local stand-in (scripts/standin) for offline runs."""
+    return os.environ.get("FRONO_BASE_URL", "https://fronocloud.com").rstrip("/")
+
+
 def login(driver, username, password):
-    driver.get("https://fronocloud.com/login")
+    driver.get(f"{get_base_url()}/login")
     WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.NAME, "userName"))).send_keys(username)
     WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.NAME, "password"))).send_keys(password + Keys.RETURN)
@@ -0,0 +1,79 @@
+import time
+
+# Relative imports: add_new_item.py loads helpers as the top-level "helper" package
+from .item_master import normalize_design
+
+
+# Item master columns that may hold an item's category
+CATEGORY_COLUMNS = ["Category", "Item Category", "Product Category"]
+
+
+def _row_category(row):
+    for column in CATEGORY_COLUMNS:
+        if row.get(column):
+            return row[column].strip()
+    return None
+
+
+def designs_to_read(sheet_items, item_master, attributes, category, read_failures, retry_seconds, now=None):
+    """
+    Designs worth reading from their edit form before diffing: those about to be updated from an
+    unverified baseline (a wrong baseline would untick existing sizes). Designs whose form could
+    not be read within the last retry_seconds (read_failures, {design_no: failed_at}) are skipped.
+    """
+    now = time.time() if now is None else now
+    designs = []
+    for op in diff_items(sheet_items, item_master, attributes, category):
+        if op["op"] != "update" or not op["baseline"]:
+            continue
+        failed_at = read_failures.get(normalize_design(op["design"]))
+        if failed_at is not None and now - failed_at < retry_seconds:
+            continue
+        designs.append(op["design"])
+    return designs
+
+
+def diff_items(sheet_items, item_master, attributes, category):
+    """
+    Compare merged sheet items with the item master and the attributes last applied to each design.
+    Returns one op per item:
+      {"op": "create", "design", "item"}                   design missing from the item master
+      {"op": "update", "design", "item", "add_colors", "add_sizes", "category", "known_sizes", "baseline"}
+                                                           only the fields that differ; colors and sizes are only added
+      {"op": "unchanged", "design", "item", "baseline"}    nothing to do
+    baseline is True when no verified attributes are recorded for an existing design (its edit
+    form could not be read, see designs_to_read): its recorded or sheet colors and sizes are
+    taken as current and only later sheet changes produce updates.
+    """
+    ops = []
+    for item in sheet_items:
+        design = item['Design No.']
+        key = normalize_design(design)
+        if key not in item_master:
+            ops.append({"op": "create", "design": design, "item": item})
+            continue
+
+        known = attributes.get(key)
+        baseline = known is None or not known.get("Verified")
+        known = known or {"Colors": item['Colors'], "Sizes": item['Sizes'], "Category": None}
+        known_colors = {color.upper() for color in known["Colors"]}
+        add_colors = [color for color in item['Colors'] if color.upper() not in known_colors]
+        add_sizes = [size for size in item['Sizes'] if size not in set(known["Sizes"])]
+
+        current_category = known.get("Category") or _row_category(item_master[key])
+        new_category = category if current_category and current_category.lower() != category.strip().lower() else None
+
+        if add_colors or add_sizes or new_category:
+            ops.append({
+                "op": "update",
+                "design": design,
+                "item": item,
+                "add_colors": add_colors,
+                "add_sizes": add_sizes,
+                "category": new_category,
+                "known_sizes": list(known["Sizes"]),
+                "baseline": baseline,
+            })
+        else:
+            ops.append({"op": "unchanged", "design": design, "item": item, "baseline": baseline})
+    return ops
@@ -0,0 +1,220 @@
+import json
+import os
+import time
+
+from selenium.webdriver.common.by import By
+
+# Relative imports: add_new_item.py loads helpers as the top-level "helper" package
+from .common_utils import log
+
+
+ITEM_MASTER_CACHE_DIR = os.environ.get("ITEM_MASTER_CACHE_DIR", os.path.join(os.getcwd(), "state"))
+# How long an exported item master is trusted before the item list is read again
+ITEM_MASTER_TTL_SECONDS = int(os.environ.get("ITEM_MASTER_TTL_SECONDS", "3600"))
+# Colors, sizes and category applied to each design are not in the Items table and cost one
+# edit-form read per design to recover, so point this at a persistent volume (e.g. a Cloud
+# Storage volume mount on Cloud Run) rather than the instance's disk
+ITEM_ATTRIBUTES_DIR = os.environ.get("ITEM_ATTRIBUTES_DIR", ITEM_MASTER_CACHE_DIR)
+ITEM_TABLE_ID = "pn_id_3-table"
+# Headers tried in order for the column holding the design number
+DESIGN_COLUMN_HEADERS = ["product code", "item code", "design no.", "design no", "code", "product name", "item name", "name"]
+MAX_PAGES = 1000
+
+# One call per page: header texts plus every cell of every row
+READ_TABLE_JS = """
+const table = document.getElementById(arguments[0]);
+if (!table) { return null; }
+const text = el => (el.innerText || el.textContent || '').trim();
+const next = document.querySelector('.p-paginator-next');
+return {
+    headers: Array.from(table.querySelectorAll('thead th')).map(text),
+    rows: Array.from(table.querySelectorAll('tbody tr')).map(tr => Array.from(tr.querySelectorAll('td')).map(text)),
+    page: text(document.querySelector('.p-paginator-current') || document.body).slice(0, 200),
+    has_next: !!next && !next.disabled && !next.classList.contains('p-disabled'),
+};
+"""
+
+
+def normalize_design(design_no):
+    return str(design_no).strip().upper()
+
+
+def _cache_path(location):
+    return os.path.join(ITEM_MASTER_CACHE_DIR, f"item_master_{location.lower()}.json")
+
+
+def _design_column(headers):
+    lowered = [header.lower() for header in headers]
+    for candidate in DESIGN_COLUMN_HEADERS:
+        if candidate in lowered:
+            return lowered.index(candidate)
+    return None
+
+
+def _show_largest_page(driver):
+    """Switch the paginator to its largest rows-per-page option so fewer pages are read."""
+    try:
+        driver.find_element(By.CSS_SELECTOR, ".p-paginator-rpp-options").click()
+        options = driver.find_elements(By.CSS_SELECTOR, ".p-dropdown-item, .p-select-option")
+        if options:
+            options[-1].click()
+            time.sleep(1)
+    except Exception as e:
+        log(f"⚠️ Could not change rows per page, reading default pages: {e.__class__.__name__}")
+
+
+def export_item_master(driver):
+    """
+    Read the whole item list (the driver must be on the Items page) into
+    {design_no: {column: value}}, keyed by the design column. Raises when no known
+    design header is found: the export cannot tell which cell is the design, so callers
+    fall back to searching designs one by one.
+    """
+    started = time.time()
+    _show_largest_page(driver)
+    items, last_page = {}, None
+    for _ in range(MAX_PAGES):
+        page = driver.execute_script(READ_TABLE_JS, ITEM_TABLE_ID)
+        if page is None:
+            raise RuntimeError(f"Item table '{ITEM_TABLE_ID}' not found")
+        headers = page["headers"]
+        column = _design_column(headers)
+        if column is None:
+            raise RuntimeError(f"No design column in item table headers {headers}")
+        for cells in page["rows"]:
+            if column < len(cells) and cells[column]:
+                items[normalize_design(cells[column])] = dict(zip(headers, cells))
+        if not page["has_next"] or page["page"] == last_page:
+            break
+        last_page = page["page"]
+        driver.find_element(By.CSS_SELECTOR, ".p-paginator-next").click()
+        time.sleep(0.5)
+    log(f"📇 Exported item master: {len(items)} designs in {time.time() - started:.1f}s")
+    return items
+
+
+def _load_cache(location):
+    path = _cache_path(location)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError) as e:
+        log(f"⚠️ Ignoring unreadable item master cache {path}: {e}")
+        return None
+    age = time.time() - cache.get("exported_at", 0)
+    if age > ITEM_MASTER_TTL_SECONDS:
+        return None
+    return cache
+
+
+def _save_cache(location, cache):
+    path = _cache_path(location)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+
+def get_item_master(driver, location, refresh=False):
+    """
+    In-memory index of the item master, {design_no: row}, from the TTL cache or a fresh export.
+    The driver must be logged in and on the Items page when an export is needed.
+    """
+    cache = None if refresh else _load_cache(location)
+    if cache is not None:
+        age = time.time() - cache["exported_at"]
+        log(f"♻️ Using item master cached {age / 60:.0f} min ago ({len(cache['items'])} designs)")
+    else:
+        cache = {"exported_at": time.time(), "items": export_item_master(driver)}
+        _save_cache(location, cache)
+    return cache["items"]
+
+
+def remember_items(location, items):
+    """Add items created in this run to the cached index ({design_no: row}), keeping its export time."""
+    cache = _load_cache(location)
+    if cache is None or not items:
+        return
+    cache["items"].update({normalize_design(design): row for design, row in items.items()})
+    _save_cache(location, cache)
+
+
+def _attributes_path(location):
+    return os.path.join(ITEM_ATTRIBUTES_DIR, f"item_attributes_{location.lower()}.json")
+
+
+def load_item_attributes(location):
+    """
+    Colors, sizes and category of each design, {design_no: {"Colors", "Sizes", "Category", "Verified"}}.
+    Verified records were read from the design's edit form (ITEM_ATTRIBUTE_READBACK) or applied on
+    top of such a read (or created by this script); unverified ones assume the sheet values were current.
+    Kept separately from the item master cache (the Items table does not show them) and without a TTL.
+    """
+    path = _attributes_path(location)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        log(f"⚠️ Ignoring unreadable item attributes {path}: {e}")
+        return {}
+
+
+def _read_failures_path(location):
+    return os.path.join(ITEM_ATTRIBUTES_DIR, f"item_attribute_reads_{location.lower()}.json")
+
+
+def load_read_failures(location):
+    """When each design's edit form last failed to read, {design_no: failed_at}."""
+    path = _read_failures_path(location)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        log(f"⚠️ Ignoring unreadable item attribute read failures {path}: {e}")
+        return {}
+
+
+def remember_read_failures(location, designs):
+    """Record designs whose edit form could not be read, so they are not read again every run."""
+    if not designs:
+        return
+    failures = load_read_failures(location)
+    now = time.time()
+    failures.update({normalize_design(design): now for design in designs})
+    _write_json(_read_failures_path(location), failures)
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def remember_item_attributes(location, attributes):
+    """
+    Merge {design_no: {"Colors", "Sizes", "Category", "Verified"}} into the stored attributes; colors
+    and sizes only grow. A verified record replaces an unverified one instead of growing it.
+    """
+    if not attributes:
+        return
+    stored = load_item_attributes(location)
+    for design, new in attributes.items():
+        key = normalize_design(design)
+        if new.get("Verified") and not stored.get(key, {}).get("Verified"):
+            stored.pop(key, None)
+        current = stored.setdefault(key, {"Colors": [], "Sizes": [], "Category": None, "Verified": False})
+        current["Verified"] = bool(current.get("Verified") or new.get("Verified"))
+        current["Colors"] = sorted(set(current["Colors"]) | {color.upper() for color in new.get("Colors", [])})
+        current["Sizes"] = sorted(set(current["Sizes"]) | set(new.get("Sizes", [])))
+        if new.get("Category"):
+            current["Category"] = new["Category"]
+    _write_json(_attributes_path(location), stored)
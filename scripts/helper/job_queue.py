@@ -0,0 +1,208 @@
+import copy
+import datetime
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from scripts.helper.common_utils import log
+from scripts.helper.leases import (
+    LEASE_TTL_SECONDS,
+    acquire_lease,
+    location_lease_key,
+    release_lease,
+    renew_lease,
+    tier_lease_key,
+    wait_for_lease,
+)
+from scripts.helper.tracing import span
+
+
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+# Finished jobs kept in memory for /jobs lookups
+MAX_FINISHED_JOBS = int(os.environ.get("MAX_FINISHED_JOBS", "200"))
+# How long a job waits for another job to release a location before giving up on it
+LOCATION_WAIT_TIMEOUT = int(os.environ.get("LOCATION_WAIT_TIMEOUT", "7200"))
+
+_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="tier-job")
+_jobs = {}
+_lock = threading.Lock()
+
+# Leases held by queued/running jobs in this process, renewed by a heartbeat thread
+_held_leases = {}
+_heartbeat = None
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+
+
+def _prune_finished_jobs():
+    finished = [job_id for job_id, job in _jobs.items() if job["finished_at"]]
+    for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+        del _jobs[job_id]
+
+
+def _hold(job_id, key):
+    with _lock:
+        _held_leases.setdefault(job_id, set()).add(key)
+
+
+def _release(job_id, key):
+    with _lock:
+        _held_leases.get(job_id, set()).discard(key)
+    release_lease(key, job_id)
+
+
+def _renew_held_leases():
+    while True:
+        time.sleep(LEASE_TTL_SECONDS / 3)
+        with _lock:
+            held = [(job_id, key) for job_id, keys in _held_leases.items() for key in keys]
+        for job_id, key in held:
+            try:
+                if not renew_lease(key, job_id):
+                    log(f"⚠️ Job {job_id} lost lease '{key}'")
+            except Exception as e:
+                log(f"⚠️ Could not renew lease '{key}': {e}")
+
+
+def _ensure_heartbeat():
+    global _heartbeat
+    with _lock:
+        if _heartbeat is None:
+            _heartbeat = threading.Thread(target=_renew_held_leases, name="lease-heartbeat", daemon=True)
+            _heartbeat.start()
+
+
+def submit_job(tier, locations, runner):
+    """
+    Queue a tier run and return a snapshot of the job immediately.
+    runner(tier, location, on_update=...) is executed on the worker pool for each location.
+
+    Locations whose tier is already queued or running (in any process sharing the
+    lease database) are not run again; the trigger attaches to the existing job.
+    """
+    _ensure_heartbeat()
+    job_id = uuid.uuid4().hex
+    own_locations, attached_to = [], {}
+    for location in locations:
+        key = tier_lease_key(tier, location)
+        holder = acquire_lease(key, job_id)
+        if holder == job_id:
+            _hold(job_id, key)
+            own_locations.append(location)
+        else:
+            attached_to[location] = holder
+
+    if not own_locations:
+        existing_id = attached_to[locations[0]]
+        log(f"🔗 Tier '{tier}' already running for {', '.join(locations)}; attaching to job {existing_id}")
+        with _lock:
+            existing = copy.deepcopy(_jobs.get(existing_id)) or {"id": existing_id, "tier": tier, "status": "running"}
+        existing["coalesced"] = True
+        existing["attached_to"] = attached_to
+        return existing
+
+    job = {
+        "id": job_id,
+        "tier": tier,
+        "locations": own_locations,
+        "status": "queued",
+        "coalesced": False,
+        "attached_to": attached_to,
+        "created_at": _now(),
+        "started_at": None,
+        "finished_at": None,
+        "duration_s": None,
+        "error": None,
+        "reports": {location: {} for location in own_locations},
+    }
+    with _lock:
+        _jobs[job_id] = job
+        _prune_finished_jobs()
+        snapshot = copy.deepcopy(job)
+
+    _executor.submit(_run_job, job_id, runner)
+    log(f"🧾 Queued job {job_id} for tier '{tier}' ({', '.join(own_locations)})")
+    if attached_to:
+        log(f"🔗 Already running elsewhere: {attached_to}")
+    return snapshot
+
+
+def _update_report(job_id, location, report, entry):
+    with _lock:
+        _jobs[job_id]["reports"][location][report] = entry
+
+
+def _set_status(job_id, status):
+    with _lock:
+        _jobs[job_id]["status"] = status
+
+
+def _run_location(job_id, tier, location, runner):
+    """Run one location of a job while holding its location lease, so tiers never drive the same account at once."""
+    tier_key, location_key = tier_lease_key(tier, location), location_lease_key(location)
+    try:
+        _set_status(job_id, "waiting")
+        if not wait_for_lease(location_key, job_id, timeout=LOCATION_WAIT_TIMEOUT):
+            raise TimeoutError(f"Timed out waiting for location '{location}' to become free")
+        # Heartbeat the lease only once it is ours, or the heartbeat reports it as lost while waiting
+        _hold(job_id, location_key)
+        _set_status(job_id, "running")
+        runner(tier, location,
+               on_update=lambda report, entry: _update_report(job_id, location, report, entry))
+    finally:
+        _release(job_id, location_key)
+        _release(job_id, tier_key)
+
+
+def _run_job(job_id, runner):
+    with _lock:
+        job = _jobs[job_id]
+        job["status"] = "running"
+        job["started_at"] = _now()
+        tier, locations = job["tier"], list(job["locations"])
+
+    started = time.perf_counter()
+    errors = []
+    with span(f"tier {tier}", tier=tier, job_id=job_id, locations=",".join(locations)):
+        for location in locations:
+            try:
+                _run_location(job_id, tier, location, runner)
+            except Exception as e:
+                log(f"❌ Job {job_id} failed for {location}: {e}")
+                errors.append(f"{location}: {e}")
+
+    with _lock:
+        job = _jobs[job_id]
+        _held_leases.pop(job_id, None)
+        if errors:
+            status = "failed"
+        elif any(entry.get("status") == "error" for reports in job["reports"].values() for entry in reports.values()):
+            status = "completed_with_errors"
+        else:
+            status = "succeeded"
+        job.update({
+            "status": status,
+            "error": "; ".join(errors) or None,
+            "finished_at": _now(),
+            "duration_s": round(time.perf_counter() - started, 2),
+        })
+    log(f"🏁 Job {job_id} finished: {status}")
+
+
+def get_job(job_id):
+    with _lock:
+        job = _jobs.get(job_id)
+        return copy.deepcopy(job) if job else None
+
+
+def list_jobs(limit=50):
+    with _lock:
+        jobs = list(_jobs.values())[-limit:]
+        return [
+            {key: job[key] for key in ("id", "tier", "locations", "status", "attached_to", "created_at", "finished_at", "duration_s")}
+            for job in reversed(jobs)
+        ]
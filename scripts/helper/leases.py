@@ -0,0 +1,97 @@
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from scripts.helper.common_utils import log
+
+
+LEASE_DB_PATH = os.environ.get("LEASE_DB_PATH", os.path.join(os.getcwd(), "state", "leases.sqlite"))
+# A lease not renewed within this window is treated as abandoned (crashed run)
+LEASE_TTL_SECONDS = int(os.environ.get("LEASE_TTL_SECONDS", "900"))
+LEASE_POLL_SECONDS = 5
+
+
+def _connect():
+    os.makedirs(os.path.dirname(LEASE_DB_PATH), exist_ok=True)
+    con = sqlite3.connect(LEASE_DB_PATH, timeout=30, isolation_level=None)
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS leases ("
+        " key TEXT PRIMARY KEY,"
+        " owner TEXT NOT NULL,"
+        " acquired_at REAL NOT NULL,"
+        " expires_at REAL NOT NULL)"
+    )
+    return con
+
+
+def tier_lease_key(tier, location):
+    return f"tier:{tier}:{location.lower()}"
+
+
+def location_lease_key(location):
+    return f"location:{location.lower()}"
+
+
+def acquire_lease(key, owner, ttl=None):
+    """
+    Try to take the lease on key for owner.
+    Returns the owner holding the lease afterwards: owner itself when acquired
+    (or already held), otherwise the live holder. Expired leases are taken over.
+    """
+    ttl = ttl or LEASE_TTL_SECONDS
+    now = time.time()
+    with closing(_connect()) as con:
+        con.execute("BEGIN IMMEDIATE")
+        row = con.execute("SELECT owner, expires_at FROM leases WHERE key = ?", (key,)).fetchone()
+        if row and row[0] != owner and row[1] > now:
+            con.execute("COMMIT")
+            return row[0]
+        if row and row[0] != owner:
+            log(f"⌛ Lease '{key}' held by {row[0]} expired, taking over")
+        con.execute(
+            "INSERT OR REPLACE INTO leases (key, owner, acquired_at, expires_at) VALUES (?, ?, ?, ?)",
+            (key, owner, now, now + ttl),
+        )
+        con.execute("COMMIT")
+    return owner
+
+
+def renew_lease(key, owner, ttl=None):
+    """Extend a held lease. Returns False if owner no longer holds it."""
+    ttl = ttl or LEASE_TTL_SECONDS
+    with closing(_connect()) as con:
+        cursor = con.execute(
+            "UPDATE leases SET expires_at = ? WHERE key = ? AND owner = ?",
+            (time.time() + ttl, key, owner),
+        )
+        return cursor.rowcount == 1
+
+
+def release_lease(key, owner):
+    with closing(_connect()) as con:
+        con.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, owner))
+
+
+def wait_for_lease(key, owner, ttl=None, timeout=None):
+    """Block until owner holds the lease on key. Returns False if timeout (seconds) elapses first."""
+    deadline = time.time() + timeout if timeout else None
+    holder = acquire_lease(key, owner, ttl)
+    if holder != owner:
+        log(f"⏳ Waiting for lease '{key}' held by {holder}...")
+    while holder != owner:
+        if deadline and time.time() >= deadline:
+            return False
+        time.sleep(LEASE_POLL_SECONDS)
+        holder = acquire_lease(key, owner, ttl)
+    return True
+
+
+def list_leases():
+    with closing(_connect()) as con:
+        rows = con.execute("SELECT key, owner, acquired_at, expires_at FROM leases ORDER BY key").fetchall()
+    now = time.time()
+    return [
+        {"key": key, "owner": owner, "acquired_at": acquired_at, "expires_in_s": round(expires_at - now, 1)}
+        for key, owner, acquired_at, expires_at in rows
+    ]
@@ -0,0 +1,66 @@
+import json
+import os
+import threading
+
+
+LOCATIONS_CONFIG_PATH = os.environ.get("LOCATIONS_CONFIG_PATH", os.path.join(os.getcwd(), "config", "locations.json"))
+# Used when no config file exists, matching the branches the service started with
+DEFAULT_LOCATIONS = ["kolkata", "surat"]
+
+_cache = {"mtime": None, "locations": None}
+_cache_lock = threading.Lock()
+
+
+def _with_defaults(entry):
+    """Fill in the conventional credential env names and an empty dataset mapping."""
+    if isinstance(entry, str):
+        entry = {"name": entry}
+    name = entry["name"].lower()
+    return {
+        "name": name,
+        "username_env": entry.get("username_env") or f"FRONO_{name.upper()}_USERNAME",
+        "password_env": entry.get("password_env") or f"FRONO_{name.upper()}_PASSWORD",
+        # Report dataset -> dataset used for this location, e.g. {"frono_2025": "frono_2025_pune"}
+        "datasets": entry.get("datasets") or {},
+        "enabled": entry.get("enabled", True),
+    }
+
+
+def load_locations():
+    """
+    Read the location config, re-reading it when the file changes.
+    Returns {name: {name, username_env, password_env, datasets, enabled}} in config order.
+    """
+    try:
+        mtime = os.path.getmtime(LOCATIONS_CONFIG_PATH)
+    except OSError:
+        mtime = None
+    with _cache_lock:
+        if _cache["locations"] is not None and _cache["mtime"] == mtime:
+            return _cache["locations"]
+        if mtime is None:
+            entries = DEFAULT_LOCATIONS
+        else:
+            with open(LOCATIONS_CONFIG_PATH) as f:
+                entries = json.load(f)["locations"]
+        locations = {}
+        for entry in entries:
+            location = _with_defaults(entry)
+            locations[location["name"]] = location
+        _cache.update(mtime=mtime, locations=locations)
+        return locations
+
+
+def get_location_names():
+    """Names of the enabled locations, in config order."""
+    return [name for name, location in load_locations().items() if location["enabled"]]
+
+
+def get_location(name):
+    """Config for one location; unknown locations get the conventional defaults."""
+    return load_locations().get(name.lower()) or _with_defaults(name)
+
+
+def resolve_dataset(location, dataset_id):
+    """Dataset a report writes to for this location (identity unless the config remaps it)."""
+    return get_location(location)["datasets"].get(dataset_id, dataset_id)
@@ -0,0 +1,188 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from scripts.helper.tracing import end_span, start_span
+
+
+# Report run being recorded in the current thread (set by track_report)
+_current_run = contextvars.ContextVar("current_report_run", default=None)
+# Optional list that finished run records are appended to (set by collect_report_runs)
+_collector = contextvars.ContextVar("report_run_collector", default=None)
+
+_lock = threading.Lock()
+_stage_totals = {}   # (location, report, stage) -> {"count", "sum", "last"}
+_last_runs = {}      # (location, report) -> last finished run record
+_run_counts = {}     # (location, report, outcome) -> count
+
+
+def _now():
+    return time.time()
+
+
+@contextmanager
+def track_report(location, report):
+    """Record stage timings and data stats of one report run; published when the block exits."""
+    record = {
+        "location": location.lower(),
+        "report": report,
+        "started_at": _now(),
+        "finished_at": None,
+        "duration_s": None,
+        "outcome": None,
+        "attempts": 0,
+        "stages": {},
+        "rows": None,
+        "columns": None,
+        "bytes": None,
+        "error": None,
+        "_stack": [],
+    }
+    token = _current_run.set(record)
+    report_span = start_span(f"report {report}", location=record["location"], report=report)
+    started = time.perf_counter()
+    try:
+        yield record
+    finally:
+        _current_run.reset(token)
+        record.pop("_stack", None)
+        record["finished_at"] = _now()
+        record["duration_s"] = round(time.perf_counter() - started, 3)
+        if report_span is not None:
+            report_span["attributes"].update({
+                key: record[key] for key in ("outcome", "attempts", "rows", "columns", "bytes") if record[key] is not None
+            })
+        end_span(report_span, error=record["error"])
+        _publish(record)
+        collector = _collector.get()
+        if collector is not None:
+            collector.append(record)
+
+
+@contextmanager
+def stage(name):
+    """
+    Time a stage of the current report run (and trace it as a span). Nested
+    stages are exclusive: time spent in an inner stage is not counted again
+    for the outer one. Does nothing outside track_report.
+    """
+    record = _current_run.get()
+    if record is None:
+        yield
+        return
+
+    frame = {"name": name, "children": 0.0}
+    record["_stack"].append(frame)
+    stage_span = start_span(f"stage {name}", stage=name)
+    started = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        end_span(stage_span, error=error)
+        record["_stack"].pop()
+        record["stages"][name] = round(record["stages"].get(name, 0.0) + elapsed - frame["children"], 3)
+        if record["_stack"]:
+            record["_stack"][-1]["children"] += elapsed
+
+
+def set_report_stats(**stats):
+    """Attach rows/columns/bytes (or other values) to the current report run."""
+    record = _current_run.get()
+    if record is not None:
+        record.update(stats)
+
+
+def current_report_run():
+    return _current_run.get()
+
+
+def current_stage():
+    """Name of the innermost running stage of the current report run, or None."""
+    record = _current_run.get()
+    if record is None or not record.get("_stack"):
+        return None
+    return record["_stack"][-1]["name"]
+
+
+@contextmanager
+def collect_report_runs():
+    """Collect the records of every report run finished inside the block."""
+    runs = []
+    token = _collector.set(runs)
+    try:
+        yield runs
+    finally:
+        _collector.reset(token)
+
+
+def _publish(record):
+    key = (record["location"], record["report"])
+    with _lock:
+        for stage_name, seconds in record["stages"].items():
+            totals = _stage_totals.setdefault(key + (stage_name,), {"count": 0, "sum": 0.0, "last": 0.0})
+            totals["count"] += 1
+            totals["sum"] += seconds
+            totals["last"] = seconds
+        outcome_key = key + (record["outcome"] or "unknown",)
+        _run_counts[outcome_key] = _run_counts.get(outcome_key, 0) + 1
+        _last_runs[key] = dict(record)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def render_prometheus():
+    """Render all report metrics in the Prometheus text exposition format."""
+    with _lock:
+        stage_totals = dict(_stage_totals)
+        last_runs = dict(_last_runs)
+        run_counts = dict(_run_counts)
+
+    lines = [
+        "# HELP frono_report_stage_seconds Time spent per report stage.",
+        "# TYPE frono_report_stage_seconds summary",
+    ]
+    for (location, report, stage_name), totals in sorted(stage_totals.items()):
+        labels = _labels(location=location, report=report, stage=stage_name)
+        lines.append(f"frono_report_stage_seconds_sum{labels} {totals['sum']:.3f}")
+        lines.append(f"frono_report_stage_seconds_count{labels} {totals['count']}")
+
+    lines += [
+        "# HELP frono_report_stage_last_seconds Duration of each stage in the most recent run.",
+        "# TYPE frono_report_stage_last_seconds gauge",
+    ]
+    for (location, report, stage_name), totals in sorted(stage_totals.items()):
+        lines.append(f"frono_report_stage_last_seconds{_labels(location=location, report=report, stage=stage_name)} {totals['last']:.3f}")
+
+    lines += [
+        "# HELP frono_report_runs_total Finished report runs by outcome.",
+        "# TYPE frono_report_runs_total counter",
+    ]
+    for (location, report, outcome), count in sorted(run_counts.items()):
+        lines.append(f"frono_report_runs_total{_labels(location=location, report=report, outcome=outcome)} {count}")
+
+    gauges = [
+        ("frono_report_last_duration_seconds", "duration_s", "Wall clock duration of the most recent run."),
+        ("frono_report_last_finished_timestamp_seconds", "finished_at", "Unix time the most recent run finished."),
+        ("frono_report_rows", "rows", "Rows in the most recent cleaned export."),
+        ("frono_report_columns", "columns", "Columns in the most recent cleaned export."),
+        ("frono_report_bytes", "bytes", "Size in bytes of the most recent raw export."),
+    ]
+    for name, field, help_text in gauges:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for (location, report), record in sorted(last_runs.items()):
+            if record.get(field) is not None:
+                lines.append(f"{name}{_labels(location=location, report=report)} {record[field]}")
+
+    return "\n".join(lines) + "\n"
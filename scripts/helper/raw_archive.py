@@ -0,0 +1,113 @@
+import datetime
+import gzip
+import os
+import time
+
+from scripts.helper.common_utils import log
+
+
+# Set RAW_ARCHIVE_DIR to keep a gzip copy of every raw export: <dir>/<location>/<report>/<timestamp>__<file>.gz
+# Archives older than RAW_ARCHIVE_RETENTION_DAYS, or beyond the newest RAW_ARCHIVE_MAX_PER_REPORT, are pruned
+RAW_ARCHIVE_RETENTION_DAYS = float(os.environ.get("RAW_ARCHIVE_RETENTION_DAYS", "30"))
+RAW_ARCHIVE_MAX_PER_REPORT = int(os.environ.get("RAW_ARCHIVE_MAX_PER_REPORT", "50"))
+RAW_ARCHIVE_COMPRESS_LEVEL = int(os.environ.get("RAW_ARCHIVE_COMPRESS_LEVEL", "6"))
+
+TIMESTAMP_FORMAT = "%Y%m%dT%H%M%S"
+SEPARATOR = "__"
+
+
+def get_archive_dir():
+    return os.environ.get("RAW_ARCHIVE_DIR")
+
+
+def archive_enabled():
+    return bool(get_archive_dir())
+
+
+def _report_dir(location, report):
+    return os.path.join(get_archive_dir(), location.lower(), report)
+
+
+def archive_raw_export(location, report, raw_file, data=None):
+    """
+    Store a gzip copy of a raw export (pass data to skip re-reading raw_file), then prune.
+    Returns the archive path, or None when archiving is disabled or fails: the archive
+    never fails a report run.
+    """
+    if not archive_enabled():
+        return None
+    try:
+        if data is None:
+            with open(raw_file, "rb") as f:
+                data = f.read()
+        report_dir = _report_dir(location, report)
+        os.makedirs(report_dir, exist_ok=True)
+        stamp = datetime.datetime.now(datetime.timezone.utc).strftime(TIMESTAMP_FORMAT)
+        path = os.path.join(report_dir, f"{stamp}{SEPARATOR}{os.path.basename(raw_file)}.gz")
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wb", compresslevel=RAW_ARCHIVE_COMPRESS_LEVEL) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        log(f"🗄️ Archived raw export {os.path.basename(raw_file)} ({len(data) / 1024:.0f} KB -> {os.path.getsize(path) / 1024:.0f} KB)")
+        prune_archive(location, report)
+        return path
+    except Exception as e:
+        log(f"⚠️ Could not archive raw export for {report}: {e}")
+        return None
+
+
+def _parse_entry(location, report, name):
+    if not name.endswith(".gz") or SEPARATOR not in name:
+        return None
+    stamp, original = name[:-len(".gz")].split(SEPARATOR, 1)
+    try:
+        archived_at = datetime.datetime.strptime(stamp, TIMESTAMP_FORMAT).replace(tzinfo=datetime.timezone.utc)
+    except ValueError:
+        return None
+    return {
+        "location": location,
+        "report": report,
+        "archived_at": archived_at.isoformat(),
+        "original_name": original,
+        "path": os.path.join(get_archive_dir(), location, report, name),
+    }
+
+
+def list_archived(location=None, report=None, since=None):
+    """Archived exports, oldest first, as {location, report, archived_at, original_name, path}; since is an aware datetime."""
+    root = get_archive_dir()
+    if not root or not os.path.isdir(root):
+        return []
+    entries = []
+    for loc in sorted(os.listdir(root)):
+        if location and loc != location.lower():
+            continue
+        for rep in sorted(os.listdir(os.path.join(root, loc))):
+            if report and rep != report:
+                continue
+            for name in os.listdir(os.path.join(root, loc, rep)):
+                entry = _parse_entry(loc, rep, name)
+                if entry and (since is None or entry["archived_at"] >= since.isoformat()):
+                    entries.append(entry)
+    return sorted(entries, key=lambda entry: entry["archived_at"])
+
+
+def read_archived(path):
+    with gzip.open(path, "rb") as f:
+        return f.read()
+
+
+def prune_archive(location, report):
+    """Apply the retention policy to one location/report; returns the removed paths."""
+    entries = list_archived(location, report)
+    cutoff = time.time() - RAW_ARCHIVE_RETENTION_DAYS * 86400
+    keep_from = max(0, len(entries) - RAW_ARCHIVE_MAX_PER_REPORT)
+    removed = []
+    for index, entry in enumerate(entries):
+        archived_at = datetime.datetime.fromisoformat(entry["archived_at"]).timestamp()
+        if index < keep_from or archived_at < cutoff:
+            os.remove(entry["path"])
+            removed.append(entry["path"])
+    if removed:
+        log(f"🧹 Pruned {len(removed)} archived exports of {location.lower()}/{report}")
+    return removed
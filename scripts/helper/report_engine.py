@@ -0,0 +1,308 @@
+import datetime
+import functools
+import json
+import os
+import time
+
+import pandas as pd
+from selenium.webdriver.common.action_chains import ActionChains
+
+from scripts.helper.browser_manager import create_driver
+from scripts.helper.common_utils import load_credentials, load_dataframe, log, wait_for_download
+from scripts.helper.data_cache import cache_enabled, update_cache
+from scripts.helper.fronocloud_login import login
+from scripts.helper.locations import resolve_dataset
+from scripts.helper.metrics import set_report_stats, stage, track_report
+from scripts.helper.raw_archive import archive_enabled, archive_raw_export
+from scripts.helper.run_history import record_run
+from scripts.helper.scratch import enforce_quota, keep_scratch, scratch_dir
+from scripts.helper.sinks import store_dataframe
+from scripts.helper.tracing import set_span_attributes
+from scripts.helper.wait_profiler import profile_waits
+
+
+# Report-level retries: each attempt resumes at the stage that failed
+REPORT_MAX_ATTEMPTS = int(os.environ.get("REPORT_MAX_ATTEMPTS", "3"))
+REPORT_RETRY_BACKOFF_SECONDS = int(os.environ.get("REPORT_RETRY_BACKOFF_SECONDS", "10"))
+# Checkpoints older than this are discarded instead of resumed, so stale data is never uploaded
+CHECKPOINT_MAX_AGE_SECONDS = int(os.environ.get("CHECKPOINT_MAX_AGE_SECONDS", "1800"))
+
+STAGES = ["scrape", "clean", "upload"]
+# Browser and network failures are worth retrying; a cleaner that rejects an export fails the same way every time
+RETRYABLE_STAGES = ("scrape", "upload")
+
+# Comma-separated report keys (or "all") whose cleaner runs on Polars (scripts/df_cleaners/polars_cleaner.py)
+POLARS_CLEANERS = {key.strip() for key in os.environ.get("POLARS_CLEANERS", "").split(",") if key.strip()}
+
+# All registered report specs by report key
+REPORTS = {}
+
+
+def register_report(report, folder, navigate, cleaner, table_name, dataset_id="frono_2025", custom_schema_map=None, upload_mode=None):
+    """
+    Describe a report for run_report.
+    navigate(driver, actions) runs after login and must end by triggering the Excel export.
+    """
+    spec = {
+        "report": report,
+        "folder": folder,
+        "navigate": navigate,
+        "cleaner": cleaner,
+        "table_name": table_name,
+        "dataset_id": dataset_id,
+        "custom_schema_map": custom_schema_map,
+        "upload_mode": upload_mode,
+    }
+    REPORTS[report] = spec
+    return spec
+
+
+def get_cleaner(spec):
+    """The report's cleaner: its Polars version when selected by POLARS_CLEANERS and polars is installed."""
+    cleaner = spec["cleaner"]
+    if "all" not in POLARS_CLEANERS and spec["report"] not in POLARS_CLEANERS:
+        return cleaner
+    try:
+        from scripts.df_cleaners import polars_cleaner
+    except ImportError as e:
+        log(f"⚠️ Polars cleaners unavailable ({e}), using pandas for {spec['report']}")
+        return cleaner
+    polars_func = getattr(polars_cleaner, cleaner.__name__, None)
+    if polars_func is None:
+        return cleaner
+    return functools.partial(polars_func, report=spec["report"])
+
+
+def _ledger_path(download_path, report):
+    return os.path.join(download_path, f".{report}.ledger.json")
+
+
+def _new_ledger(location, report):
+    return {
+        "location": location,
+        "report": report,
+        "created_at": time.time(),
+        "attempts": 0,
+        "stages": {},
+    }
+
+
+def load_ledger(download_path, location, report):
+    """Load the run ledger of an unfinished run, or start a new one if none is usable."""
+    path = _ledger_path(download_path, report)
+    if not os.path.exists(path):
+        return _new_ledger(location, report)
+    try:
+        with open(path) as f:
+            ledger = json.load(f)
+    except (OSError, ValueError) as e:
+        log(f"⚠️ Ignoring unreadable ledger {path}: {e}")
+        return _new_ledger(location, report)
+
+    age = time.time() - ledger.get("created_at", 0)
+    if age > CHECKPOINT_MAX_AGE_SECONDS:
+        log(f"🧹 Discarding {age / 60:.0f} min old checkpoints for {report}")
+        clear_checkpoints(download_path, ledger)
+        return _new_ledger(location, report)
+
+    done = [stage_name for stage_name in STAGES if ledger["stages"].get(stage_name, {}).get("status") == "done"]
+    if done:
+        log(f"♻️ Resuming {report} after completed stage(s): {', '.join(done)}")
+    return ledger
+
+
+def save_ledger(download_path, ledger):
+    path = _ledger_path(download_path, ledger["report"])
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(ledger, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+def clear_checkpoints(download_path, ledger):
+    """Delete the ledger and every stage artifact it references."""
+    for entry in ledger["stages"].values():
+        artifact = entry.get("artifact")
+        if artifact and os.path.exists(artifact):
+            os.remove(artifact)
+            log(f"🗑️ Deleted local file: {artifact}")
+    path = _ledger_path(download_path, ledger["report"])
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def _mark(download_path, ledger, stage_name, status, artifact=None, error=None):
+    entry = ledger["stages"].setdefault(stage_name, {})
+    entry.update({"status": status, "updated_at": datetime.datetime.now().isoformat(timespec="seconds")})
+    if artifact is not None:
+        entry["artifact"] = artifact
+    if error is not None:
+        entry["error"] = error
+    save_ledger(download_path, ledger)
+
+
+def _completed_artifact(ledger, stage_name):
+    entry = ledger["stages"].get(stage_name, {})
+    artifact = entry.get("artifact")
+    if entry.get("status") == "done" and artifact and os.path.exists(artifact):
+        return artifact
+    return None
+
+
+def _clear_stale_downloads(download_path):
+    # wait_for_download picks the first .xlsx it sees, so leftovers from failed runs must go
+    for name in os.listdir(download_path):
+        if name.endswith((".xlsx", ".crdownload")):
+            os.remove(os.path.join(download_path, name))
+            log(f"🧹 Removed stale download: {name}")
+
+
+def scrape_report(spec, download_path, username, password):
+    """Open a browser, log in, run the report navigation and return the downloaded file."""
+    _clear_stale_downloads(download_path)
+    with stage("driver_start"):
+        driver = create_driver(download_path)
+    actions = ActionChains(driver)
+
+    try:
+        log("Logging in to FronoCloud...")
+        with stage("login"):
+            login(driver, username, password)
+
+        with stage("navigation"):
+            spec["navigate"](driver, actions)
+
+        with stage("download"):
+            downloaded_file = wait_for_download(download_path)
+        log(f"✅ Downloaded file saved as: {downloaded_file}")
+        enforce_quota()
+        return downloaded_file
+
+    finally:
+        log("Closing browser...")
+        with stage("driver_quit"):
+            driver.quit()
+
+
+def _run_stages(location, spec, download_path, ledger, username, password):
+    report = spec["report"]
+
+    raw_bytes = None
+    raw_file = _completed_artifact(ledger, "scrape")
+    if raw_file is None:
+        _mark(download_path, ledger, "scrape", "running")
+        raw_file = scrape_report(spec, download_path, username, password)
+        _mark(download_path, ledger, "scrape", "done", artifact=raw_file)
+        # Read the export once: the archive and the parse both use these bytes
+        with open(raw_file, "rb") as f:
+            raw_bytes = f.read()
+        if archive_enabled():
+            with stage("archive"):
+                archive_raw_export(location, report, raw_file, data=raw_bytes)
+
+    cleaned_file = _completed_artifact(ledger, "clean")
+    if cleaned_file is not None:
+        log(f"♻️ Loading cleaned checkpoint: {cleaned_file}")
+        with stage("parse"):
+            df = pd.read_parquet(cleaned_file)
+    else:
+        _mark(download_path, ledger, "clean", "running")
+        with stage("parse"):
+            # A resumed run did not read the export after its scrape
+            if raw_bytes is None:
+                with open(raw_file, "rb") as f:
+                    raw_bytes = f.read()
+            df = load_dataframe(raw_file, data=raw_bytes)
+        with stage("clean"):
+            df = get_cleaner(spec)(df)
+        if df is None:
+            raise ValueError(f"Cleaner for {report} returned no data")
+        cleaned_file = os.path.join(download_path, f"{report}.cleaned.parquet")
+        try:
+            with stage("checkpoint"):
+                df.to_parquet(cleaned_file, index=False)
+        except Exception as e:
+            # The checkpoint is an optimisation; mixed-type columns must not fail the run
+            log(f"⚠️ Could not checkpoint cleaned data for {report}: {e}")
+            cleaned_file = None
+        _mark(download_path, ledger, "clean", "done", artifact=cleaned_file)
+    set_report_stats(
+        bytes=len(raw_bytes) if raw_bytes is not None else os.path.getsize(raw_file),
+        rows=int(df.shape[0]),
+        columns=int(df.shape[1]),
+    )
+
+    _mark(download_path, ledger, "upload", "running")
+    with stage("upload"):
+        store_dataframe(
+            df,
+            table_name=spec["table_name"],
+            dataset_id=resolve_dataset(location, spec["dataset_id"]),
+            location=location,
+            custom_schema_map=spec["custom_schema_map"],
+            upload_mode=spec["upload_mode"],
+        )
+    if cache_enabled():
+        with stage("cache"):
+            update_cache(location, report, df)
+    _mark(download_path, ledger, "upload", "done")
+
+
+def _current_stage(ledger):
+    for stage_name in STAGES:
+        if ledger["stages"].get(stage_name, {}).get("status") != "done":
+            return stage_name
+    return STAGES[-1]
+
+
+def run_report(location, spec):
+    """
+    Scrape, clean and store one report with checkpoints.
+    Every stage output is recorded in a run ledger next to the download, so a
+    retry (in-process with backoff, or the next trigger within
+    CHECKPOINT_MAX_AGE_SECONDS) resumes at the stage that failed.
+    The download directory is scratch storage (see scratch.py): it is removed
+    when the run ends unless a failed run left checkpoints worth resuming.
+    Returns "Success" or "Error: ..." like the individual report scripts always have.
+    """
+    report = spec["report"]
+    username, password = load_credentials(location)
+
+    with scratch_dir(location, spec["folder"]) as download_path, track_report(location, report) as record, \
+            profile_waits(location, report):
+        set_span_attributes(table=f"{resolve_dataset(location, spec['dataset_id'])}.{location.lower()}_{spec['table_name']}")
+        ledger = load_ledger(download_path, location, report)
+        result = _run_attempts(location, spec, download_path, ledger, username, password, record)
+        if record["outcome"] != "success" and _completed_artifact(ledger, "scrape"):
+            keep_scratch(download_path)
+
+    try:
+        record_run(record)
+    except Exception as e:
+        log(f"⚠️ Could not write run history for {report}: {e}")
+    return result
+
+
+def _run_attempts(location, spec, download_path, ledger, username, password, record):
+    report = spec["report"]
+    for attempt in range(1, REPORT_MAX_ATTEMPTS + 1):
+        ledger["attempts"] += 1
+        record["attempts"] = attempt
+        try:
+            _run_stages(location, spec, download_path, ledger, username, password)
+            clear_checkpoints(download_path, ledger)
+            record["outcome"] = "success"
+            return "Success"
+
+        except Exception as e:
+            failed_stage = _current_stage(ledger)
+            _mark(download_path, ledger, failed_stage, "failed", error=str(e))
+            log(f"❌ Error during {failed_stage} of {report} (attempt {attempt}/{REPORT_MAX_ATTEMPTS}): {e}")
+            if attempt == REPORT_MAX_ATTEMPTS or failed_stage not in RETRYABLE_STAGES:
+                record["outcome"] = "error"
+                record["error"] = str(e)
+                return f"Error: {e}"
+            delay = REPORT_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+            log(f"🔁 Retrying {report} from stage '{failed_stage}' in {delay}s...")
+            with stage("retry_backoff"):
+                time.sleep(delay)
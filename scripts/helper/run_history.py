@@ -0,0 +1,136 @@
+import json
+import math
+import os
+import sqlite3
+from contextlib import closing
+
+from scripts.helper.common_utils import log
+
+
+RUN_HISTORY_DB_PATH = os.environ.get("RUN_HISTORY_DB_PATH", os.path.join(os.getcwd(), "state", "run_history.sqlite"))
+
+# A stage is flagged when it exceeds the rolling percentile of recent successful runs
+REGRESSION_WINDOW = int(os.environ.get("REGRESSION_WINDOW", "20"))
+REGRESSION_PERCENTILE = float(os.environ.get("REGRESSION_PERCENTILE", "90"))
+REGRESSION_FACTOR = float(os.environ.get("REGRESSION_FACTOR", "1.2"))
+# Ignore sub-second noise on fast stages
+REGRESSION_MIN_DELTA_SECONDS = float(os.environ.get("REGRESSION_MIN_DELTA_SECONDS", "2"))
+REGRESSION_MIN_SAMPLES = 5
+
+COLUMNS = [
+    "id", "location", "report", "started_at", "finished_at", "duration_s", "outcome",
+    "attempts", "rows", "columns", "bytes", "stages", "error", "regressions",
+]
+
+
+def _connect():
+    os.makedirs(os.path.dirname(RUN_HISTORY_DB_PATH), exist_ok=True)
+    con = sqlite3.connect(RUN_HISTORY_DB_PATH, timeout=30)
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS runs ("
+        " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " location TEXT NOT NULL,"
+        " report TEXT NOT NULL,"
+        " started_at REAL NOT NULL,"
+        " finished_at REAL,"
+        " duration_s REAL,"
+        " outcome TEXT,"
+        " attempts INTEGER,"
+        " rows INTEGER,"
+        " columns INTEGER,"
+        " bytes INTEGER,"
+        " stages TEXT,"
+        " error TEXT,"
+        " regressions TEXT)"
+    )
+    con.execute("CREATE INDEX IF NOT EXISTS runs_by_report ON runs (location, report, started_at)")
+    return con
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def detect_regressions(con, record):
+    """Compare each stage (and the total) of a run with the rolling baseline of earlier successful runs."""
+    rows = con.execute(
+        "SELECT stages, duration_s FROM runs WHERE location = ? AND report = ? AND outcome = 'success'"
+        " ORDER BY started_at DESC LIMIT ?",
+        (record["location"], record["report"], REGRESSION_WINDOW),
+    ).fetchall()
+    if len(rows) < REGRESSION_MIN_SAMPLES:
+        return []
+
+    history = {"total": [duration for _, duration in rows if duration is not None]}
+    for stages_json, _ in rows:
+        for stage_name, seconds in json.loads(stages_json or "{}").items():
+            history.setdefault(stage_name, []).append(seconds)
+
+    current = dict(record["stages"], total=record["duration_s"])
+    regressions = []
+    for stage_name, seconds in current.items():
+        samples = history.get(stage_name, [])
+        if seconds is None or len(samples) < REGRESSION_MIN_SAMPLES:
+            continue
+        baseline = percentile(samples, REGRESSION_PERCENTILE)
+        if seconds > baseline * REGRESSION_FACTOR and seconds - baseline >= REGRESSION_MIN_DELTA_SECONDS:
+            regressions.append({
+                "stage": stage_name,
+                "seconds": round(seconds, 3),
+                "baseline_s": round(baseline, 3),
+                "percentile": REGRESSION_PERCENTILE,
+                "samples": len(samples),
+            })
+    return regressions
+
+
+def record_run(record):
+    """Store a finished report run (see metrics.track_report) and flag slow stages on it."""
+    with closing(_connect()) as con:
+        regressions = detect_regressions(con, record)
+        con.execute(
+            "INSERT INTO runs (location, report, started_at, finished_at, duration_s, outcome, attempts,"
+            " rows, columns, bytes, stages, error, regressions) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                record["location"], record["report"], record["started_at"], record["finished_at"],
+                record["duration_s"], record["outcome"], record["attempts"], record["rows"],
+                record["columns"], record["bytes"], json.dumps(record["stages"]), record["error"],
+                json.dumps(regressions),
+            ),
+        )
+        con.commit()
+
+    record["regressions"] = regressions
+    for regression in regressions:
+        log(f"🐢 {record['location'].upper()} | {record['report']}: {regression['stage']} took "
+            f"{regression['seconds']:.1f}s vs p{regression['percentile']:g} baseline {regression['baseline_s']:.1f}s")
+    return regressions
+
+
+def get_history(location=None, report=None, limit=50, regressions_only=False):
+    query = f"SELECT {', '.join(COLUMNS)} FROM runs WHERE 1 = 1"
+    params = []
+    if location:
+        query += " AND location = ?"
+        params.append(location.lower())
+    if report:
+        query += " AND report = ?"
+        params.append(report)
+    if regressions_only:
+        query += " AND regressions NOT IN ('', '[]')"
+    query += " ORDER BY started_at DESC LIMIT ?"
+    params.append(limit)
+
+    with closing(_connect()) as con:
+        rows = con.execute(query, params).fetchall()
+
+    runs = []
+    for row in rows:
+        run = dict(zip(COLUMNS, row))
+        run["stages"] = json.loads(run["stages"] or "{}")
+        run["regressions"] = json.loads(run["regressions"] or "[]")
+        runs.append(run)
+    return runs
@@ -0,0 +1,147 @@
+import atexit
+import os
+import shutil
+import signal
+import sys
+import threading
+from contextlib import contextmanager
+
+from scripts.helper.common_utils import log
+
+
+# Downloads go to tmpfs when available: disk I/O on Cloud Run is slow and counts against memory anyway
+DEFAULT_SCRATCH_ROOT = "/dev/shm/frono_scratch" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else os.path.join(os.getcwd(), "scratch")
+SCRATCH_QUOTA_MB = int(os.environ.get("SCRATCH_QUOTA_MB", "512"))
+
+# Directories in use by a running report; never evicted
+_active = set()
+# Directories kept after a failed run because their checkpoints can resume the next trigger
+_retained = set()
+_lock = threading.Lock()
+
+
+def get_scratch_root():
+    return os.environ.get("SCRATCH_ROOT") or DEFAULT_SCRATCH_ROOT
+
+
+def _dir_size(path):
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                pass  # Chrome renames .crdownload files while we walk
+    return total
+
+
+def scratch_usage():
+    root = get_scratch_root()
+    return _dir_size(root) if os.path.isdir(root) else 0
+
+
+def _report_dirs():
+    """Every <root>/<location>/<folder> directory, oldest first."""
+    root = get_scratch_root()
+    if not os.path.isdir(root):
+        return []
+    dirs = [
+        os.path.join(root, location, folder)
+        for location in os.listdir(root) if os.path.isdir(os.path.join(root, location))
+        for folder in os.listdir(os.path.join(root, location))
+    ]
+    return sorted((path for path in dirs if os.path.isdir(path)), key=os.path.getmtime)
+
+
+def _remove(path):
+    shutil.rmtree(path, ignore_errors=True)
+    with _lock:
+        _retained.discard(path)
+    parent = os.path.dirname(path)
+    if os.path.isdir(parent) and not os.listdir(parent):
+        os.rmdir(parent)
+
+
+def enforce_quota():
+    """
+    Evict directories not used by a running report, oldest first, until usage fits the quota.
+    Raises OSError if running reports alone exceed it.
+    """
+    quota = SCRATCH_QUOTA_MB * 1024 * 1024
+    usage = scratch_usage()
+    if usage <= quota:
+        return
+    for path in _report_dirs():
+        with _lock:
+            if path in _active:
+                continue
+        size = _dir_size(path)
+        _remove(path)
+        usage -= size
+        log(f"🧹 Evicted scratch dir {path} ({size / 1024 / 1024:.1f} MB) to stay under {SCRATCH_QUOTA_MB} MB")
+        if usage <= quota:
+            return
+    raise OSError(f"Scratch storage over quota: {usage / 1024 / 1024:.1f} MB used, {SCRATCH_QUOTA_MB} MB allowed")
+
+
+@contextmanager
+def scratch_dir(location, folder_name):
+    """
+    Scratch directory for one report run, <SCRATCH_ROOT>/<location>/<folder>.
+    It is deleted on every exit path (success, error, process exit) unless
+    keep_scratch() was called for it, which leaves it for the next run to resume from.
+    """
+    path = os.path.join(get_scratch_root(), location, folder_name)
+    with _lock:
+        _active.add(path)
+        _retained.discard(path)
+    try:
+        enforce_quota()
+        os.makedirs(path, exist_ok=True)
+        yield path
+    finally:
+        with _lock:
+            _active.discard(path)
+            keep = path in _retained
+        if not keep:
+            _remove(path)
+
+
+def keep_scratch(path):
+    """Keep a scratch directory after its run ends (its checkpoints can resume the next attempt)."""
+    with _lock:
+        _retained.add(path)
+
+
+def clear_scratch():
+    """Delete every scratch directory not used by a running report; returns the deleted paths."""
+    deleted = []
+    for path in _report_dirs():
+        with _lock:
+            if path in _active:
+                continue
+        _remove(path)
+        deleted.append(path)
+    return deleted
+
+
+def _cleanup_active():
+    with _lock:
+        active = list(_active)
+    for path in active:
+        _remove(path)
+
+
+def install_exit_cleanup():
+    """Remove in-flight scratch directories on interpreter exit and on SIGTERM (Cloud Run shutdown)."""
+    atexit.register(_cleanup_active)
+    if threading.current_thread() is threading.main_thread():
+        previous = signal.getsignal(signal.SIGTERM)
+
+        def _on_sigterm(signum, frame):
+            _cleanup_active()
+            if callable(previous):
+                previous(signum, frame)
+            sys.exit(0)
+
+        signal.signal(signal.SIGTERM, _on_sigterm)
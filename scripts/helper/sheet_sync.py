@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+# Relative imports: add_new_item.py loads helpers as the top-level "helper" package
+from .common_utils import log
+
+
+SHEET_SYNC_DB_PATH = os.environ.get("SHEET_SYNC_DB_PATH", os.path.join(os.getcwd(), "state", "sheet_sync.sqlite"))
+# Rows above the cursor are only re-read on a full rescan, which picks up edits to old rows
+SHEET_FULL_RESCAN_SECONDS = int(os.environ.get("SHEET_FULL_RESCAN_SECONDS", str(24 * 3600)))
+
+
+def _connect():
+    os.makedirs(os.path.dirname(SHEET_SYNC_DB_PATH), exist_ok=True)
+    con = sqlite3.connect(SHEET_SYNC_DB_PATH, timeout=30)
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS sheet_cursor ("
+        " sheet TEXT PRIMARY KEY,"
+        " last_row INTEGER NOT NULL,"
+        " last_full_scan_at REAL NOT NULL)"
+    )
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS sheet_rows ("
+        " sheet TEXT NOT NULL,"
+        " row_number INTEGER NOT NULL,"
+        " hash TEXT NOT NULL,"
+        " status TEXT NOT NULL,"  # pending until the caller confirms the row was handled
+        " content TEXT NOT NULL,"
+        " updated_at REAL NOT NULL,"
+        " PRIMARY KEY (sheet, row_number))"
+    )
+    return con
+
+
+def _row_hash(values):
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def sync_sheet_rows(service, spreadsheet_id, sheet="Sheet1", first_row=2, last_column="C"):
+    """
+    Fetch only the rows appended since the last sync (every row on a periodic full
+    rescan), and return [(row_number, values)] for rows that are new or whose content
+    changed, plus rows still pending from earlier runs. Call mark_rows_done for the
+    rows that were handled; the rest are returned again next time.
+    """
+    key = f"{spreadsheet_id}:{sheet}"
+    now = time.time()
+    with closing(_connect()) as con:
+        cursor = con.execute("SELECT last_row, last_full_scan_at FROM sheet_cursor WHERE sheet = ?", (key,)).fetchone()
+        full_scan = cursor is None or now - cursor[1] >= SHEET_FULL_RESCAN_SECONDS
+        start_row = first_row if full_scan else cursor[0] + 1
+        range_name = f"{sheet}!A{start_row}:{last_column}"
+        log(f"📄 {'Full rescan' if full_scan else 'Incremental sync'} of {range_name}")
+
+        values = service.spreadsheets().values().get(spreadsheetId=spreadsheet_id, range=range_name).execute().get("values", [])
+
+        known = dict(con.execute(
+            "SELECT row_number, hash FROM sheet_rows WHERE sheet = ? AND row_number >= ?", (key, start_row)
+        ).fetchall())
+        changed = 0
+        for offset, row in enumerate(values):
+            row_number = start_row + offset
+            row_hash = _row_hash(row)
+            if known.get(row_number) == row_hash:
+                continue
+            con.execute(
+                "INSERT OR REPLACE INTO sheet_rows (sheet, row_number, hash, status, content, updated_at)"
+                " VALUES (?, ?, ?, 'pending', ?, ?)",
+                (key, row_number, row_hash, json.dumps(row, ensure_ascii=False), now),
+            )
+            changed += 1
+
+        last_row = max(start_row + len(values) - 1, cursor[0] if cursor else 0)
+        con.execute(
+            "INSERT OR REPLACE INTO sheet_cursor (sheet, last_row, last_full_scan_at) VALUES (?, ?, ?)",
+            (key, last_row, now if full_scan else cursor[1]),
+        )
+        con.commit()
+
+        pending = con.execute(
+            "SELECT row_number, content FROM sheet_rows WHERE sheet = ? AND status = 'pending' ORDER BY row_number", (key,)
+        ).fetchall()
+    log(f"📄 Read {len(values)} rows, {changed} new or changed, {len(pending)} pending")
+    return [(row_number, json.loads(content)) for row_number, content in pending]
+
+
+def mark_rows_done(spreadsheet_id, row_numbers, sheet="Sheet1"):
+    if not row_numbers:
+        return
+    key = f"{spreadsheet_id}:{sheet}"
+    with closing(_connect()) as con:
+        con.executemany(
+            "UPDATE sheet_rows SET status = 'done', updated_at = ? WHERE sheet = ? AND row_number = ?",
+            [(time.time(), key, row_number) for row_number in row_numbers],
+        )
+        con.commit()
@@ -0,0 +1,100 @@
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+from scripts.helper.common_utils import convert_custom_date_columns, log, upload_to_bigquery
+
+
+# Comma-separated sink names, e.g. "bigquery" (default), "parquet" or "bigquery,duckdb"
+DEFAULT_OUTPUT_SINKS = "bigquery"
+DEFAULT_LOCAL_STORE_DIR = os.path.join(os.getcwd(), "local_store")
+
+# DuckDB allows a single writer per database file
+_duckdb_lock = threading.Lock()
+
+
+def get_local_store_dir():
+    return os.environ.get("LOCAL_STORE_DIR", DEFAULT_LOCAL_STORE_DIR)
+
+
+def get_output_sinks():
+    sinks = os.environ.get("OUTPUT_SINKS", DEFAULT_OUTPUT_SINKS)
+    return [sink.strip().lower() for sink in sinks.split(",") if sink.strip()]
+
+
+def write_to_parquet(df, table_name, dataset_id="frono_2025", location="kolkata", custom_schema_map=None):
+    """Replace the location partition of a local Parquet table (hive layout: <table>/location=<loc>/)."""
+    convert_custom_date_columns(df, custom_schema_map)
+
+    partition_dir = os.path.join(get_local_store_dir(), "parquet", dataset_id, table_name, f"location={location.lower()}")
+    os.makedirs(partition_dir, exist_ok=True)
+    target = os.path.join(partition_dir, "data.parquet")
+
+    # Write next to the target and swap so readers never see a half-written file
+    tmp_path = f"{target}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, target)
+    log(f"✅ Wrote {df.shape[0]} rows to Parquet: {target}")
+
+
+def write_to_duckdb(df, table_name, dataset_id="frono_2025", location="kolkata", custom_schema_map=None):
+    """Replace <dataset>.<location>_<table> in the local DuckDB database."""
+    import duckdb
+
+    convert_custom_date_columns(df, custom_schema_map)
+
+    store_dir = get_local_store_dir()
+    os.makedirs(store_dir, exist_ok=True)
+    db_path = os.path.join(store_dir, "frono.duckdb")
+    table_id = f'"{dataset_id}"."{location.lower()}_{table_name}"'
+
+    with _duckdb_lock, closing(duckdb.connect(db_path)) as con:
+        con.execute(f'CREATE SCHEMA IF NOT EXISTS "{dataset_id}"')
+        con.register("incoming_df", df)
+        con.execute(f"CREATE OR REPLACE TABLE {table_id} AS SELECT * FROM incoming_df")
+        con.unregister("incoming_df")
+    log(f"✅ Wrote {df.shape[0]} rows to DuckDB: {db_path} {table_id}")
+
+
+def write_to_sqlite(df, table_name, dataset_id="frono_2025", location="kolkata", custom_schema_map=None):
+    """Replace <location>_<table> in a per-dataset SQLite database."""
+    convert_custom_date_columns(df, custom_schema_map)
+
+    store_dir = get_local_store_dir()
+    os.makedirs(store_dir, exist_ok=True)
+    db_path = os.path.join(store_dir, f"{dataset_id}.sqlite")
+    sqlite_table = f"{location.lower()}_{table_name}"
+
+    with closing(sqlite3.connect(db_path)) as con:
+        df.to_sql(sqlite_table, con, if_exists="replace", index=False)
+        con.commit()
+    log(f"✅ Wrote {df.shape[0]} rows to SQLite: {db_path} {sqlite_table}")
+
+
+SINKS = {
+    "bigquery": upload_to_bigquery,
+    "parquet": write_to_parquet,
+    "duckdb": write_to_duckdb,
+    "sqlite": write_to_sqlite,
+}
+
+
+def store_dataframe(df, table_name, dataset_id="frono_2025", location="kolkata", custom_schema_map=None, upload_mode=None, sinks=None):
+    """
+    Write a cleaned report to every configured sink.
+    Sinks come from the OUTPUT_SINKS environment variable unless passed explicitly.
+    upload_mode only applies to the BigQuery sink.
+    """
+    sink_names = sinks or get_output_sinks()
+    unknown = [name for name in sink_names if name not in SINKS]
+    if unknown:
+        raise ValueError(f"Unknown output sink(s): {', '.join(unknown)}. Available: {', '.join(SINKS)}")
+
+    for name in sink_names:
+        if name == "bigquery":
+            upload_to_bigquery(df, table_name=table_name, dataset_id=dataset_id, location=location,
+                               custom_schema_map=custom_schema_map, upload_mode=upload_mode)
+        else:
+            SINKS[name](df, table_name=table_name, dataset_id=dataset_id, location=location,
+                        custom_schema_map=custom_schema_map)
@@ -0,0 +1,154 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+
+from .common_utils import log
+
+
+# Spans are written as OTLP/JSON (one ExportTraceServiceRequest per line) to TRACE_EXPORT_PATH
+# and/or POSTed to an OTLP/HTTP collector at OTEL_EXPORTER_OTLP_ENDPOINT (e.g. http://localhost:4318)
+SERVICE_NAME = os.environ.get("OTEL_SERVICE_NAME", "frono-scraping")
+TRACE_FLUSH_SPANS = 200
+
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+_buffer = []
+_buffer_lock = threading.Lock()
+
+
+def get_export_path():
+    return os.environ.get("TRACE_EXPORT_PATH")
+
+
+def get_collector_endpoint():
+    return os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT")
+
+
+def tracing_enabled():
+    return bool(get_export_path() or get_collector_endpoint())
+
+
+def start_span(name, activate=True, **attributes):
+    """
+    Open a span under the current one. Returns None when tracing is disabled.
+    With activate=False the span does not become the parent of later spans (used for leaf steps).
+    """
+    if not tracing_enabled():
+        return None
+    parent = _current_span.get()
+    span = {
+        "trace_id": parent["trace_id"] if parent else os.urandom(16).hex(),
+        "span_id": os.urandom(8).hex(),
+        "parent_span_id": parent["span_id"] if parent else "",
+        "name": name,
+        "start_ns": time.time_ns(),
+        "attributes": {key: value for key, value in attributes.items() if value is not None},
+        "status": {"code": STATUS_OK},
+        "token": None,
+    }
+    if activate:
+        span["token"] = _current_span.set(span)
+    return span
+
+
+def end_span(span, error=None):
+    if span is None:
+        return
+    span["end_ns"] = time.time_ns()
+    if error is not None:
+        span["status"] = {"code": STATUS_ERROR, "message": str(error)}
+    if span["token"] is not None:
+        _current_span.reset(span["token"])
+    with _buffer_lock:
+        _buffer.append(span)
+        should_flush = not span["parent_span_id"] or len(_buffer) >= TRACE_FLUSH_SPANS
+    if should_flush:
+        flush_spans()
+
+
+@contextmanager
+def span(name, **attributes):
+    current = start_span(name, **attributes)
+    try:
+        yield current
+    except BaseException as e:
+        end_span(current, error=e)
+        raise
+    else:
+        end_span(current)
+
+
+def set_span_attributes(**attributes):
+    current = _current_span.get()
+    if current is not None:
+        current["attributes"].update({key: value for key, value in attributes.items() if value is not None})
+
+
+def _attribute_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _to_otlp(spans):
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{
+                "scope": {"name": "scripts.helper.tracing"},
+                "spans": [{
+                    "traceId": s["trace_id"],
+                    "spanId": s["span_id"],
+                    "parentSpanId": s["parent_span_id"],
+                    "name": s["name"],
+                    "kind": 1,
+                    "startTimeUnixNano": str(s["start_ns"]),
+                    "endTimeUnixNano": str(s["end_ns"]),
+                    "attributes": [{"key": key, "value": _attribute_value(value)} for key, value in s["attributes"].items()],
+                    "status": s["status"],
+                } for s in spans],
+            }],
+        }]
+    }
+
+
+def flush_spans():
+    """Export all finished spans; export failures are logged and never break a report run."""
+    with _buffer_lock:
+        spans = list(_buffer)
+        _buffer.clear()
+    if not spans:
+        return
+    payload = json.dumps(_to_otlp(spans))
+
+    export_path = get_export_path()
+    if export_path:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(export_path)), exist_ok=True)
+            with _buffer_lock, open(export_path, "a") as f:
+                f.write(payload + "\n")
+        except OSError as e:
+            log(f"⚠️ Could not write traces to {export_path}: {e}")
+
+    endpoint = get_collector_endpoint()
+    if endpoint:
+        request = urllib.request.Request(
+            endpoint.rstrip("/") + "/v1/traces",
+            data=payload.encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            urllib.request.urlopen(request, timeout=5).close()
+        except Exception as e:
+            log(f"⚠️ Could not export traces to {endpoint}: {e}")
@@ -0,0 +1,229 @@
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from scripts.helper.common_utils import log
+from scripts.helper.metrics import current_stage
+
+
+# Set WAIT_PROFILE_PATH to profile every report run's time.sleep, WebDriverWait.until and ActionChains.perform
+# calls; one JSON line per run is appended to the file (rank them with python -m scripts.wait_report)
+WAIT_PROFILE_SLICE_SECONDS = float(os.environ.get("WAIT_PROFILE_SLICE_SECONDS", "0.1"))
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Page state polled during a profiled sleep: the page counts as ready once it has loaded
+# and its element and resource counts stopped changing between two polls
+READY_SCRIPT = """
+return [document.readyState, document.getElementsByTagName('*').length,
+        window.performance ? performance.getEntriesByType('resource').length : 0];
+"""
+
+_profile = contextvars.ContextVar("wait_profile", default=None)
+_install_lock = threading.Lock()
+_write_lock = threading.Lock()
+_originals = {}
+
+
+def get_profile_path():
+    return os.environ.get("WAIT_PROFILE_PATH")
+
+
+def profiling_enabled():
+    return bool(get_profile_path())
+
+
+def _call_site(depth):
+    frame = sys._getframe(depth + 1)
+    path = os.path.relpath(frame.f_code.co_filename, REPO_ROOT)
+    return f"{path}:{frame.f_lineno} {frame.f_code.co_name}"
+
+
+def _step(profile, kind, site):
+    key = (kind, site, current_stage())
+    step = profile["steps"].get(key)
+    if step is None:
+        step = profile["steps"][key] = {
+            "kind": kind, "site": site, "stage": key[2], "count": 0, "seconds": 0.0,
+            "unneeded_s": 0.0, "unconfirmed_s": 0.0, "immediate": 0, "timeouts": 0,
+        }
+    return step
+
+
+def _page_state(driver):
+    try:
+        return tuple(driver.execute_script(READY_SCRIPT))
+    except Exception:
+        return None
+
+
+def _profiled_sleep(seconds):
+    profile = _profile.get()
+    if profile is None or profile["depth"]:
+        return _originals["sleep"](seconds)
+
+    sleep = _originals["sleep"]
+    site = _call_site(1)
+    driver = profile["driver"]
+    started = time.perf_counter()
+    deadline = started + max(0.0, seconds)
+    ready_at, previous, previous_at = None, None, None
+    # Sleep in slices and note when the page became ready; the driver belongs to this thread,
+    # so polling it between slices cannot interleave with the report's own commands
+    while True:
+        if driver is not None and ready_at is None:
+            polled_at = time.perf_counter()
+            state = _page_state(driver)
+            if state is None:
+                # The driver has quit (or the page is gone): stop polling it
+                driver = profile["driver"] = None
+            elif state[0] == "complete" and state == previous:
+                ready_at = previous_at
+            previous, previous_at = state, polled_at
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        sleep(remaining if driver is None or ready_at is not None else min(WAIT_PROFILE_SLICE_SECONDS, remaining))
+
+    elapsed = time.perf_counter() - started
+    step = _step(profile, "sleep", site)
+    step["count"] += 1
+    step["seconds"] += elapsed
+    if ready_at is not None:
+        # Counted as unneeded only if the next wait succeeds on its first poll, confirming the page was ready
+        profile["pending"].append((step, started + elapsed - ready_at))
+
+
+def _settle_pending(profile, confirmed):
+    for step, unneeded in profile["pending"]:
+        step["unneeded_s" if confirmed else "unconfirmed_s"] += unneeded
+    profile["pending"] = []
+
+
+def _profiled_until(self, method, message=""):
+    profile = _profile.get()
+    if profile is None or profile["depth"]:
+        return _originals["until"](self, method, message)
+
+    site = _call_site(1)
+    profile["driver"] = getattr(self, "_driver", profile["driver"])
+    calls = [0]
+
+    def counted(driver):
+        calls[0] += 1
+        return method(driver)
+
+    profile["depth"] += 1
+    started = time.perf_counter()
+    timed_out = False
+    try:
+        return _originals["until"](self, counted, message)
+    except Exception:
+        timed_out = True
+        raise
+    finally:
+        profile["depth"] -= 1
+        step = _step(profile, "wait", site)
+        step["count"] += 1
+        step["seconds"] += time.perf_counter() - started
+        step["timeouts"] += timed_out
+        immediate = calls[0] == 1 and not timed_out
+        step["immediate"] += immediate
+        # A wait that had to poll shows the page was not ready after the preceding sleeps
+        _settle_pending(profile, confirmed=immediate)
+
+
+def _profiled_perform(self):
+    profile = _profile.get()
+    if profile is None or profile["depth"]:
+        return _originals["perform"](self)
+
+    site = _call_site(1)
+    profile["driver"] = getattr(self, "_driver", profile["driver"])
+    profile["depth"] += 1
+    started = time.perf_counter()
+    try:
+        return _originals["perform"](self)
+    finally:
+        profile["depth"] -= 1
+        step = _step(profile, "action", site)
+        step["count"] += 1
+        step["seconds"] += time.perf_counter() - started
+        # An action does not check the page, so it cannot confirm the preceding sleeps
+        _settle_pending(profile, confirmed=False)
+
+
+def install():
+    """Patch time.sleep, WebDriverWait.until and ActionChains.perform (once); outside profile_waits they behave as before."""
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    with _install_lock:
+        if _originals:
+            return
+        _originals.update(sleep=time.sleep, until=WebDriverWait.until, perform=ActionChains.perform)
+        time.sleep = _profiled_sleep
+        WebDriverWait.until = _profiled_until
+        ActionChains.perform = _profiled_perform
+
+
+def summarize(profile):
+    steps = sorted(profile["steps"].values(), key=lambda step: (-step["unneeded_s"], -step["seconds"]))
+    for step in steps:
+        for key in ("seconds", "unneeded_s", "unconfirmed_s"):
+            step[key] = round(step[key], 3)
+    totals = {
+        f"{kind}_s": round(sum(step["seconds"] for step in steps if step["kind"] == kind), 3)
+        for kind in ("sleep", "wait", "action")
+    }
+    totals["unneeded_sleep_s"] = round(sum(step["unneeded_s"] for step in steps), 3)
+    return {
+        "location": profile["location"],
+        "report": profile["report"],
+        "started_at": profile["started_at"],
+        "duration_s": round(time.perf_counter() - profile["started"], 3),
+        "totals": totals,
+        "steps": steps,
+    }
+
+
+@contextmanager
+def profile_waits(location, report):
+    """Profile the sleeps, waits and actions of one report run when WAIT_PROFILE_PATH is set."""
+    if not profiling_enabled():
+        yield None
+        return
+
+    install()
+    profile = {
+        "location": location.lower(),
+        "report": report,
+        "started_at": time.time(),
+        "started": time.perf_counter(),
+        "driver": None,
+        "depth": 0,
+        "pending": [],
+        "steps": {},
+    }
+    token = _profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _profile.reset(token)
+        # Sleeps never followed by a wait stay unconfirmed
+        _settle_pending(profile, confirmed=False)
+        summary = summarize(profile)
+        totals = summary["totals"]
+        log(f"⏳ Wait profile for {report}: sleeps {totals['sleep_s']}s ({totals['unneeded_sleep_s']}s unneeded), "
+            f"waits {totals['wait_s']}s, actions {totals['action_s']}s")
+        try:
+            path = get_profile_path()
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with _write_lock, open(path, "a") as f:
+                f.write(json.dumps(summary) + "\n")
+        except Exception as e:
+            log(f"⚠️ Could not write wait profile for {report}: {e}")
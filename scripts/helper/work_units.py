@@ -0,0 +1,257 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+
+from scripts.helper.common_utils import log
+from scripts.helper.leases import LEASE_DB_PATH, LEASE_TTL_SECONDS
+from scripts.helper.tracing import span
+
+
+# "local" runs whole tiers on this instance's job queue; "sharded" splits them into
+# location/report work units that every process sharing WORK_UNITS_DB_PATH claims from.
+# Claims depend on SQLite locking, so the file must not be on a network mount (GCS FUSE, NFS)
+WORKER_MODE = os.environ.get("WORKER_MODE", "local")
+# Shares the lease database by default so one shared volume covers both
+WORK_UNITS_DB_PATH = os.environ.get("WORK_UNITS_DB_PATH", LEASE_DB_PATH)
+SHARD_WORKERS = int(os.environ.get("SHARD_WORKERS", "1"))
+SHARD_POLL_SECONDS = int(os.environ.get("SHARD_POLL_SECONDS", "5"))
+# A unit whose owner stopped heartbeating this many times is failed instead of re-queued
+UNIT_MAX_CLAIMS = int(os.environ.get("UNIT_MAX_CLAIMS", "3"))
+INSTANCE_ID = os.environ.get("INSTANCE_ID") or f"{socket.gethostname()}-{os.getpid()}"
+
+OPEN_STATUSES = ("pending", "running")
+COLUMNS = [
+    "id", "batch_id", "tier", "location", "report", "status", "owner", "claims",
+    "created_at", "claimed_at", "lease_expires", "finished_at", "result", "entry",
+]
+
+_workers = []
+_workers_lock = threading.Lock()
+
+
+def sharded_mode_enabled():
+    return WORKER_MODE.lower() == "sharded"
+
+
+def _connect():
+    os.makedirs(os.path.dirname(WORK_UNITS_DB_PATH), exist_ok=True)
+    con = sqlite3.connect(WORK_UNITS_DB_PATH, timeout=30, isolation_level=None)
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS work_units ("
+        " id TEXT PRIMARY KEY,"
+        " batch_id TEXT NOT NULL,"
+        " tier TEXT NOT NULL,"
+        " location TEXT NOT NULL,"
+        " report TEXT NOT NULL,"
+        " status TEXT NOT NULL,"
+        " owner TEXT,"
+        " claims INTEGER NOT NULL DEFAULT 0,"
+        " created_at REAL NOT NULL,"
+        " claimed_at REAL,"
+        " lease_expires REAL,"
+        " finished_at REAL,"
+        " result TEXT,"
+        " entry TEXT)"
+    )
+    con.execute("CREATE INDEX IF NOT EXISTS work_units_status ON work_units (status, created_at)")
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS batch_probes ("
+        " batch_id TEXT NOT NULL,"
+        " location TEXT NOT NULL,"
+        " probe TEXT NOT NULL,"
+        " probed_at REAL NOT NULL,"
+        " PRIMARY KEY (batch_id, location))"
+    )
+    return con
+
+
+def _row_to_unit(row):
+    unit = dict(zip(COLUMNS, row))
+    unit["entry"] = json.loads(unit["entry"]) if unit["entry"] else None
+    return unit
+
+
+def enqueue_units(tier, locations, reports):
+    """
+    Add one work unit per location/report of a tier run.
+    A location/report whose unit for this tier is still pending or running is not
+    queued twice; the trigger attaches to that unit instead.
+    Returns {batch_id, tier, queued: [unit ids], attached_to: {"location/report": unit id}}.
+    """
+    batch_id = uuid.uuid4().hex
+    now = time.time()
+    queued, attached_to = [], {}
+    with closing(_connect()) as con:
+        con.execute("BEGIN IMMEDIATE")
+        for location in locations:
+            for report in reports:
+                existing = con.execute(
+                    "SELECT id FROM work_units WHERE tier = ? AND location = ? AND report = ? AND status IN (?, ?)",
+                    (tier, location.lower(), report, *OPEN_STATUSES),
+                ).fetchone()
+                if existing:
+                    attached_to[f"{location.lower()}/{report}"] = existing[0]
+                    continue
+                unit_id = uuid.uuid4().hex
+                con.execute(
+                    "INSERT INTO work_units (id, batch_id, tier, location, report, status, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, 'pending', ?)",
+                    (unit_id, batch_id, tier, location.lower(), report, now),
+                )
+                queued.append(unit_id)
+        con.execute("COMMIT")
+    log(f"🧩 Queued {len(queued)} work units for tier '{tier}' (batch {batch_id}, {len(attached_to)} already open)")
+    return {"batch_id": batch_id, "tier": tier, "queued": queued, "attached_to": attached_to}
+
+
+def claim_unit(owner, ttl=None):
+    """
+    Claim the oldest pending unit whose location is not being run by anyone else.
+    Units whose owner stopped heartbeating are re-queued (or failed after
+    UNIT_MAX_CLAIMS claims) first. Returns the claimed unit or None.
+    """
+    ttl = ttl or LEASE_TTL_SECONDS
+    now = time.time()
+    with closing(_connect()) as con:
+        con.execute("BEGIN IMMEDIATE")
+        for unit_id, unit_owner, claims in con.execute(
+            "SELECT id, owner, claims FROM work_units WHERE status = 'running' AND lease_expires <= ?", (now,)
+        ).fetchall():
+            if claims >= UNIT_MAX_CLAIMS:
+                log(f"💀 Work unit {unit_id} abandoned {claims} times, giving up")
+                con.execute(
+                    "UPDATE work_units SET status = 'error', finished_at = ?, result = ? WHERE id = ?",
+                    (now, f"Error: owner {unit_owner} stopped responding {claims} times", unit_id),
+                )
+            else:
+                log(f"⌛ Work unit {unit_id} held by {unit_owner} expired, re-queueing")
+                con.execute("UPDATE work_units SET status = 'pending', owner = NULL WHERE id = ?", (unit_id,))
+
+        # One unit per location at a time: reports of a location share one FronoCloud account
+        row = con.execute(
+            "SELECT id FROM work_units WHERE status = 'pending' AND location NOT IN"
+            " (SELECT location FROM work_units WHERE status = 'running')"
+            " ORDER BY created_at, location LIMIT 1"
+        ).fetchone()
+        if row is None:
+            con.execute("COMMIT")
+            return None
+        con.execute(
+            "UPDATE work_units SET status = 'running', owner = ?, claims = claims + 1, claimed_at = ?, lease_expires = ?"
+            " WHERE id = ?",
+            (owner, now, now + ttl, row[0]),
+        )
+        unit = _row_to_unit(con.execute(f"SELECT {', '.join(COLUMNS)} FROM work_units WHERE id = ?", (row[0],)).fetchone())
+        con.execute("COMMIT")
+    return unit
+
+
+def renew_unit(unit_id, owner, ttl=None):
+    """Extend the lease on a running unit. Returns False if owner no longer holds it."""
+    ttl = ttl or LEASE_TTL_SECONDS
+    with closing(_connect()) as con:
+        cursor = con.execute(
+            "UPDATE work_units SET lease_expires = ? WHERE id = ? AND owner = ? AND status = 'running'",
+            (time.time() + ttl, unit_id, owner),
+        )
+        return cursor.rowcount == 1
+
+
+def finish_unit(unit_id, owner, entry):
+    with closing(_connect()) as con:
+        con.execute(
+            "UPDATE work_units SET status = ?, finished_at = ?, result = ?, entry = ? WHERE id = ? AND owner = ?",
+            (entry.get("status", "error"), time.time(), entry.get("result"), json.dumps(entry, default=str), unit_id, owner),
+        )
+
+
+def list_units(batch_id=None, status=None, limit=100):
+    query = f"SELECT {', '.join(COLUMNS)} FROM work_units"
+    clauses, params = [], []
+    if batch_id:
+        clauses.append("batch_id = ?")
+        params.append(batch_id)
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY created_at DESC, location, report LIMIT ?"
+    params.append(limit)
+    with closing(_connect()) as con:
+        return [_row_to_unit(row) for row in con.execute(query, params).fetchall()]
+
+
+def load_batch_probe(batch_id, location):
+    """Freshness probe results a unit of this batch already recorded for the location, or None."""
+    with closing(_connect()) as con:
+        row = con.execute(
+            "SELECT probe FROM batch_probes WHERE batch_id = ? AND location = ?", (batch_id, location.lower())
+        ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def save_batch_probe(batch_id, location, probe):
+    with closing(_connect()) as con:
+        con.execute(
+            "INSERT OR REPLACE INTO batch_probes (batch_id, location, probe, probed_at) VALUES (?, ?, ?, ?)",
+            (batch_id, location.lower(), json.dumps(probe), time.time()),
+        )
+
+
+def _heartbeat(unit_id, owner, done):
+    while not done.wait(LEASE_TTL_SECONDS / 3):
+        try:
+            if not renew_unit(unit_id, owner):
+                log(f"⚠️ {owner} lost work unit {unit_id}")
+                return
+        except Exception as e:
+            log(f"⚠️ Could not renew work unit {unit_id}: {e}")
+
+
+def _run_unit(unit, owner, runner):
+    done = threading.Event()
+    threading.Thread(target=_heartbeat, args=(unit["id"], owner, done), name=f"unit-heartbeat-{unit['id'][:8]}", daemon=True).start()
+    log(f"🧩 {owner} running {unit['location'].upper()} | {unit['report']} ({unit['tier']})")
+    try:
+        with span(f"tier {unit['tier']}", tier=unit["tier"], unit_id=unit["id"], batch_id=unit["batch_id"], worker=owner):
+            entry = runner(unit["tier"], unit["location"], unit["report"], unit["batch_id"])
+    except Exception as e:
+        entry = {"status": "error", "result": f"Error: {e}"}
+    finally:
+        done.set()
+    finish_unit(unit["id"], owner, entry)
+
+
+def _worker_loop(owner, runner):
+    while True:
+        try:
+            unit = claim_unit(owner)
+        except Exception as e:
+            log(f"⚠️ {owner} could not claim a work unit: {e}")
+            unit = None
+        if unit is None:
+            time.sleep(SHARD_POLL_SECONDS)
+            continue
+        _run_unit(unit, owner, runner)
+
+
+def start_workers(runner, workers=None):
+    """
+    Start this instance's shard workers (idempotent).
+    runner(tier, location, report, batch_id) runs one report and returns its result entry.
+    """
+    with _workers_lock:
+        if _workers:
+            return
+        for index in range(workers or SHARD_WORKERS):
+            owner = f"{INSTANCE_ID}/{index}"
+            thread = threading.Thread(target=_worker_loop, args=(owner, runner), name=f"shard-worker-{index}", daemon=True)
+            thread.start()
+            _workers.append(thread)
+    log(f"🧩 Started {len(_workers)} shard workers on {INSTANCE_ID}")
@@ -0,0 +1,70 @@
+"""
+Cold start benchmark: time `import app` and the first /status response in fresh interpreters.
+
+Usage: python -m scripts.import_benchmark [--runs 5] [--max-seconds 1.0]
+Exits non-zero when the median cold start exceeds --max-seconds or a heavy
+library (selenium, pandas, BigQuery, ...) is loaded before the first report runs.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["selenium", "pandas", "numpy", "dateutil", "pyarrow", "openpyxl", "google.cloud.bigquery"]
+
+# Runs in a fresh interpreter so nothing is already cached in sys.modules
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+response = app.app.test_client().get("/status")
+answered = time.perf_counter()
+heavy = [name for name in json.loads(sys.argv[1]) if name in sys.modules]
+started_report = time.perf_counter()
+from scripts.main import TIER_REPORTS, _resolve_report
+_resolve_report(TIER_REPORTS["every2h"]["Stock"])
+loaded_report = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - started,
+    "status_s": answered - imported,
+    "status_code": response.status_code,
+    "first_report_import_s": loaded_report - started_report,
+    "heavy_modules": heavy,
+}))
+"""
+
+
+def run_probe():
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE, json.dumps(HEAVY_MODULES)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    results = [run_probe() for _ in range(args.runs)]
+    cold_start = statistics.median(r["import_s"] + r["status_s"] for r in results)
+    heavy = sorted({name for r in results for name in r["heavy_modules"]})
+
+    print(f"⏱️ import app:           {statistics.median(r['import_s'] for r in results):.3f}s (median of {args.runs})")
+    print(f"⏱️ first /status:        {statistics.median(r['status_s'] for r in results):.3f}s")
+    print(f"⏱️ cold start total:     {cold_start:.3f}s")
+    print(f"📦 first report import:  {statistics.median(r['first_report_import_s'] for r in results):.3f}s (deferred until a report runs)")
+    print(f"📦 heavy modules at startup: {', '.join(heavy) or 'none'}")
+
+    if cold_start > args.max_seconds or heavy:
+        print(f"❌ Cold start budget of {args.max_seconds}s exceeded or heavy modules loaded eagerly")
+        sys.exit(1)
+    print("✅ Cold start within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,69 +1,48 @@
-import os
 import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
 
 from scripts.df_cleaners.cleaner import modify_sales_report_dataframe
-from scripts.helper.browser_manager import create_driver
-from scripts.helper.common_utils import ensure_download_path, load_credentials, load_dataframe, log, upload_to_bigquery, wait_for_download
-from scripts.helper.fronocloud_login import login
+from scripts.helper.common_utils import log
+from scripts.helper.metrics import stage
+from scripts.helper.report_engine import register_report, run_report
 
 
-def getItemWiseSales(location):
-    folder = "Frono_Item_Wise_Sales_Report"
-    download_path = ensure_download_path(location, folder)
-    username, password = load_credentials(location)
-    driver = create_driver(download_path)
-    actions = ActionChains(driver)
-
-    try:
-        # log("Opening FronoCloud login page and logging in...")
-        login(driver, username, password)
+def navigate_item_wise_customer(driver, actions):
+    log("Navigating to 'Item Wise Customer' report...")
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "pn_id_3_7_header"))).click()
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.LINK_TEXT, "Item Wise Customer"))).click()
+    time.sleep(2)
 
-        log("Navigating to 'Item Wise Customer' report...")
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "pn_id_3_7_header"))).click()
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.LINK_TEXT, "Item Wise Customer"))).click()
-        time.sleep(2)
+    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, "08"))).click()
+    time.sleep(2)
+    actions.key_down(Keys.ALT).send_keys('a').key_up(Keys.ALT).perform()
+    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//button[text()='Apply']"))).click()
 
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, "08"))).click()
-        time.sleep(2)
-        actions.key_down(Keys.ALT).send_keys('a').key_up(Keys.ALT).perform()
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//button[text()='Apply']"))).click()
+    time.sleep(2)
+    actions.send_keys(Keys.TAB * 3).perform()
+    driver.execute_script("arguments[0].click();", driver.switch_to.active_element)
+    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//a[text()='This Financial Year']"))).click()
 
-        time.sleep(2)
-        actions.send_keys(Keys.TAB * 3).perform()
-        driver.execute_script("arguments[0].click();", driver.switch_to.active_element)
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//a[text()='This Financial Year']"))).click()
-
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//button[text()=' Search ']"))).click()
+    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//button[text()=' Search ']"))).click()
+    with stage("report_generation"):
         time.sleep(10)
 
-        # log("Exporting to Excel...")
-        actions.send_keys(Keys.TAB * 11 + Keys.SPACE).perform()
-
-        downloaded_file = wait_for_download(download_path)
-        log(f"✅ Downloaded file saved as: {downloaded_file}")
+    # log("Exporting to Excel...")
+    actions.send_keys(Keys.TAB * 11 + Keys.SPACE).perform()
 
-        df = load_dataframe(downloaded_file)
-        
-        df = modify_sales_report_dataframe(df)
 
-        # Upload to BigQuery
-        upload_to_bigquery(df, table_name="item_wise_customer", location=location)
+ITEM_WISE_CUSTOMER_REPORT = register_report(
+    report="item_wise_customer",
+    folder="Frono_Item_Wise_Sales_Report",
+    navigate=navigate_item_wise_customer,
+    cleaner=modify_sales_report_dataframe,
+    table_name="item_wise_customer",
+    upload_mode="storage_write",
+)
 
-        # Delete file
-        os.remove(downloaded_file)
-        log(f"🗑️ Deleted local file: {downloaded_file}")
 
-        return f"Success"
-
-    except Exception as e:
-        log(f"❌ Error during scraping: {e}")
-        return f"Error: {e}"
-
-    finally:
-        log("Closing browser...")
-        driver.quit()
\ No newline at end of file
+def getItemWiseSales(location):
+    return run_report(location, ITEM_WISE_CUSTOMER_REPORT)
@@ -1,68 +1,187 @@
-from scripts.account_payable import getAccountPayable
-from scripts.account_receivable import getAccountReceivable
-from scripts.account_receivable_frono import getAccountReceivableFrono
-from scripts.broker import getBroker
-from scripts.customer import getCustomer
-from scripts.goods_return import getGoodsReturn
-from scripts.item_wise_customer_report import getItemWiseSales
-from scripts.purchase_invoice import getPurchaseInvoice
-from scripts.purchase_pending_order import getPurchasePendingOrderThis
-from scripts.purchase_pending_order2 import getPurchasePendingOrderPrevious
-from scripts.sales_invoice import getSalesInvoicePrevious, getSalesInvoiceThis
-from scripts.sales_order_details import getSalesOrderDetailsTillDate
-from scripts.sales_pending_order import getSalesPendingOrderThis
-from scripts.stock_valuation import getStockValuation
-from scripts.stock import getStock
+import datetime
+import importlib
+import time
 
+from scripts.helper.metrics import collect_report_runs
+from scripts.helper.tracing import span
+from scripts.helper.locations import get_location_names
+from scripts.helper.freshness import adaptive_scheduling_enabled, build_signature, get_max_staleness, record_success, should_run
+from scripts.helper.work_units import load_batch_probe, save_batch_probe
 
-def run_once_a_day_reports(location):
-    print(f"\n📍 Running ONCE A DAY reports for: {location.upper()}")
-    reports = {
-        "Purchase Pending Order This": getPurchasePendingOrderThis(location),
-        "Purchase Pending Order Previous": getPurchasePendingOrderPrevious(location),
-        "Purchase Invoice": getPurchaseInvoice(location),
-        "Goods Return": getGoodsReturn(location),
-        "Account Payable": getAccountPayable(location),
-        "Account Receivable": getAccountReceivable(location),
-        # "Account Receivable Frono": getAccountReceivableFrono(location),  # Uncomment if needed
-    }
-    for report, result in reports.items():
+
+TIER_LABELS = {
+    "daily": "ONCE A DAY",
+    "every2days": "ONCE IN 2 DAYS",
+    "every4h": "EVERY 4 HOURS",
+    "every2h": "EVERY 2 HOURS",
+}
+
+# Reports are referenced as "module:function" and imported on first run (see _resolve_report),
+# so importing this module does not load selenium, pandas or BigQuery for all 15 reports.
+TIER_REPORTS = {
+    "daily": {
+        "Purchase Pending Order This": "scripts.purchase_pending_order:getPurchasePendingOrderThis",
+        "Purchase Pending Order Previous": "scripts.purchase_pending_order2:getPurchasePendingOrderPrevious",
+        "Purchase Invoice": "scripts.purchase_invoice:getPurchaseInvoice",
+        "Goods Return": "scripts.goods_return:getGoodsReturn",
+        "Account Payable": "scripts.account_payable:getAccountPayable",
+        "Account Receivable": "scripts.account_receivable:getAccountReceivable",
+        # "Account Receivable Frono": "scripts.account_receivable_frono:getAccountReceivableFrono",  # Uncomment if needed
+    },
+    "every2days": {
+        "Broker": "scripts.broker:getBroker",
+        "Customer": "scripts.customer:getCustomer",
+    },
+    "every4h": {
+        "Sales Invoice This": "scripts.sales_invoice:getSalesInvoiceThis",
+        "Sales Invoice Previous": "scripts.sales_invoice:getSalesInvoicePrevious",
+        "Sales Order Details Till Date": "scripts.sales_order_details:getSalesOrderDetailsTillDate",
+        "Sales Pending Order This": "scripts.sales_pending_order:getSalesPendingOrderThis",
+        "Stock Valuation": "scripts.stock_valuation:getStockValuation",
+    },
+    "every2h": {
+        "Stock": "scripts.stock:getStock",
+        "Item Wise Customer": "scripts.item_wise_customer_report:getItemWiseSales",
+    },
+}
+
+# Probe sources whose change signals new data for a report (see scripts/freshness_probe.py).
+# Reports without an entry always run; the staleness bound covers changes the probes cannot see.
+# Only reports whose data is exactly the probed list are mapped: receivables/payables change with
+# receipts and payments, pending POs with new orders, stock with every movement, and item-wise
+# customer with sales orders, none of which show up on the invoice lists. Sales Invoice Previous
+# reads the previous financial year, whose corrections do not show on the invoice list.
+REPORT_FRESHNESS_SOURCES = {
+    "Purchase Invoice": ["purchase_invoice"],
+    "Broker": ["broker"],
+    "Customer": ["customer"],
+    "Sales Invoice This": ["sales_invoice"],
+}
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+
+
+def run_tier_reports(tier, location, on_update=None, reports=None, batch_id=None):
+    """
+    Run every report of a tier (or only the named reports) for one location, one after another.
+    With ADAPTIVE_SCHEDULING on, reports whose freshness probes are unchanged
+    since their last successful run are skipped until they hit the staleness bound.
+    With a batch_id (sharded units), the location is probed once per batch and the
+    result is shared by all of the batch's units.
+    Returns {report: {status, result, started_at, finished_at, duration_s, metrics}}.
+    on_update(report, entry) is called when a report starts and when it finishes.
+    """
+    with span(f"location {location.lower()}", tier=tier, location=location.lower()):
+        return _run_tier_reports(tier, location, on_update, reports, batch_id)
+
+
+def run_report_unit(tier, location, report, batch_id=None):
+    """Run one report of a tier as a sharded work unit; returns its result entry."""
+    return run_tier_reports(tier, location, reports=[report], batch_id=batch_id)[report]
+
+
+def _resolve_report(target):
+    """Import a "module:function" report reference and return the function."""
+    module_name, func_name = target.split(":")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def _run_tier_reports(tier, location, on_update, reports=None, batch_id=None):
+    print(f"\n📍 Running {TIER_LABELS[tier]} reports for: {location.upper()}")
+    adaptive = adaptive_scheduling_enabled()
+    selected = {report: target for report, target in TIER_REPORTS[tier].items() if reports is None or report in reports}
+    signatures = {}
+    if adaptive:
+        # A sharded unit probes every source of its tier once for the whole batch
+        probe_reports = TIER_REPORTS[tier] if batch_id else selected
+        signatures = _probe_signatures(probe_reports, location, batch_id)
+    max_staleness = get_max_staleness(tier)
+    results = {}
+    for report, target in selected.items():
+        signature = signatures.get(report)
+        if adaptive:
+            run, reason = should_run(location, report, signature, max_staleness)
+            if not run:
+                entry = {"status": "skipped", "result": f"Skipped: {reason}", "started_at": _now(), "finished_at": _now(), "duration_s": 0.0}
+                results[report] = entry
+                if on_update:
+                    on_update(report, dict(entry))
+                print(f"{location.upper()} | {report}: {entry['result']}")
+                continue
+
+        entry = {"status": "running", "result": None, "started_at": _now(), "finished_at": None, "duration_s": None}
+        results[report] = entry
+        if on_update:
+            on_update(report, dict(entry))
+
+        started = time.perf_counter()
+        with collect_report_runs() as runs:
+            try:
+                result = _resolve_report(target)(location)
+            except Exception as e:
+                result = f"Error: {e}"
+
+        entry.update({
+            "status": "success" if result == "Success" else "error",
+            "result": result,
+            "finished_at": _now(),
+            "duration_s": round(time.perf_counter() - started, 2),
+        })
+        if runs:
+            entry["metrics"] = {key: runs[-1].get(key) for key in ("stages", "rows", "columns", "bytes", "attempts", "regressions")}
+        if entry["status"] == "success":
+            record_success(location, report, signature)
+        if on_update:
+            on_update(report, dict(entry))
         print(f"{location.upper()} | {report}: {result}")
+    return results
 
-def run_once_in_2_days_reports(location):
-    print(f"\n📍 Running ONCE IN 2 DAYS reports for: {location.upper()}")
-    reports = {
-        "Broker": getBroker(location),
-        "Customer": getCustomer(location),
+
+def _probe_signatures(reports, location, batch_id=None):
+    """
+    Probe every source the reports depend on in one browser session; {report: signature}.
+    With a batch_id the probe results are stored for the batch and reused by its other units.
+    """
+    sources = sorted({source for report in reports for source in REPORT_FRESHNESS_SOURCES.get(report, [])})
+    if not sources:
+        return {}
+    probe_results = load_batch_probe(batch_id, location) if batch_id else None
+    if probe_results is None:
+        try:
+            from scripts.freshness_probe import probeSources
+
+            with span("freshness_probe", location=location.lower(), sources=",".join(sources)):
+                probe_results = probeSources(location, sources)
+        except Exception as e:
+            # Also stored for the batch, so its other units run without probing again
+            print(f"⚠️ Freshness probe failed for {location.upper()}, running all reports: {e}")
+            probe_results = {}
+        if batch_id:
+            save_batch_probe(batch_id, location, probe_results)
+    return {
+        report: build_signature(REPORT_FRESHNESS_SOURCES.get(report), probe_results)
+        for report in reports
     }
-    for report, result in reports.items():
-        print(f"{location.upper()} | {report}: {result}")
+
+
+def run_once_a_day_reports(location):
+    return run_tier_reports("daily", location)
+
+def run_once_in_2_days_reports(location):
+    return run_tier_reports("every2days", location)
 
 def run_every_4_hours_reports(location):
-    print(f"\n📍 Running EVERY 4 HOURS reports for: {location.upper()}")
-    reports = {
-        "Sales Invoice This": getSalesInvoiceThis(location),
-        "Sales Invoice Previous": getSalesInvoicePrevious(location),
-        "Sales Order Details Till Date": getSalesOrderDetailsTillDate(location),
-        "Sales Pending Order This": getSalesPendingOrderThis(location),
-        "Stock Valuation": getStockValuation(location),
-    }
-    for report, result in reports.items():
-        print(f"{location.upper()} | {report}: {result}")
+    return run_tier_reports("every4h", location)
 
 def run_every_2_hours_reports(location):
-    print(f"\n📍 Running EVERY 2 HOURS reports for: {location.upper()}")
-    reports = {
-        "Stock": getStock(location),
-        "Item Wise Customer": getItemWiseSales(location),
-    }
-    for report, result in reports.items():
-        print(f"{location.upper()} | {report}: {result}")
+    return run_tier_reports("every2h", location)
 
 
 
 if __name__ == "__main__":
-    for location in ["kolkata", "surat"]:
+    for location in get_location_names():
         run_once_a_day_reports(location)
         run_once_in_2_days_reports(location)
         run_every_4_hours_reports(location)
@@ -0,0 +1,164 @@
+"""
+Replay archived raw exports through parse -> clean -> sink, without a browser.
+
+Usage: python -m scripts.replay_archive [--location kolkata] [--report stock] [--since 2025-06-01]
+       [--all] [--workers 4] [--sink parquet] [--no-upload] [--output FILE]
+
+Exports are archived when RAW_ARCHIVE_DIR is set (see scripts/helper/raw_archive.py).
+By default the newest archive of each location/report is replayed, which backfills the
+tables after a cleaner fix. --all replays every archived file, for benchmarking
+the parse and clean stages on real data. Different location/report pairs run in
+parallel worker processes. When uploading, each pair's files run in archive order,
+so the newest export is written last.
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from scripts.helper.raw_archive import get_archive_dir, list_archived, read_archived
+
+
+def _load_registry():
+    """Import every report module so REPORTS holds all report specs; {report key: spec}."""
+    from scripts.main import TIER_REPORTS, _resolve_report
+    from scripts.helper.report_engine import REPORTS
+
+    for targets in TIER_REPORTS.values():
+        for target in targets.values():
+            _resolve_report(target)
+    return REPORTS
+
+
+def replay_entry(entry, spec, sinks=None, upload=True):
+    """Parse, clean and (optionally) store one archived export; returns its timings and outcome."""
+    from scripts.helper.common_utils import load_dataframe
+    from scripts.helper.data_cache import update_cache
+    from scripts.helper.locations import resolve_dataset
+    from scripts.helper.report_engine import get_cleaner
+    from scripts.helper.sinks import store_dataframe
+
+    record = {key: entry[key] for key in ("location", "report", "archived_at", "path")}
+    timings = {}
+    try:
+        started = time.perf_counter()
+        data = read_archived(entry["path"])
+        timings["read"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        df = load_dataframe(entry["original_name"], data=data)
+        timings["parse"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        df = get_cleaner(spec)(df)
+        timings["clean"] = time.perf_counter() - started
+        if df is None:
+            raise ValueError(f"Cleaner for {entry['report']} returned no data")
+
+        if upload:
+            started = time.perf_counter()
+            store_dataframe(
+                df,
+                table_name=spec["table_name"],
+                dataset_id=resolve_dataset(entry["location"], spec["dataset_id"]),
+                location=entry["location"],
+                custom_schema_map=spec["custom_schema_map"],
+                upload_mode=spec["upload_mode"],
+                sinks=sinks,
+            )
+            update_cache(entry["location"], entry["report"], df)
+            timings["upload"] = time.perf_counter() - started
+        record.update({"status": "success", "bytes": len(data), "rows": int(df.shape[0]), "columns": int(df.shape[1])})
+    except Exception as e:
+        record.update({"status": "error", "error": str(e)})
+    record["timings"] = {name: round(seconds, 3) for name, seconds in timings.items()}
+    return record
+
+
+def _replay_group(entries, sinks, upload):
+    """Worker process entry point: replay entries of one location/report in order."""
+    registry = _load_registry()
+    results = []
+    for entry in entries:
+        spec = registry.get(entry["report"])
+        if spec is None:
+            results.append({**entry, "status": "error", "error": f"Unknown report: {entry['report']}", "timings": {}})
+            continue
+        results.append(replay_entry(entry, spec, sinks, upload))
+    return results
+
+
+def _batches(entries, replay_all, upload):
+    groups = defaultdict(list)
+    for entry in entries:
+        groups[(entry["location"], entry["report"])].append(entry)
+    if not replay_all:
+        return [[group[-1]] for group in groups.values()]
+    if upload:
+        return list(groups.values())
+    # Nothing is written, so every file can run on its own
+    return [[entry] for entry in entries]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--location")
+    parser.add_argument("--report", help="Report key, e.g. stock or sales_invoice_this")
+    parser.add_argument("--since", help="Only archives from this UTC date/time on (ISO format)")
+    parser.add_argument("--all", action="store_true", help="Replay every archived file, not only the newest per report")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--sink", help="Comma-separated sinks (default OUTPUT_SINKS)")
+    parser.add_argument("--no-upload", action="store_true", help="Only parse and clean")
+    parser.add_argument("--output", help="Write per-file results as JSON")
+    args = parser.parse_args()
+
+    if not get_archive_dir():
+        print("❌ RAW_ARCHIVE_DIR is not set")
+        sys.exit(1)
+    since = None
+    if args.since:
+        since = datetime.datetime.fromisoformat(args.since)
+        since = since if since.tzinfo else since.replace(tzinfo=datetime.timezone.utc)
+    entries = list_archived(args.location, args.report, since)
+    if not entries:
+        print(f"❌ No archived exports in {get_archive_dir()} match")
+        sys.exit(1)
+
+    upload = not args.no_upload
+    sinks = [sink.strip().lower() for sink in args.sink.split(",")] if args.sink else None
+    workers = args.workers
+    if upload and "duckdb" in (sinks or os.environ.get("OUTPUT_SINKS", "")):
+        # DuckDB allows a single writer process per database file
+        workers = 1
+    batches = _batches(entries, args.all, upload)
+    print(f"🔁 Replaying {sum(len(batch) for batch in batches)} archived exports on {min(workers, len(batches))} workers"
+          f"{'' if upload else ' (no upload)'}")
+
+    started = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+        futures = [executor.submit(_replay_group, batch, sinks, upload) for batch in batches]
+        for future in as_completed(futures):
+            for record in future.result():
+                results.append(record)
+                timings = " ".join(f"{name} {seconds:.2f}s" for name, seconds in record["timings"].items())
+                outcome = f"{record.get('rows')} rows" if record["status"] == "success" else f"❌ {record['error']}"
+                print(f"   {record['location']}/{record['report']} @ {record['archived_at']}: {outcome} | {timings}", flush=True)
+    elapsed = time.perf_counter() - started
+
+    failed = [record for record in results if record["status"] != "success"]
+    print(f"⏱️ Replayed {len(results)} exports in {elapsed:.1f}s, {len(failed)} failed")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"elapsed_s": round(elapsed, 3), "workers": workers, "upload": upload, "results": results}, f, indent=2)
+        print(f"💾 Saved {args.output}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,121 +1,72 @@
-import os
 import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
 
 from scripts.df_cleaners.cleaner import modify_sales_invoice_dataframe
-from scripts.helper.browser_manager import create_driver
-from scripts.helper.common_utils import ensure_download_path, load_credentials, load_dataframe, log, upload_to_bigquery, wait_for_download
-from scripts.helper.fronocloud_login import login
+from scripts.helper.common_utils import log
+from scripts.helper.report_engine import register_report, run_report
 
 
-def getSalesInvoiceThis(location):
-    folder = "Frono_Sales_Invoice_Report_This"
-    download_path = ensure_download_path(location, folder)
-    username, password = load_credentials(location)
-    driver = create_driver(download_path)
-    actions = ActionChains(driver)
-
-    try:
-        # log("Logging in to FronoCloud...")
-        login(driver, username, password)
+def navigate_sales_invoice_this(driver, actions):
+    log("Navigating to Invoice page...")
+    time.sleep(2)
+    element = driver.find_element(By.CSS_SELECTOR, 'a[title="Invoice"][href*="/invoice/view"]')
+    driver.execute_script("arguments[0].click();", element)
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "globalSearch"))).click()
+    actions.send_keys(Keys.TAB).perform()
+    driver.execute_script("arguments[0].click();", driver.switch_to.active_element)
+    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//a[text()='This Financial Year']"))).click()
+    time.sleep(2)
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "globalSearch"))).click()
+    actions.send_keys(Keys.TAB * 9 + Keys.SPACE).perform()
+    time.sleep(2)
 
-        log("Navigating to Invoice page...")
-        time.sleep(2)
-        element = driver.find_element(By.CSS_SELECTOR, 'a[title="Invoice"][href*="/invoice/view"]')
-        driver.execute_script("arguments[0].click();", element)
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "globalSearch"))).click()
-        actions.send_keys(Keys.TAB).perform()
-        driver.execute_script("arguments[0].click();", driver.switch_to.active_element)
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//a[text()='This Financial Year']"))).click()
-        time.sleep(2)
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "globalSearch"))).click()
-        actions.send_keys(Keys.TAB * 9 + Keys.SPACE).perform()
-        time.sleep(2)
+    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//*[@title='Excel']"))).click()
+    time.sleep(2)
 
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//*[@title='Excel']"))).click()
-        time.sleep(2)
 
-        downloaded_file = wait_for_download(download_path)
-        log(f"✅ Downloaded file saved as: {downloaded_file}")
+SALES_INVOICE_THIS_REPORT = register_report(
+    report="sales_invoice_this",
+    folder="Frono_Sales_Invoice_Report_This",
+    navigate=navigate_sales_invoice_this,
+    cleaner=modify_sales_invoice_dataframe,
+    table_name="sales_invoice",
+)
 
-        df = load_dataframe(downloaded_file)
 
-        df = modify_sales_invoice_dataframe(df)
-
-        custom_schema = {
-            "Date": "DATE",
-            "Created_Date": "DATE",
-        }
+def getSalesInvoiceThis(location):
+    return run_report(location, SALES_INVOICE_THIS_REPORT)
 
-        # Upload to BigQuery
-        upload_to_bigquery(df, table_name="sales_invoice", location=location)
 
-        # Delete file
-        os.remove(downloaded_file)
-        log(f"🗑️ Deleted local file: {downloaded_file}")
+def navigate_sales_invoice_previous(driver, actions):
+    log("Navigating to Invoice page...")
+    time.sleep(2)
+    element = driver.find_element(By.CSS_SELECTOR, 'a[title="Invoice"][href*="/invoice/view"]')
+    driver.execute_script("arguments[0].click();", element)
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "globalSearch"))).click()
+    actions.send_keys(Keys.TAB).perform()
+    driver.execute_script("arguments[0].click();", driver.switch_to.active_element)
+    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//a[text()='Previous Financial Year']"))).click()
+    time.sleep(2)
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "globalSearch"))).click()
+    actions.send_keys(Keys.TAB * 9 + Keys.SPACE).perform()
+    time.sleep(2)
 
-        return f"Success"
+    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//*[@title='Excel']"))).click()
+    time.sleep(2)
 
-    except Exception as e:
-        log(f"❌ Error during scraping: {e}")
-        return f"Error: {e}"
 
-    finally:
-        log("Closing browser...")
-        driver.quit()
+SALES_INVOICE_PREVIOUS_REPORT = register_report(
+    report="sales_invoice_previous",
+    folder="Frono_Sales_Invoice_Report_Previous",
+    navigate=navigate_sales_invoice_previous,
+    cleaner=modify_sales_invoice_dataframe,
+    table_name="sales_invoice",
+    dataset_id="frono",
+)
 
 
 def getSalesInvoicePrevious(location):
-    folder = "Frono_Sales_Invoice_Report_Previous"
-    download_path = ensure_download_path(location, folder)
-    username, password = load_credentials(location)
-    driver = create_driver(download_path)
-    actions = ActionChains(driver)
-
-    try:
-        log("Logging in to FronoCloud...")
-        login(driver, username, password)
-
-        log("Navigating to Invoice page...")
-        time.sleep(2)
-        element = driver.find_element(By.CSS_SELECTOR, 'a[title="Invoice"][href*="/invoice/view"]')
-        driver.execute_script("arguments[0].click();", element)
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "globalSearch"))).click()
-        actions.send_keys(Keys.TAB).perform()
-        driver.execute_script("arguments[0].click();", driver.switch_to.active_element)
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//a[text()='Previous Financial Year']"))).click()
-        time.sleep(2)
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "globalSearch"))).click()
-        actions.send_keys(Keys.TAB * 9 + Keys.SPACE).perform()
-        time.sleep(2)
-
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//*[@title='Excel']"))).click()
-        time.sleep(2)
-
-        downloaded_file = wait_for_download(download_path)
-        log(f"✅ Downloaded file saved as: {downloaded_file}")
-
-        df = load_dataframe(downloaded_file)
-
-        df = modify_sales_invoice_dataframe(df)
-
-        # Upload to BigQuery
-        upload_to_bigquery(df, dataset_id="frono", table_name="sales_invoice", location=location)
-
-        # Delete file
-        os.remove(downloaded_file)
-        log(f"🗑️ Deleted local file: {downloaded_file}")
-
-        return f"Success"
-
-    except Exception as e:
-        log(f"❌ Error during scraping: {e}")
-        return f"Error: {e}"
-
-    finally:
-        log("Closing browser...")
-        driver.quit()
+    return run_report(location, SALES_INVOICE_PREVIOUS_REPORT)
@@ -0,0 +1,3 @@
+"""
+Local FronoCloud stand-in for offline end-to-end runs.
+"""
@@ -0,0 +1,160 @@
+import datetime
+import io
+import random
+
+
+# Row layouts follow the real FronoCloud exports closely enough for scripts/df_cleaners/cleaner.py
+CUSTOMERS = ["ANAND TEXTILES", "BHARAT FASHION", "CITY STYLE", "DEEPAK STORES", "EVERGREEN MART", "FASHION HUB"]
+VENDORS = ["KRISHNA FABRICS", "LAXMI MILLS", "MAHESH PRINTS", "NAVKAR TEXTILE"]
+BROKERS = ["RAJESH", "SUNIL", "VIKAS", "DIRECT"]
+COLORS = ["RED", "BLUE", "GREEN", "BLACK", "WHITE", "PINK", "YELLOW", "MAROON"]
+SIZE_GROUPS = ["38-44", "40-46", "48-52"]
+
+
+def _date(rng, days=365):
+    day = datetime.date.today() - datetime.timedelta(days=rng.randrange(days))
+    return day.strftime("%d/%m/%Y")
+
+
+def design_codes(count):
+    return [f"D{1000 + i}" for i in range(count)]
+
+
+def sales_invoice_rows(rows, seed=1):
+    rng = random.Random(seed)
+    data = []
+    for i in range(rows):
+        amount = round(rng.uniform(1000, 90000), 2)
+        data.append({
+            "": i + 1,
+            "Invoice No": f"SI/{25000 + i}",
+            "Date": _date(rng),
+            "Customer Name": rng.choice(CUSTOMERS),
+            "Broker": rng.choice(BROKERS),
+            "Qty": rng.randrange(1, 200),
+            "Net Amount": amount,
+            "Created Date": _date(rng, 30),
+        })
+    return data
+
+
+def purchase_invoice_rows(rows, seed=2):
+    rng = random.Random(seed)
+    data = []
+    for i in range(rows):
+        data.append({
+            "": i + 1,
+            "Bill No": f"PI/{8000 + i}",
+            "Date": _date(rng),
+            "Inv Date": _date(rng),
+            "Vendor Name": rng.choice(VENDORS),
+            "Qty": rng.randrange(1, 500),
+            "Net Amount": round(rng.uniform(5000, 200000), 2),
+            "Created Date": _date(rng, 30),
+        })
+    return data
+
+
+def customer_rows(rows, seed=3):
+    rng = random.Random(seed)
+    return [{"Name": f"{rng.choice(CUSTOMERS)} {i}", "City": rng.choice(["KOLKATA", "SURAT"]), "Broker": rng.choice(BROKERS)} for i in range(rows)]
+
+
+def broker_rows(rows, seed=4):
+    return [{"Name": f"{BROKERS[i % len(BROKERS)]} {i}", "Commission": "2%"} for i in range(rows)]
+
+
+def _sales_invoice(rows, seed):
+    import pandas as pd
+
+    df = pd.DataFrame(sales_invoice_rows(rows, seed))
+    total = {column: "" for column in df.columns}
+    total.update({"Invoice No": "Total", "Qty": int(df["Qty"].sum()), "Net Amount": round(df["Net Amount"].sum(), 2)})
+    return pd.concat([df, pd.DataFrame([total])], ignore_index=True)
+
+
+def _purchase_invoice(rows, seed):
+    import pandas as pd
+
+    return pd.DataFrame(purchase_invoice_rows(rows, seed))
+
+
+def _stock(rows, seed):
+    import pandas as pd
+
+    rng = random.Random(seed)
+    data = [{
+        "Item": code,
+        "Color": rng.choice(COLORS),
+        "Size Group": rng.choice(SIZE_GROUPS),
+        "Opening": rng.randrange(0, 300),
+        "Inward": rng.randrange(0, 300),
+        "Outward": rng.randrange(0, 300),
+        "Closing": rng.randrange(0, 300),
+    } for code in design_codes(rows)]
+    data.append({"Item": "Grand Total", "Color": None, "Size Group": None, "Opening": 0, "Inward": 0, "Outward": 0, "Closing": 0})
+    return pd.DataFrame(data)
+
+
+def _pending_po(rows, seed):
+    import pandas as pd
+
+    # A vendor title row, then that vendor's lines numbered from 1 in the first column
+    rng = random.Random(seed)
+    data, serial = [], 0
+    for i in range(rows):
+        if i % 10 == 0:
+            data.append({"Vendor": rng.choice(VENDORS), "Item Name": None})
+            serial = 0
+        serial += 1
+        data.append({
+            "Vendor": serial,
+            "Item Name": f"D{1000 + i}",
+            "PO No": f"PO/{3000 + i}",
+            "PO Date": _date(rng),
+            "Last Delivery Date": _date(rng, 60),
+            "Order Qty": rng.randrange(10, 500),
+            "Pending Qty": rng.randrange(0, 10),
+        })
+    return pd.DataFrame(data)
+
+
+def _item_wise_customer(rows, seed):
+    import pandas as pd
+
+    # Per item/color: a title row, a "Size" header row, order lines and a "Total" row
+    rng = random.Random(seed)
+    data, serial = [], 0
+    for i in range(rows):
+        if i % 5 == 0:
+            serial += 1
+            data.append({"Sr No": serial, "Item": f"D{1000 + serial}", "Color": rng.choice(COLORS)})
+            data.append({"Date": "Size", "Size Group": "Size Group", "Total": None})
+        data.append({
+            "Date": _date(rng),
+            "Order No": f"SO/{40000 + i}",
+            "Customer Name": rng.choice(CUSTOMERS),
+            "Size Group": rng.choice(SIZE_GROUPS),
+            "Total": rng.randrange(1, 60),
+        })
+        if i % 5 == 4 or i == rows - 1:
+            data.append({"Date": "Total", "Total": 0})
+    columns = ["Sr No", "Item", "Color", "Date", "Order No", "Customer Name", "Size Group", "Total"]
+    return pd.DataFrame(data, columns=columns)
+
+
+EXPORTS = {
+    "sales_invoice": ("SalesInvoice", _sales_invoice),
+    "purchase_invoice": ("PurchaseInvoice", _purchase_invoice),
+    "stock": ("StockSummary", _stock),
+    "pending_purchase_order": ("PendingPurchaseOrder", _pending_po),
+    "item_wise_customer": ("ItemWiseCustomer", _item_wise_customer),
+}
+
+
+def build_export(report, rows, seed=0):
+    """Excel bytes for one report export, plus the file name FronoCloud would give it."""
+    prefix, build = EXPORTS[report]
+    buffer = io.BytesIO()
+    build(rows, seed + len(report)).to_excel(buffer, index=False)
+    return f"{prefix}_{datetime.datetime.now():%Y%m%d%H%M%S}.xlsx", buffer.getvalue()
@@ -0,0 +1,375 @@
+# Jinja templates for the stand-in pages. Element ids, titles, texts and the tab order
+# mirror what the report scripts and add_new_item.py drive with Selenium, so keep them
+# in step with those scripts (e.g. Excel is 9 TABs after globalSearch on invoice lists,
+# and 11 TABs after Search on report pages).
+
+HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>{{ title }} | FronoCloud stand-in</title>
+    <style>
+        body { font-family: 'Segoe UI', sans-serif; margin: 0; display: flex; }
+        nav { width: 200px; background: #f1f3f5; min-height: 100vh; padding: 10px; }
+        nav a, nav .p-accordion-header { display: block; padding: 4px 0; cursor: pointer; }
+        main { padding: 20px; flex: 1; }
+        table { border-collapse: collapse; margin-top: 10px; }
+        td, th { border: 1px solid #ddd; padding: 2px 8px; }
+        .p-dialog { position: absolute; top: 60px; left: 260px; background: white; border: 1px solid #999; padding: 15px; }
+    </style>
+    <script>
+        function toggle(id) {
+            const el = document.getElementById(id);
+            el.style.display = el.style.display === 'none' ? '' : 'none';
+        }
+        function hide(id) { document.getElementById(id).style.display = 'none'; }
+        function show(id) { document.getElementById(id).style.display = ''; }
+        // Client-side table with a PrimeNG-like paginator; rows are arrays of cell HTML
+        function pagedTable(tableId, rows, pageSize) {
+            const state = {rows: rows, filtered: rows, page: 0, size: pageSize};
+            state.render = function () {
+                const pages = Math.max(1, Math.ceil(state.filtered.length / state.size));
+                state.page = Math.min(state.page, pages - 1);
+                const start = state.page * state.size;
+                const visible = state.filtered.slice(start, start + state.size);
+                document.querySelector('#' + CSS.escape(tableId) + ' tbody').innerHTML =
+                    visible.map(cells => '<tr>' + cells.map(c => '<td>' + c + '</td>').join('') + '</tr>').join('');
+                document.querySelector('.p-paginator-current').innerText = 'Showing ' + (visible.length ? start + 1 : 0) +
+                    ' to ' + (start + visible.length) + ' of ' + state.filtered.length + ' entries';
+                const next = document.querySelector('.p-paginator-next');
+                next.disabled = state.page >= pages - 1;
+                next.classList.toggle('p-disabled', next.disabled);
+            };
+            state.filter = function (text) {
+                text = text.trim().toUpperCase();
+                state.filtered = text ? state.rows.filter(cells => cells.join(' ').toUpperCase().includes(text)) : state.rows;
+                state.page = 0;
+                state.render();
+            };
+            document.querySelector('.p-paginator-next').onclick = function () { state.page += 1; state.render(); };
+            document.querySelectorAll('.p-dropdown-item').forEach(option => option.onclick = function () {
+                state.size = parseInt(option.innerText, 10);
+                state.page = 0;
+                hide('rppItems');
+                state.render();
+            });
+            state.render();
+            return state;
+        }
+    </script>
+</head>
+<body>
+<nav>
+    <a title="Dashboard" href="/dashboard">Dashboard</a>
+    <a title="Invoice" href="/invoice/view">Sales Invoice</a>
+    <a title="Invoice" href="/purchase/view">Purchase Invoice</a>
+    <a title="Stock" href="/stock">Stock</a>
+    <a title="Customer" href="/contact/customer/view">Customer</a>
+    <a title="Broker" href="/broker/view">Broker</a>
+    <a title="Item" href="/item/view">Item</a>
+    <div class="p-accordion-header" id="pn_id_3_7_header" onclick="toggle('reportsMenu')">Reports</div>
+    <div id="reportsMenu" style="display: none">
+        <a href="/report/item-wise-customer">Item Wise Customer</a>
+        <a href="/report/pending-purchase-order">Pending Purchase Order</a>
+    </div>
+</nav>
+<main>
+<h3>{{ title }}</h3>
+"""
+
+FOOT = """
+</main>
+</body>
+</html>
+"""
+
+PAGINATOR = """
+<div class="p-paginator">
+    <span class="p-paginator-current"></span>
+    <button type="button" class="p-paginator-next">Next</button>
+    <span class="p-paginator-rpp-options" onclick="toggle('rppItems')">Rows</span>
+    <ul id="rppItems" style="display: none">
+        <li class="p-dropdown-item">10</li><li class="p-dropdown-item">50</li><li class="p-dropdown-item">100</li><li class="p-dropdown-item">500</li>
+    </ul>
+</div>
+"""
+
+LOGIN = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="UTF-8"><title>Login | FronoCloud stand-in</title></head>
+<body>
+<form method="post" action="/login">
+    <input type="text" name="userName" placeholder="User name">
+    <input type="password" name="password" placeholder="Password">
+    <button type="submit">Login</button>
+</form>
+</body>
+</html>
+"""
+
+DASHBOARD = HEAD + """<p>Signed in as {{ user }}.</p>""" + FOOT
+
+DATE_MENU = """
+<div id="dateMenu" style="display: none">
+    <a href="#" onclick="pickRange(this); return false;">This Financial Year</a>
+    <a href="#" onclick="pickRange(this); return false;">Previous Financial Year</a>
+    <a href="#" onclick="pickRange(this); return false;">Till Date</a>
+</div>
+<script>
+    let range = 'This Month';
+    function pickRange(link) {
+        range = link.innerText;
+        document.getElementById('dateRange').innerText = range;
+        hide('dateMenu');
+    }
+</script>
+"""
+
+# Invoice lists: globalSearch, the date range button, seven toolbar buttons, then Export
+INVOICE_LIST = HEAD + """
+<div class="toolbar">
+    <input id="globalSearch" placeholder="Search">
+    <button type="button" id="dateRange" onclick="toggle('dateMenu')">This Month</button>
+    """ + DATE_MENU + """
+    {% for name in ["Add", "Filter", "Columns", "Refresh", "Print", "Email", "SMS"] %}<button type="button">{{ name }}</button>
+    {% endfor %}
+    <button type="button" onclick="toggle('exportMenu')">Export</button>
+    <div id="exportMenu" style="display: none">
+        <a href="#" title="Excel" onclick="exportExcel(); return false;">Excel</a>
+        <a href="#" title="PDF" onclick="return false;">PDF</a>
+    </div>
+</div>
+<table id="listTable"><thead><tr>{% for header in headers %}<th>{{ header }}</th>{% endfor %}</tr></thead><tbody></tbody></table>
+""" + PAGINATOR + """
+<script>
+    const table = pagedTable('listTable', {{ rows|tojson }}, 10);
+    document.getElementById('globalSearch').addEventListener('keydown', e => { if (e.key === 'Enter') { table.filter(e.target.value); } });
+    function exportExcel() {
+        hide('exportMenu');
+        window.location = '/export/{{ export }}?range=' + encodeURIComponent(range);
+    }
+</script>
+""" + FOOT
+
+# Plain lists (customers, brokers) read by the freshness probe
+LIST = HEAD + """
+<input id="globalSearch" placeholder="Search">
+<table id="listTable"><thead><tr>{% for header in headers %}<th>{{ header }}</th>{% endfor %}</tr></thead><tbody></tbody></table>
+""" + PAGINATOR + """
+<script>pagedTable('listTable', {{ rows|tojson }}, 10);</script>
+""" + FOOT
+
+STOCK = HEAD + """
+<button type="button" onclick="window.location = '/stock/summary'">Stock Summary</button>
+<button type="button">Stock Ledger</button>
+""" + FOOT
+
+# Report filters in tab order: report type radios, zero-stock checkbox, the #08 multiselect,
+# two text filters, the date range, Search and Clear. Results (a toolbar of nine
+# buttons, then Excel) appear STANDIN_REPORT_SECONDS after Search.
+REPORT = HEAD + """
+{% if vendor_tabs %}
+<ul class="nav nav-tabs">
+    <li><a id="itemWise-tab-justified" href="#" onclick="return false;">Item Wise</a></li>
+    <li><a id="vendorWise-tab-justified" href="#" onclick="return false;">Vendor Wise</a></li>
+</ul>
+{% endif %}
+<div class="filters">
+    <label><input type="radio" name="reportType" value="summary" checked> Summary</label>
+    <label><input type="radio" name="reportType" value="detail"> Detail</label>
+    <label><input type="checkbox" id="withZero"> With Zero</label>
+    <button type="button" id="08" onclick="toggle('msPanel')">Item Group</button>
+    <div id="msPanel" class="p-multiselect-panel" style="display: none">
+        {% for group in ["KURTI", "SUIT", "DUPATTA"] %}<label><input type="checkbox" class="ms-option" value="{{ group }}"> {{ group }}</label>
+        {% endfor %}
+        <button type="button" onclick="applyGroups()">Apply</button>
+    </div>
+    <input id="partyFilter" placeholder="Party">
+    <input id="itemFilter" placeholder="Item">
+    <button type="button" id="dateRange" onclick="toggle('dateMenu')">This Month</button>
+    """ + DATE_MENU + """
+    <button type="button" onclick="runSearch()"> Search </button>
+    <button type="button" onclick="clearFilters()"> Clear </button>
+</div>
+<p id="loading" style="display: none">Generating report...</p>
+<div id="results" style="display: none">
+    <div class="toolbar">
+        {% for name in ["First", "Previous", "Next", "Last", "Zoom In", "Zoom Out", "Fit", "Print", "PDF"] %}<button type="button">{{ name }}</button>
+        {% endfor %}
+        <button type="button" title="Excel" onclick="exportExcel()">Excel</button>
+    </div>
+    <table id="reportTable"><tbody></tbody></table>
+</div>
+{% if ms_item %}<label><input type="checkbox" id="msItem">MS Item</label>{% endif %}
+<script>
+    document.addEventListener('keydown', e => {
+        const panelOpen = document.getElementById('msPanel').style.display !== 'none';
+        if (panelOpen && e.altKey && (e.key === 'a' || e.key === 'A' || e.code === 'KeyA')) {
+            e.preventDefault();
+            document.querySelectorAll('.ms-option').forEach(option => option.checked = true);
+        }
+    });
+    function applyGroups() {
+        hide('msPanel');
+        document.getElementById('08').focus();
+    }
+    function clearFilters() {
+        document.querySelectorAll('.ms-option').forEach(option => option.checked = false);
+        hide('results');
+    }
+    function runSearch() {
+        hide('results');
+        show('loading');
+        setTimeout(() => {
+            hide('loading');
+            document.querySelector('#reportTable tbody').innerHTML = '<tr><td>' + range + '</td></tr>';
+            show('results');
+        }, {{ report_ms }});
+    }
+    function exportExcel() {
+        window.location = '/export/{{ export }}?range=' + encodeURIComponent(range);
+    }
+</script>
+""" + FOOT
+
+ITEMS = HEAD + """
+<input id="globalSearch" placeholder="Search">
+<button type="button" onclick="window.location = '/item/add'"> Add New Item </button>
+<table id="pn_id_3-table">
+    <thead><tr><th>Product Code</th><th>Product Name</th><th>Category</th><th>Action</th></tr></thead>
+    <tbody></tbody>
+</table>
+""" + PAGINATOR + """
+<script>
+    const rows = {{ items|tojson }}.map(item => [
+        '<div>' + item.code + '</div>',
+        '<div>' + item.name + '</div>',
+        '<div>' + item.category.trim() + '</div>',
+        '<button type="button" class="edit" onclick="window.location = \\'/item/edit/' + encodeURIComponent(item.code) +
+            '\\'"><i class="pi pi-pencil"></i> Edit</button>',
+    ]);
+    const table = pagedTable('pn_id_3-table', rows, 10);
+    document.getElementById('globalSearch').addEventListener('keydown', e => { if (e.key === 'Enter') { table.filter(e.target.value); } });
+</script>
+""" + FOOT
+
+# The Add/Edit Item form. Button texts matter: the size set dialog's "Add" must be the first
+# button containing "Add", the save button the first containing " Add" / " Update", and
+# "OK" only appears in the color dialog. Sizes are ticked by tabbing from the Size Set
+# button: TAB to Reset, TAB to the first size, then one TAB per size.
+ITEM_FORM = HEAD + """
+<div>
+    <input id="productname" placeholder="Product Name" value="{{ item.name if item else '' }}">
+    <input id="productcode" placeholder="Product Code" value="{{ item.code if item else '' }}" {{ 'readonly' if item else '' }}>
+</div>
+<div>
+    {% for field, options in dropdowns.items() %}
+    <select id="{{ field }}">
+        <option value="">Select</option>
+        {% for option in options %}<option{{ ' selected' if item and item[field] == option else '' }}>{{ option }}</option>{% endfor %}
+    </select>
+    {% endfor %}
+</div>
+<div>
+    <button type="button" onclick="show('colorDialog')">Select Color</button>
+    <span id="colorSummary"></span>
+</div>
+<div>
+    <select id="sizeGrp"><option value="">Select</option><option>Kurti Sizes</option></select>
+    <button type="button" id="sizeSetButton" onclick="show('sizeSetDialog')"><span>Size Set</span></button>
+    <button type="button" onclick="document.querySelectorAll('.size-cb').forEach(cb => cb.checked = false)">Reset</button>
+    {% for size in sizes %}<label><input type="checkbox" class="size-cb" value="{{ size }}"{{ ' checked' if item and size in item.sizes else '' }}> {{ size }}</label>
+    {% endfor %}
+    <span id="sizeSetSummary">{{ item.size_sets|join(', ') if item else '' }}</span>
+</div>
+
+<div id="colorDialog" class="p-dialog" role="dialog" style="display: none">
+    <label><input type="checkbox" id="allColors"> All Colors </label>
+    <table id="colorTable"><tbody></tbody></table>
+    <input id="colorname" placeholder="Color Name">
+    <input id="colorcode" placeholder="Color Code">
+    <button type="button" onclick="createColor()">Create</button>
+    <button type="button" onclick="closeColors()">OK</button>
+</div>
+
+<div id="sizeSetDialog" class="p-dialog" role="dialog" style="display: none">
+    <table id="sizeSetTable"><tbody>
+        {% for name in size_sets %}<tr><td><input type="checkbox" class="size-set-cb" value="{{ name }}"></td><td>{{ name }}</td></tr>
+        {% endfor %}
+    </tbody></table>
+    <button type="button" onclick="addSizeSets()">Add</button>
+</div>
+
+<button type="button" onclick="saveItem()"> {{ 'Update' if item else 'Add' }} </button>
+
+<script>
+    const selectedColors = new Set({{ (item.colors if item else [])|tojson }});
+    const sizeSets = new Set({{ (item.size_sets if item else [])|tojson }});
+
+    // Clicking a checkbox cell (not just the box) toggles it, like the PrimeNG tables
+    function checkboxCell(td) {
+        td.addEventListener('click', e => {
+            if (e.target.tagName !== 'INPUT') { td.querySelector('input').click(); }
+        });
+    }
+    function addColorRow(name) {
+        const tr = document.createElement('tr');
+        tr.innerHTML = '<td><input type="checkbox" class="color-cb"></td><td></td>';
+        tr.cells[1].innerText = name;
+        const cb = tr.querySelector('input');
+        cb.value = name;
+        cb.checked = selectedColors.has(name);
+        checkboxCell(tr.cells[0]);
+        document.querySelector('#colorTable tbody').appendChild(tr);
+    }
+    {{ colors|tojson }}.forEach(addColorRow);
+    document.querySelectorAll('#sizeSetTable td:first-child').forEach(checkboxCell);
+
+    async function createColor() {
+        const name = document.getElementById('colorname').value.trim().toUpperCase();
+        const code = document.getElementById('colorcode').value.trim();
+        if (!name) { return; }
+        const response = await fetch('/api/colors', {
+            method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({name: name, code: code}),
+        });
+        if (response.ok) {
+            addColorRow(name);
+            document.getElementById('colorname').value = '';
+            document.getElementById('colorcode').value = '';
+        }
+    }
+    function closeColors() {
+        document.querySelectorAll('.color-cb:checked').forEach(cb => selectedColors.add(cb.value));
+        document.getElementById('colorSummary').innerText = Array.from(selectedColors).join(', ');
+        hide('colorDialog');
+    }
+    function addSizeSets() {
+        document.querySelectorAll('.size-set-cb:checked').forEach(cb => { sizeSets.add(cb.value); cb.checked = false; });
+        document.getElementById('sizeSetSummary').innerText = Array.from(sizeSets).join(', ');
+        hide('sizeSetDialog');
+        document.getElementById('sizeSetButton').focus();
+    }
+    async function saveItem() {
+        const payload = {
+            name: document.getElementById('productname').value,
+            code: document.getElementById('productcode').value,
+            colors: Array.from(selectedColors),
+            size_sets: Array.from(sizeSets),
+            sizes: Array.from(document.querySelectorAll('.size-cb:checked')).map(cb => parseInt(cb.value, 10)),
+        };
+        {{ dropdowns.keys()|list|tojson }}.forEach(field => {
+            const select = document.getElementById(field);
+            payload[field] = select.selectedIndex > 0 ? select.options[select.selectedIndex].text : '';
+        });
+        const response = await fetch('{{ save_url }}', {
+            method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify(payload),
+        });
+        const result = await response.json();
+        const alert = document.createElement('div');
+        alert.setAttribute('role', 'alert');
+        alert.setAttribute('aria-label', result.message);
+        alert.innerText = result.message;
+        document.querySelector('main').prepend(alert);
+    }
+</script>
+""" + FOOT
@@ -0,0 +1,259 @@
+"""
+Local FronoCloud stand-in: serves the pages, element ids and Excel exports the report
+scripts and add_new_item.py drive, so tiers can run end to end without the real site.
+
+Usage: python -m scripts.standin.server [--port 5055] [--latency-ms 0] [--rows 200]
+Then point the scrapers at it with FRONO_BASE_URL=http://localhost:5055.
+
+Any user name and password log in. Latency is added to every request; rows sets the
+size of each export and list; report generation takes STANDIN_REPORT_SECONDS.
+"""
+import argparse
+import os
+import threading
+import time
+import zlib
+
+from flask import Flask, Response, jsonify, redirect, render_template_string, request
+
+from scripts.standin import pages
+from scripts.standin.exports import EXPORTS, broker_rows, build_export, customer_rows, design_codes, purchase_invoice_rows, sales_invoice_rows
+
+
+STANDIN_LATENCY_MS = int(os.environ.get("STANDIN_LATENCY_MS", "0"))
+STANDIN_ROWS = int(os.environ.get("STANDIN_ROWS", "200"))
+STANDIN_ITEMS = int(os.environ.get("STANDIN_ITEMS", "50"))
+STANDIN_REPORT_SECONDS = float(os.environ.get("STANDIN_REPORT_SECONDS", "2"))
+
+SESSION_COOKIE = "standin_session"
+
+# Option texts as the real form shows them, leading/trailing spaces included (see DROPDOWN_OPTIONS in add_new_item.py)
+DROPDOWNS = {
+    "unit": [" Pieces", " Meters"],
+    "glaccount": [" Purchase", " Sales"],
+    "category": [" Finish goods", " Raw material"],
+    "subcategory": [" Kurti", " Suit"],
+    "brand": ["OLIVIA ", "OTHER "],
+    "group": [" PK", " NP"],
+}
+SIZE_SETS = ["38-44", "40-46", "48-52"]
+ALL_SIZES = [36, 38, 40, 42, 44, 46, 48, 50, 52, 60]
+
+app = Flask(__name__)
+app.config["STANDIN"] = {"latency_ms": STANDIN_LATENCY_MS, "rows": STANDIN_ROWS, "report_seconds": STANDIN_REPORT_SECONDS}
+
+_state_lock = threading.Lock()
+_items = {}
+_colors = ["RED", "BLUE", "GREEN", "BLACK", "WHITE"]
+
+
+def reset_state(items=None):
+    """Seed the item master with `items` designs (STANDIN_ITEMS by default) and the default colors."""
+    with _state_lock:
+        _items.clear()
+        for code in design_codes(STANDIN_ITEMS if items is None else items):
+            _items[code] = {
+                "code": code, "name": code, "unit": " Pieces", "glaccount": " Purchase", "category": " Finish goods",
+                "subcategory": " Kurti", "brand": "OLIVIA ", "group": " PK",
+                "colors": ["RED"], "size_sets": ["38-44"], "sizes": [38, 40, 42, 44],
+            }
+        _colors[:] = ["RED", "BLUE", "GREEN", "BLACK", "WHITE"]
+
+
+def _settings():
+    return app.config["STANDIN"]
+
+
+@app.before_request
+def simulate_latency():
+    latency_ms = _settings()["latency_ms"]
+    if latency_ms:
+        time.sleep(latency_ms / 1000)
+    if request.endpoint not in ("login", "status") and not request.cookies.get(SESSION_COOKIE):
+        return redirect("/login")
+
+
+@app.route("/status")
+def status():
+    return jsonify({"status": "ok", "items": len(_items), **_settings()})
+
+
+@app.route("/login", methods=["GET", "POST"])
+def login():
+    if request.method == "GET":
+        return pages.LOGIN
+    response = redirect("/dashboard")
+    response.set_cookie(SESSION_COOKIE, request.form.get("userName") or "user")
+    return response
+
+
+@app.route("/dashboard")
+def dashboard():
+    return render_template_string(pages.DASHBOARD, title="Dashboard", user=request.cookies.get(SESSION_COOKIE))
+
+
+def _table(rows):
+    headers = list(rows[0]) if rows else []
+    return headers, [[str(row[header]) for header in headers] for row in rows]
+
+
+@app.route("/invoice/view")
+def sales_invoices():
+    headers, rows = _table(sales_invoice_rows(_settings()["rows"]))
+    return render_template_string(pages.INVOICE_LIST, title="Sales Invoice", headers=headers, rows=rows, export="sales_invoice")
+
+
+@app.route("/purchase/view")
+def purchase_invoices():
+    headers, rows = _table(purchase_invoice_rows(_settings()["rows"]))
+    return render_template_string(pages.INVOICE_LIST, title="Purchase Invoice", headers=headers, rows=rows, export="purchase_invoice")
+
+
+@app.route("/contact/customer/view")
+def customers():
+    headers, rows = _table(customer_rows(_settings()["rows"]))
+    return render_template_string(pages.LIST, title="Customer", headers=headers, rows=rows)
+
+
+@app.route("/broker/view")
+def brokers():
+    headers, rows = _table(broker_rows(_settings()["rows"]))
+    return render_template_string(pages.LIST, title="Broker", headers=headers, rows=rows)
+
+
+@app.route("/stock")
+def stock():
+    return render_template_string(pages.STOCK, title="Stock")
+
+
+def _report_page(title, export, **flags):
+    return render_template_string(
+        pages.REPORT, title=title, export=export, report_ms=int(_settings()["report_seconds"] * 1000),
+        vendor_tabs=flags.get("vendor_tabs", False), ms_item=flags.get("ms_item", False),
+    )
+
+
+@app.route("/stock/summary")
+def stock_summary():
+    return _report_page("Stock Summary", "stock")
+
+
+@app.route("/report/item-wise-customer")
+def item_wise_customer():
+    return _report_page("Item Wise Customer", "item_wise_customer")
+
+
+@app.route("/report/pending-purchase-order")
+def pending_purchase_order():
+    return _report_page("Pending Purchase Order", "pending_purchase_order", vendor_tabs=True, ms_item=True)
+
+
+@app.route("/export/<report>")
+def export(report):
+    if report not in EXPORTS:
+        return jsonify({"error": f"Unknown export: {report}"}), 404
+    # Each date range gets its own (stable) data
+    seed = zlib.crc32(request.args.get("range", "").encode("utf-8"))
+    filename, data = build_export(report, _settings()["rows"], seed)
+    return Response(data, mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", headers={
+        "Content-Disposition": f"attachment; filename={filename}",
+    })
+
+
+@app.route("/item/view")
+def items():
+    with _state_lock:
+        listed = list(_items.values())
+    return render_template_string(pages.ITEMS, title="Item", items=listed)
+
+
+def _item_form(item, save_url):
+    with _state_lock:
+        colors = list(_colors)
+    return render_template_string(
+        pages.ITEM_FORM, title="Edit Item" if item else "Add Item", item=item, save_url=save_url,
+        dropdowns=DROPDOWNS, colors=colors, size_sets=SIZE_SETS, sizes=ALL_SIZES,
+    )
+
+
+@app.route("/item/add")
+def add_item():
+    return _item_form(None, "/api/items")
+
+
+@app.route("/item/edit/<code>")
+def edit_item(code):
+    with _state_lock:
+        item = _items.get(code)
+    if item is None:
+        return redirect("/item/view")
+    return _item_form(item, f"/api/items/{code}")
+
+
+@app.route("/api/colors", methods=["POST"])
+def create_color():
+    name = (request.get_json(silent=True) or {}).get("name", "").strip().upper()
+    if not name:
+        return jsonify({"message": "Color name is required"}), 400
+    with _state_lock:
+        if name not in _colors:
+            _colors.append(name)
+    return jsonify({"message": "Successfully added", "name": name})
+
+
+def _missing_fields(payload):
+    missing = [field for field in DROPDOWNS if not payload.get(field)]
+    if not payload.get("colors"):
+        missing.append("colors")
+    if not payload.get("sizes"):
+        missing.append("sizes")
+    return missing
+
+
+@app.route("/api/items", methods=["POST"])
+def save_item():
+    payload = request.get_json(silent=True) or {}
+    code = payload.get("code", "").strip()
+    missing = _missing_fields(payload)
+    if not code or missing:
+        return jsonify({"message": f"Missing {', '.join(missing) or 'code'}"})
+    with _state_lock:
+        if code in _items:
+            return jsonify({"message": "Item already exists"})
+        _items[code] = {**payload, "code": code, "name": payload.get("name") or code}
+    return jsonify({"message": "Successfully added"})
+
+
+@app.route("/api/items/<code>", methods=["POST"])
+def update_item(code):
+    payload = request.get_json(silent=True) or {}
+    with _state_lock:
+        if code not in _items:
+            return jsonify({"message": "Item not found"}), 404
+        missing = _missing_fields(payload)
+        if missing:
+            return jsonify({"message": f"Missing {', '.join(missing)}"})
+        _items[code].update({key: value for key, value in payload.items() if key != "code"})
+    return jsonify({"message": "Successfully updated"})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--latency-ms", type=int, default=STANDIN_LATENCY_MS)
+    parser.add_argument("--rows", type=int, default=STANDIN_ROWS)
+    parser.add_argument("--items", type=int, default=STANDIN_ITEMS)
+    parser.add_argument("--report-seconds", type=float, default=STANDIN_REPORT_SECONDS)
+    args = parser.parse_args()
+
+    app.config["STANDIN"] = {"latency_ms": args.latency_ms, "rows": args.rows, "report_seconds": args.report_seconds}
+    reset_state(args.items)
+    print(f"🧪 FronoCloud stand-in on http://{args.host}:{args.port} ({args.rows} rows, {args.latency_ms} ms latency)")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+reset_state()
+
+if __name__ == "__main__":
+    main()
@@ -1,67 +1,45 @@
-import os
 import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
 
 from scripts.df_cleaners.cleaner import modify_valuation_dataframe
-from scripts.helper.browser_manager import create_driver
-from scripts.helper.common_utils import ensure_download_path, load_credentials, load_dataframe, log, upload_to_bigquery, wait_for_download
-from scripts.helper.fronocloud_login import login
+from scripts.helper.common_utils import log
+from scripts.helper.metrics import stage
+from scripts.helper.report_engine import register_report, run_report
 
 
-def getStockValuation(location):
-    folder = "Frono_Stock_Valuation_Report"
-    download_path = ensure_download_path(location, folder)
-    username, password = load_credentials(location)
-    driver = create_driver(download_path)
-    actions = ActionChains(driver)
-
-    try:
-        log("Opening FronoCloud login page and logging in...")
-        login(driver, username, password)
+def navigate_stock_valuation(driver, actions):
+    log("Navigating to 'Stock Valuation' report...")
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "pn_id_3_7_header"))).click()
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.LINK_TEXT, "Stock Valuation"))).click()
+    time.sleep(1)
 
-        log("Navigating to 'Stock Valuation' report...")
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "pn_id_3_7_header"))).click()
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.LINK_TEXT, "Stock Valuation"))).click()
-        time.sleep(1)
+    Select(WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "basicSelect")))).select_by_index(0)
+    actions.key_down(Keys.SHIFT).send_keys(Keys.TAB * 3 + Keys.ARROW_RIGHT).key_up(Keys.SHIFT).perform()
 
-        Select(WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "basicSelect")))).select_by_index(0)
-        actions.key_down(Keys.SHIFT).send_keys(Keys.TAB * 3 + Keys.ARROW_RIGHT).key_up(Keys.SHIFT).perform()
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, "//button[@title='Advance filter']"))).click()
+    time.sleep(2)
+    actions.key_down(Keys.ALT).send_keys('a').key_up(Keys.ALT).perform()
+    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//button[text()='Apply']"))).click()
 
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, "//button[@title='Advance filter']"))).click()
-        time.sleep(2)
-        actions.key_down(Keys.ALT).send_keys('a').key_up(Keys.ALT).perform()
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//button[text()='Apply']"))).click()
-
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//button[text()=' Search ']"))).click()
+    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//button[text()=' Search ']"))).click()
+    with stage("report_generation"):
         time.sleep(10)
 
-        log("Exporting to Excel...")
-        WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//*[@title='Excel']"))).click()
-
-        downloaded_file = wait_for_download(download_path)
-        log(f"✅ Downloaded file saved as: {downloaded_file}")
+    log("Exporting to Excel...")
+    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, "//*[@title='Excel']"))).click()
 
-        df = load_dataframe(downloaded_file)
 
-        df = modify_valuation_dataframe(df)
+STOCK_VALUATION_REPORT = register_report(
+    report="stock_valuation",
+    folder="Frono_Stock_Valuation_Report",
+    navigate=navigate_stock_valuation,
+    cleaner=modify_valuation_dataframe,
+    table_name="stock_valuation",
+)
 
-        # Upload to BigQuery
-        upload_to_bigquery(df, table_name="stock_valuation", location=location)
 
-        # Delete file
-        os.remove(downloaded_file)
-        log(f"🗑️ Deleted local file: {downloaded_file}")
-
-        return f"Success"
-
-    except Exception as e:
-        log(f"❌ Error during scraping: {e}")
-        return f"Error: {e}"
-
-    finally:
-        log("Closing browser...")
-        driver.quit()
\ No newline at end of file
+def getStockValuation(location):
+    return run_report(location, STOCK_VALUATION_REPORT)
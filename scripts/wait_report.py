@@ -0,0 +1,111 @@
+"""
+Rank where report navigation spends time in fixed sleeps, waits and actions.
+
+Usage: python -m scripts.wait_report [--input FILE] [--report stock] [--location kolkata]
+       [--top 20] [--output FILE]
+
+Reads the per-run profiles appended to WAIT_PROFILE_PATH (see scripts/helper/wait_profiler.py)
+and prints, per report, the mean seconds per run in sleeps, waits and actions, then every
+step (call site, stage and kind) ranked by its mean unneeded sleep per run: the time
+left in a sleep after the page had settled, when the next wait succeeded on its first
+poll and so confirmed the page was ready. Unconfirmed seconds settled too, but were
+followed by an action, a polling wait or nothing, so no wait confirmed them.
+"""
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+
+from scripts.helper.wait_profiler import get_profile_path
+
+
+def load_profiles(path, report=None, location=None):
+    profiles = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            profile = json.loads(line)
+            if report and profile["report"] != report:
+                continue
+            if location and profile["location"] != location.lower():
+                continue
+            profiles.append(profile)
+    return profiles
+
+
+def rank(profiles):
+    """Per report: run count, mean totals per run and its steps ranked by mean unneeded sleep."""
+    by_report = defaultdict(list)
+    for profile in profiles:
+        by_report[profile["report"]].append(profile)
+
+    reports = []
+    for report, runs in by_report.items():
+        totals = defaultdict(float)
+        steps = {}
+        for run in runs:
+            for key, seconds in run["totals"].items():
+                totals[key] += seconds
+            for step in run["steps"]:
+                key = (step["kind"], step["site"], step["stage"])
+                merged = steps.setdefault(key, {"kind": step["kind"], "site": step["site"], "stage": step["stage"],
+                                                "count": 0, "seconds": 0.0, "unneeded_s": 0.0,
+                                                "unconfirmed_s": 0.0, "immediate": 0, "timeouts": 0})
+                for field in ("count", "seconds", "unneeded_s", "unconfirmed_s", "immediate", "timeouts"):
+                    merged[field] += step[field]
+        ranked = []
+        for step in steps.values():
+            ranked.append({
+                **step,
+                "count": round(step["count"] / len(runs), 2),
+                "seconds": round(step["seconds"] / len(runs), 3),
+                "unneeded_s": round(step["unneeded_s"] / len(runs), 3),
+                "unconfirmed_s": round(step["unconfirmed_s"] / len(runs), 3),
+            })
+        ranked.sort(key=lambda step: (-step["unneeded_s"], -step["seconds"]))
+        reports.append({
+            "report": report,
+            "runs": len(runs),
+            "mean_totals": {key: round(seconds / len(runs), 3) for key, seconds in totals.items()},
+            "steps": ranked,
+        })
+    return sorted(reports, key=lambda entry: -entry["mean_totals"].get("unneeded_sleep_s", 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default=get_profile_path(), help="Profile file (default WAIT_PROFILE_PATH)")
+    parser.add_argument("--report")
+    parser.add_argument("--location")
+    parser.add_argument("--top", type=int, default=20, help="Steps to print per report")
+    parser.add_argument("--output", help="Write the ranking as JSON")
+    args = parser.parse_args()
+
+    if not args.input or not os.path.exists(args.input):
+        print("❌ No wait profile found: set WAIT_PROFILE_PATH for the report runs or pass --input")
+        sys.exit(1)
+    profiles = load_profiles(args.input, args.report, args.location)
+    if not profiles:
+        print(f"❌ No profiled runs in {args.input} match")
+        sys.exit(1)
+
+    reports = rank(profiles)
+    for entry in reports:
+        totals = entry["mean_totals"]
+        print(f"\n⏳ {entry['report']} ({entry['runs']} runs, per run): sleeps {totals.get('sleep_s', 0)}s "
+              f"({totals.get('unneeded_sleep_s', 0)}s unneeded), waits {totals.get('wait_s', 0)}s, actions {totals.get('action_s', 0)}s")
+        for step in entry["steps"][:args.top]:
+            detail = {"sleep": f"{step['unneeded_s']}s unneeded", "wait": f"{step['immediate']} immediate"}.get(step["kind"], "")
+            print(f"   {step['seconds']:>7.2f}s {step['kind']:<6} x{step['count']:<5} {detail:<18} "
+                  f"[{step['stage'] or '-'}] {step['site']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"input": args.input, "reports": reports}, f, indent=2)
+        print(f"💾 Saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import pytest
+
+from scripts.helper.item_diff import designs_to_read, diff_items
+
+
+CATEGORY = " Finish goods"
+
+
+def _item(design, colors, sizes):
+    return {"Design No.": design, "Colors": colors, "Sizes": sizes}
+
+
+def _record(colors, sizes, category="Finish goods", verified=True):
+    return {"Colors": colors, "Sizes": sizes, "Category": category, "Verified": verified}
+
+
+def _only(ops):
+    assert len(ops) == 1
+    return ops[0]
+
+
+def test_missing_design_is_created():
+    op = _only(diff_items([_item("d1", ["RED"], ["38-44"])], {"D2": {}}, {}, CATEGORY))
+
+    assert op["op"] == "create"
+    assert op["design"] == "d1"
+
+
+def test_design_matched_case_insensitively_is_not_created():
+    op = _only(diff_items([_item(" d1 ", ["RED"], ["38-44"])], {"D1": {}}, {"D1": _record(["RED"], ["38-44"])}, CATEGORY))
+
+    assert op["op"] == "unchanged"
+    assert op["baseline"] is False
+
+
+def test_subset_of_known_colors_and_sizes_is_unchanged():
+    attributes = {"D1": _record(["RED", "BLUE"], ["38-44", "40-46"])}
+
+    op = _only(diff_items([_item("D1", ["blue"], ["40-46"])], {"D1": {}}, attributes, CATEGORY))
+
+    assert op["op"] == "unchanged"
+
+
+def test_new_colors_and_sizes_are_added_only():
+    attributes = {"D1": _record(["RED"], ["38-44"])}
+
+    op = _only(diff_items([_item("D1", ["RED", "Green"], ["38-44", "48-52"])], {"D1": {}}, attributes, CATEGORY))
+
+    assert op["op"] == "update"
+    assert op["add_colors"] == ["Green"]
+    assert op["add_sizes"] == ["48-52"]
+    assert op["known_sizes"] == ["38-44"]
+    assert op["category"] is None
+
+
+def test_category_change_from_recorded_category():
+    attributes = {"D1": _record(["RED"], ["38-44"], category="Raw material")}
+
+    op = _only(diff_items([_item("D1", ["RED"], ["38-44"])], {"D1": {}}, attributes, CATEGORY))
+
+    assert op["op"] == "update"
+    assert op["category"] == CATEGORY
+    assert op["add_colors"] == [] and op["add_sizes"] == []
+
+
+def test_category_read_from_item_master_row_when_not_recorded():
+    attributes = {"D1": _record(["RED"], ["38-44"], category=None)}
+
+    same = _only(diff_items([_item("D1", ["RED"], ["38-44"])], {"D1": {"Category": "finish goods "}}, attributes, CATEGORY))
+    other = _only(diff_items([_item("D1", ["RED"], ["38-44"])], {"D1": {"Item Category": "Raw material"}}, attributes, CATEGORY))
+
+    assert same["op"] == "unchanged"
+    assert other["op"] == "update" and other["category"] == CATEGORY
+
+
+def test_unknown_category_is_left_alone():
+    op = _only(diff_items([_item("D1", ["RED"], ["38-44"])], {"D1": {}}, {"D1": _record(["RED"], ["38-44"], category=None)}, CATEGORY))
+
+    assert op["op"] == "unchanged"
+
+
+def test_design_without_record_takes_sheet_as_baseline():
+    op = _only(diff_items([_item("D1", ["RED", "BLUE"], ["38-44"])], {"D1": {}}, {}, CATEGORY))
+
+    assert op["op"] == "unchanged"
+    assert op["baseline"] is True
+
+
+def test_update_from_unverified_record_is_a_baseline_update():
+    attributes = {"D1": _record(["RED"], ["38-44"], verified=False)}
+
+    op = _only(diff_items([_item("D1", ["RED", "BLUE"], ["38-44"])], {"D1": {}}, attributes, CATEGORY))
+
+    assert op["op"] == "update"
+    assert op["baseline"] is True
+    assert op["add_colors"] == ["BLUE"]
+
+
+@pytest.fixture
+def sheet():
+    return [
+        _item("A", ["RED", "BLUE"], ["38-44"]),  # update from an unverified record
+        _item("B", ["RED"], ["38-44"]),          # no record: sheet baseline, unchanged
+        _item("C", ["RED", "NEW"], ["38-44"]),   # update from a verified record
+        _item("D", ["RED", "X"], ["38-44"]),     # update from an unverified record, read failed
+        _item("E", ["RED"], ["38-44"]),          # not in the item master
+    ]
+
+
+@pytest.fixture
+def attributes():
+    return {
+        "A": _record(["RED"], ["38-44"], verified=False),
+        "C": _record(["RED"], ["38-44"]),
+        "D": _record(["RED"], ["38-44"], verified=False),
+    }
+
+
+def test_designs_to_read_only_baseline_updates(sheet, attributes):
+    master = {"A": {}, "B": {}, "C": {}, "D": {}}
+
+    assert designs_to_read(sheet, master, attributes, CATEGORY, {}, 3600, now=0.0) == ["A", "D"]
+
+
+def test_designs_to_read_skips_recent_failures(sheet, attributes):
+    master = {"A": {}, "B": {}, "C": {}, "D": {}}
+    failures = {"D": 1000.0}
+
+    assert designs_to_read(sheet, master, attributes, CATEGORY, failures, 3600, now=2000.0) == ["A"]
+    assert designs_to_read(sheet, master, attributes, CATEGORY, failures, 3600, now=4600.0) == ["A", "D"]
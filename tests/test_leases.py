@@ -0,0 +1,99 @@
+import sqlite3
+
+import pytest
+
+from scripts.helper import leases
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(leases, "LEASE_DB_PATH", str(tmp_path / "leases.sqlite"))
+    monkeypatch.setattr(leases.time, "time", clock.time)
+    monkeypatch.setattr(leases, "log", lambda msg: None)
+    return clock
+
+
+def _holder(key):
+    # Read through a connection of our own, not the module's
+    with sqlite3.connect(leases.LEASE_DB_PATH) as con:
+        row = con.execute("SELECT owner, expires_at FROM leases WHERE key = ?", (key,)).fetchone()
+    return row
+
+
+def test_acquire_is_exclusive_until_released(clock):
+    key = leases.location_lease_key("Kolkata")
+
+    assert leases.acquire_lease(key, "a", ttl=60) == "a"
+    assert leases.acquire_lease(key, "b", ttl=60) == "a"
+    # Re-acquiring a held lease keeps it
+    assert leases.acquire_lease(key, "a", ttl=60) == "a"
+    assert _holder(key)[0] == "a"
+
+    leases.release_lease(key, "a")
+    assert _holder(key) is None
+    assert leases.acquire_lease(key, "b", ttl=60) == "b"
+
+
+def test_release_by_other_owner_keeps_lease(clock):
+    key = leases.tier_lease_key("daily", "surat")
+    leases.acquire_lease(key, "a", ttl=60)
+
+    leases.release_lease(key, "b")
+
+    assert _holder(key)[0] == "a"
+
+
+def test_expired_lease_is_taken_over(clock):
+    key = leases.location_lease_key("kolkata")
+    leases.acquire_lease(key, "a", ttl=60)
+
+    clock.now += 59
+    assert leases.acquire_lease(key, "b", ttl=60) == "a"
+    clock.now += 2
+    assert leases.acquire_lease(key, "b", ttl=60) == "b"
+    # The old owner can no longer renew it
+    assert leases.renew_lease(key, "a", ttl=60) is False
+
+
+def test_renew_extends_expiry(clock):
+    key = leases.location_lease_key("kolkata")
+    leases.acquire_lease(key, "a", ttl=60)
+
+    clock.now += 50
+    assert leases.renew_lease(key, "a", ttl=60) is True
+    assert _holder(key)[1] == clock.now + 60
+
+    clock.now += 50
+    assert leases.acquire_lease(key, "b", ttl=60) == "a"
+
+
+def test_wait_for_lease_times_out_while_held(clock, monkeypatch):
+    key = leases.location_lease_key("kolkata")
+    leases.acquire_lease(key, "a", ttl=600)
+
+    def sleep(seconds):
+        clock.now += seconds
+
+    monkeypatch.setattr(leases.time, "sleep", sleep)
+
+    assert leases.wait_for_lease(key, "b", ttl=60, timeout=30) is False
+    leases.release_lease(key, "a")
+    assert leases.wait_for_lease(key, "b", ttl=60, timeout=30) is True
+
+
+def test_list_leases_reports_time_left(clock):
+    leases.acquire_lease(leases.location_lease_key("kolkata"), "a", ttl=60)
+    clock.now += 15
+
+    assert leases.list_leases() == [
+        {"key": "location:kolkata", "owner": "a", "acquired_at": clock.now - 15, "expires_in_s": 45.0}
+    ]
@@ -0,0 +1,34 @@
+import pytest
+
+pytest.importorskip("polars")
+
+from scripts.cleaner_benchmark import STANDIN_FIXTURES, SYNTHETIC_FIXTURES, build_fixture, compare  # noqa: E402
+from scripts.df_cleaners import cleaner as pandas_cleaner  # noqa: E402
+from scripts.df_cleaners import polars_cleaner  # noqa: E402
+from scripts.helper.common_utils import load_dataframe  # noqa: E402
+
+
+CLEANERS = [*STANDIN_FIXTURES, *SYNTHETIC_FIXTURES]
+
+
+@pytest.mark.parametrize("name", CLEANERS)
+@pytest.mark.parametrize("seed", [0, 1])
+def test_polars_cleaner_matches_pandas(name, seed):
+    df = load_dataframe(*build_fixture(name, 300, seed))
+    expected = getattr(pandas_cleaner, name)(df.copy())
+    # The bare Polars function, so a failure is not hidden by the pandas fallback
+    actual = getattr(polars_cleaner, name).__wrapped__(df.copy())
+    assert compare(expected, actual) is None
+
+
+def test_fallback_names_the_report(monkeypatch):
+    logged = []
+    monkeypatch.setattr(polars_cleaner, "log", logged.append)
+    df = load_dataframe(*build_fixture("modify_gr_report", 20))
+    # Polars cleaners only take text column names
+    df[0] = 1
+
+    polars_cleaner.modify_gr_report(df.copy(), report="goods_return")
+
+    assert "goods_return" in logged[0]
+    assert "falling back to pandas" in logged[0]